@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -37,6 +38,13 @@ INSTALLED_APPS = [
 # --------------------------------------------------
 
 MIDDLEWARE = [
+    # First, so its timings cover the whole stack (core.middleware)
+    'core.middleware.RequestMetricsMiddleware',
+
+    # gzip / brotli by Accept-Encoding; after the metrics middleware so
+    # recorded response sizes are the bytes sent (core.middleware)
+    'core.middleware.CompressionMiddleware',
+
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -53,6 +61,42 @@ MIDDLEWARE = [
 ]
 
 
+# --------------------------------------------------
+# REQUEST METRICS (/api/metrics/, core.metrics)
+# --------------------------------------------------
+
+# Addresses allowed to scrape /api/metrics/
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# Not recorded (the scrape itself, long-lived streams)
+METRICS_EXCLUDED_ROUTES = ['api/metrics/', 'api/events/']
+
+# Log requests slower than this (ms) with their SQL; None = off
+SLOW_REQUEST_MS = (
+    int(os.environ['SLOW_REQUEST_MS'])
+    if os.environ.get('SLOW_REQUEST_MS') else None
+)
+
+# Send each response's query count as X-DB-Queries (manage.py load_test)
+METRICS_QUERY_HEADER = os.environ.get('METRICS_QUERY_HEADER') == '1'
+
+
+# --------------------------------------------------
+# RESPONSE COMPRESSION (core.middleware.CompressionMiddleware)
+# --------------------------------------------------
+# Brotli is used when the `brotli` package is installed and the client
+# accepts it, gzip otherwise. Set COMPRESS_RESPONSES=0 when a reverse
+# proxy already compresses.
+
+COMPRESS_RESPONSES = os.environ.get('COMPRESS_RESPONSES', '1') == '1'
+
+# Smaller bodies are sent as they are
+COMPRESS_MIN_SIZE = 1024    # bytes
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5          # 0-11; higher is much slower on dynamic pages
+
+
 # --------------------------------------------------
 # URL / WSGI
 # --------------------------------------------------
@@ -83,31 +127,174 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # --------------------------------------------------
 # DATABASE (MySQL – EXISTING SCHEMA)
 # --------------------------------------------------
+# core.db.backends.* are Django's MySQL / SQLite backends plus
+# connection stats (see /api/ping/). Each worker thread keeps its
+# connection for DB_CONN_MAX_AGE seconds and health-checks it once per
+# request before reuse. Under ASGI set DB_CONN_MAX_AGE=0 and pool on
+# the database side (e.g. ProxySQL) instead.
+#
+# DB_ENGINE=sqlite runs against the local db.sqlite3 as a stand-in.
+
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 300))
+
+if os.environ.get('DB_ENGINE') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'core.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'core.db.backends.mysql',
+            'NAME': 'tf_wf',
+            'USER': 'root',
+            'PASSWORD': 'Root@1234',
+            'HOST': '127.0.0.1',
+            'PORT': '3306',
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'charset': 'utf8mb4',
+            },
+        }
+    }
+
+
+# --------------------------------------------------
+# CACHES
+# --------------------------------------------------
+# 'queues' holds rendered queue / history pages (core.caching). Local
+# memory is per worker process; point QUEUE_CACHE_BACKEND and
+# QUEUE_CACHE_LOCATION at a shared backend (Redis, Memcached, database)
+# when running several workers so invalidations reach all of them.
 
-DATABASES = {
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': 'tf_wf',
-        'USER': 'root',
-        'PASSWORD': 'Root@1234',
-        'HOST': '127.0.0.1',
-        'PORT': '3306',
-        'OPTIONS': {
-            'charset': 'utf8mb4',
-        },
-    }
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'queues': {
+        'BACKEND': os.environ.get(
+            'QUEUE_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('QUEUE_CACHE_LOCATION', 'workflow-queues'),
+        'TIMEOUT': 300,
+    },
 }
 
 
 # --------------------------------------------------
-# DJANGO REST FRAMEWORK (AUTH DISABLED)
+# LIVE QUEUE EVENTS (SSE – core.events)
 # --------------------------------------------------
+# 'local'    in-process broadcaster (single ASGI worker)
+# 'database' relayed through the workflow_events table so every worker
+#            process sees every transition; needs `migrate`
+
+WORKFLOW_EVENTS_BACKEND = os.environ.get('WORKFLOW_EVENTS_BACKEND', 'local')
+WORKFLOW_EVENTS_POLL_INTERVAL = 1.0     # seconds, 'database' only
+WORKFLOW_EVENTS_RETENTION = 86400       # seconds, 'database' only
+WORKFLOW_EVENTS_HEARTBEAT = 15          # seconds between keep-alives
+
+
+# --------------------------------------------------
+# ATTACHMENTS (core.attachments – local filesystem)
+# --------------------------------------------------
+
+ATTACHMENT_ROOT = os.environ.get('ATTACHMENT_ROOT', BASE_DIR / 'attachments')
+ATTACHMENT_MAX_SIZE = 200 * 1024 * 1024         # bytes per file
+ATTACHMENT_CHUNK_SIZE = 5 * 1024 * 1024         # suggested to clients
+ATTACHMENT_MAX_CHUNK_SIZE = 16 * 1024 * 1024    # bytes per PUT
+ATTACHMENT_CHUNK_TIMEOUT = 600                  # seconds a stalled chunk PUT holds its offset
+UPLOAD_SESSION_TTL = 24 * 3600                  # seconds; purge_uploads
+
+
+# --------------------------------------------------
+# DJANGO REST FRAMEWORK (JWT AUTH – core.auth)
+# --------------------------------------------------
+# Every endpoint except ping/ and auth/login/ needs
+# `Authorization: Bearer <token>` from auth/login/.
 
 REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': [],
-    'DEFAULT_PERMISSION_CLASSES': [],
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'core.auth.JWTAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.IsAuthenticated',
+    ],
 }
 
+# FAST_JSON_RENDERER=1 renders JSON with orjson (core.renderers): same
+# output, several times faster on large list pages
+FAST_JSON_RENDERER = os.environ.get('FAST_JSON_RENDERER') == '1'
+
+if FAST_JSON_RENDERER:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+
+JWT_LIFETIME = 8 * 3600     # seconds
+
+# Resolved token → (email, role) entries kept per worker process
+AUTH_CACHE_SIZE = 10000
+AUTH_CACHE_TTL = 60         # seconds; bounds how long role changes lag
+
+# Default page size for the keyset-paginated list endpoints
+# (clients may ask for up to core.pagination.MAX_PAGE_SIZE)
+LIST_PAGE_SIZE = 50
+
+
+# --------------------------------------------------
+# ARCHIVAL (manage.py archive_requests, core.archive)
+# --------------------------------------------------
+
+# VALIDATED / REJECTED requests untouched for this long leave the live
+# tables; histories still find them when a date range reaches back
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 180))
+
+# Requests moved per transaction (keeps row locks short)
+ARCHIVE_BATCH_SIZE = 500
+
+
+# --------------------------------------------------
+# MASTER DATA (manage.py load_master_data, core.master_data)
+# --------------------------------------------------
+
+# How often each process checks for newly loaded master data (seconds)
+MASTER_DATA_CHECK_INTERVAL = 30
+
+
+# --------------------------------------------------
+# BACKGROUND JOBS (manage.py run_jobs, core.jobs)
+# --------------------------------------------------
+# Notifications and the SAP hand-off run in worker processes after the
+# transition commits (core.side_effects).
+
+JOB_POLL_INTERVAL = 1.0         # seconds an idle worker waits
+JOB_MAX_ATTEMPTS = 5            # default; a job type may set its own
+JOB_RETRY_BACKOFF = 30          # seconds before the 1st retry, doubling
+JOB_RETRY_MAX_DELAY = 3600      # seconds; cap on the retry delay
+JOB_LOCK_TIMEOUT = 900          # seconds before a RUNNING job is presumed lost
+JOB_RETENTION = 7 * 86400       # seconds DONE jobs are kept (FAILED: forever)
+JOB_MAINTENANCE_INTERVAL = 60   # seconds between stale/prune sweeps per worker
+
+# Notification mail (console backend unless configured)
+EMAIL_BACKEND = os.environ.get(
+    'EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend'
+)
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'no-reply@localhost')
+
+# Validated requests are POSTed here as JSON; unset = hand-off skipped
+SAP_HANDOFF_URL = os.environ.get('SAP_HANDOFF_URL', '')
+SAP_HANDOFF_TOKEN = os.environ.get('SAP_HANDOFF_TOKEN', '')
+SAP_HANDOFF_TIMEOUT = 30        # seconds
+
 
 # --------------------------------------------------
 # INTERNATIONALIZATION
@@ -138,3 +325,6 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # --------------------------------------------------
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Pagination cursors are sent back in response headers
+CORS_EXPOSE_HEADERS = ['Link', 'X-Next-Cursor']
@@ -1,6 +1,12 @@
 from django.contrib import admin
-from .models import User
+from .models import Job, User
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_display = ('email', 'is_active', 'created_at')
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import caching
+from .listing import LIST_SPECS
+from .models import ArchivedWorkItem, WorkItem
+
+
+# ==================================================
+# HOT / COLD ARCHIVAL
+# ==================================================
+# Requests in a workflow's final statuses (VALIDATED, REJECTED) whose
+# `last_modified` is older than ARCHIVE_AFTER_DAYS are moved, request
+# row and work item together, into the archive tables
+# (core.models.Archived*), so the live tables and their indexes only
+# hold recent history next to the open queues.
+#
+# Each batch is one short transaction: candidates are picked from the
+# work-item index without locking, then the requests are locked by
+# primary key, re-checked, copied and deleted. Rows keep their ids, so
+# detail views, attachments and history cursors keep working.
+#
+# Histories read the archive when a date range reaches it (see
+# core.listing); detail views fall back to it by id. Delta sync
+# (core.sync) reports archived rows as removed, by `archived_at`.
+
+def archive_cutoff(days=None):
+    if days is None:
+        days = settings.ARCHIVE_AFTER_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def archive_candidates(workflow, cutoff, limit):
+    return list(
+        WorkItem.objects
+        .filter(
+            function=workflow.key,
+            status__in=workflow.final_statuses,
+            last_modified__lt=cutoff,
+        )
+        .order_by("last_modified", "id")
+        .values_list("object_id", flat=True)[:limit]
+    )
+
+
+def archive_batch(workflow, cutoff, batch_size):
+    """
+    Archive up to `batch_size` requests. Returns `(candidates, ids)`:
+    the ids picked and the ids actually moved. Only an empty
+    `candidates` means nothing is left to archive; `ids` is empty too
+    when every candidate changed before it could be locked.
+    """
+    candidates = archive_candidates(workflow, cutoff, batch_size)
+    if not candidates:
+        return [], []
+
+    model = workflow.model
+    archive_model = workflow.archive_model
+    now = timezone.now()
+
+    with transaction.atomic():
+        # Re-check under lock: a request may have changed meanwhile
+        rows = list(
+            model.objects
+            .select_for_update()
+            .filter(
+                id__in=candidates,
+                status__in=workflow.final_statuses,
+                last_modified__lt=cutoff,
+            )
+            .values()
+        )
+        ids = [row["id"] for row in rows]
+        if not ids:
+            return candidates, []
+
+        archive_model.objects.bulk_create(
+            [archive_model(archived_at=now, **row) for row in rows]
+        )
+
+        items = WorkItem.objects.filter(function=workflow.key, object_id__in=ids)
+        ArchivedWorkItem.objects.bulk_create(
+            [ArchivedWorkItem(archived_at=now, **item) for item in items.values()]
+        )
+        items.delete()
+        model.objects.filter(id__in=ids).delete()
+
+        # Histories without a date range no longer show these rows
+        names = [
+            spec.name
+            for spec in LIST_SPECS.values()
+            if spec.statuses & set(workflow.final_statuses)
+        ]
+        transaction.on_commit(lambda: caching.invalidate(names))
+
+    return candidates, ids
@@ -0,0 +1,180 @@
+import asyncio
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from .auth import async_login_required
+from .events import (
+    RESYNC,
+    broadcaster,
+    events_backend,
+    format_event,
+    replay_events,
+)
+from .listing import (
+    APPROVE_REQUESTS,
+    APPROVED_REQUESTS,
+    CREATED_REQUESTS,
+    LIST_SPECS,
+    VALIDATED_REQUESTS,
+    VALIDATION_REQUESTS,
+    alist_response,
+    arequest_detail_data,
+    json_response,
+)
+
+
+# ==================================================
+# ASYNC VIEWS (served through config/asgi.py)
+# ==================================================
+# Plain Django async views: DRF's @api_view is sync-only. They must run
+# under an ASGI server (uvicorn / daphne / hypercorn); `runserver` and
+# WSGI workers would hold a thread per open stream.
+#
+# The read endpoints are mounted under /api/async/ with the same paths,
+# parameters, headers and JSON as their sync twins in core.views; writes
+# stay sync. An ASGI deployment points the dashboard's reads there.
+
+
+# ==================================================
+# ASYNC READ ENDPOINTS
+# ==================================================
+
+@require_GET
+@async_login_required()
+async def created_requests(request):
+    return await alist_response(request, CREATED_REQUESTS)
+
+
+@require_GET
+@async_login_required()
+async def approve_requests(request):
+    return await alist_response(request, APPROVE_REQUESTS)
+
+
+@require_GET
+@async_login_required()
+async def approved_requests(request):
+    return await alist_response(request, APPROVED_REQUESTS)
+
+
+@require_GET
+@async_login_required()
+async def validation_requests(request):
+    return await alist_response(request, VALIDATION_REQUESTS)
+
+
+@require_GET
+@async_login_required()
+async def validated_requests(request):
+    return await alist_response(request, VALIDATED_REQUESTS)
+
+
+@require_GET
+@async_login_required()
+async def request_detail(request, id):
+    data = await arequest_detail_data(id)
+    if data is None:
+        return json_response({"error": "Request not found"}, status=404)
+
+    return json_response(data)
+
+
+# ==================================================
+# LIVE QUEUE EVENTS (SSE)
+# ==================================================
+# GET /api/events/?queue=<list name>
+#
+# Browsers' EventSource cannot send headers, so the bearer token may
+# also be passed as `?token=`.
+#
+# `queue` (optional) keeps only events that move a row into or out of
+# that list (e.g. approve-requests). On reconnect browsers send
+# Last-Event-ID; with the database backend missed events are replayed,
+# otherwise the client gets a `resync` event and should refetch.
+
+HEARTBEAT_SECONDS = 15
+
+
+def _wants(event, statuses):
+    if statuses is None or event is RESYNC or event["id"] is None:
+        return True
+    return event["status"] in statuses or event["from_status"] in statuses
+
+
+async def _event_stream(statuses, last_event_id):
+    heartbeat = getattr(settings, "WORKFLOW_EVENTS_HEARTBEAT", HEARTBEAT_SECONDS)
+
+    # Subscribe before replaying so nothing falls in between
+    subscription = broadcaster.subscribe()
+    _, queue = subscription
+
+    try:
+        yield "retry: 3000\n\n"
+
+        # Late commits are relayed out of seq order, so replayed events
+        # are skipped by seq rather than by position
+        replayed = set()
+        if last_event_id is not None:
+            backlog = None
+            if events_backend() == "database":
+                backlog = await replay_events(last_event_id)
+            if backlog is None:
+                yield format_event(RESYNC)
+            else:
+                for event in backlog:
+                    replayed.add(event["seq"])
+                    if _wants(event, statuses):
+                        yield format_event(event)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            # Already sent during replay
+            if event is not RESYNC and event["seq"] in replayed:
+                continue
+
+            if _wants(event, statuses):
+                yield format_event(event)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+@require_GET
+@async_login_required(allow_query_token=True)
+async def request_events(request):
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"error": "Live events are only served through the ASGI application"},
+            status=501,
+        )
+
+    statuses = None
+    queue_name = request.GET.get("queue")
+    if queue_name:
+        spec = LIST_SPECS.get(queue_name)
+        if spec is None:
+            return JsonResponse({"error": "Unknown queue"}, status=400)
+        statuses = spec.statuses
+
+    last_event_id = request.headers.get("Last-Event-ID")
+    if last_event_id is not None:
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            last_event_id = None
+
+    response = StreamingHttpResponse(
+        _event_stream(statuses, last_event_id),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,425 @@
+import hashlib
+import os
+import re
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, quote_etag
+
+from .models import (
+    Attachment,
+    AttachmentBlob,
+    PartCodeModificationRequest,
+    UploadSession,
+)
+
+
+# ==================================================
+# ATTACHMENTS (chunked uploads, content-addressed storage)
+# ==================================================
+# Upload flow (resumable):
+#
+#   POST /api/requests/<id>/attachments/   {filename, size, content_type,
+#                                           sha256?}
+#        -> 201 {"upload": {id, offset, size}}
+#   PUT  /api/uploads/<upload_id>/   raw bytes, `Content-Range:
+#        bytes <start>-<end>/<size>`; <start> must equal the current offset
+#   GET  /api/uploads/<upload_id>/   current offset (resume after a drop)
+#
+# Only the user who started an upload can see or extend it.
+#
+# Chunks are streamed from the request straight into a temp file, never
+# held in memory. A PUT claims the offset with a conditional UPDATE and
+# writes the bytes with no transaction open, so a slow client holds
+# neither a row lock nor a pooled connection's transaction.
+#
+# When the last byte arrives the file is hashed by the server, and
+# renamed to storage/<aa>/<bb>/<sha256> unless that content is already
+# stored, in which case the temp file is dropped and the existing blob
+# is shared. A client-supplied `sha256` is only checked against the
+# bytes received: it never stands in for them, so a hash alone cannot
+# attach someone else's file.
+#
+# GET /api/attachments/<id>/download/ honours single `Range` requests
+# (206 / 416) and uses the SHA-256 as a strong ETag.
+
+COPY_BUFFER = 64 * 1024
+
+_CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+class AttachmentError(Exception):
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+class LocalStorage:
+    """Blobs and in-progress uploads under one directory tree."""
+
+    def __init__(self, root):
+        self.root = os.fspath(root)
+
+    def blob_path(self, sha256):
+        return os.path.join(self.root, "blobs", sha256[:2], sha256[2:4], sha256)
+
+    def upload_path(self, upload_id):
+        return os.path.join(self.root, "uploads", f"{upload_id}.part")
+
+    def create_upload(self, upload_id):
+        path = self.upload_path(upload_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+
+    def write_upload(self, upload_id, offset, stream, length):
+        """Copy up to `length` bytes from `stream` at `offset`; returns bytes written."""
+        written = 0
+        with open(self.upload_path(upload_id), "r+b") as target:
+            target.seek(offset)
+            target.truncate()
+            while written < length:
+                data = stream.read(min(COPY_BUFFER, length - written))
+                if not data:
+                    break
+                target.write(data)
+                written += len(data)
+        return written
+
+    def hash_upload(self, upload_id):
+        digest = hashlib.sha256()
+        with open(self.upload_path(upload_id), "rb") as source:
+            for block in iter(lambda: source.read(COPY_BUFFER), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def commit_upload(self, upload_id, sha256):
+        """Move a finished upload to its blob path (or drop it if present)."""
+        target = self.blob_path(sha256)
+        if os.path.exists(target):
+            self.discard_upload(upload_id)
+            return
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(self.upload_path(upload_id), target)
+
+    def discard_upload(self, upload_id):
+        try:
+            os.remove(self.upload_path(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def open_blob(self, sha256):
+        return open(self.blob_path(sha256), "rb")
+
+
+def storage():
+    return LocalStorage(settings.ATTACHMENT_ROOT)
+
+
+def serialize_attachment(attachment):
+    return {
+        "id": attachment.id,
+        "request_id": attachment.request_id,
+        "filename": attachment.filename,
+        "content_type": attachment.content_type,
+        "size": attachment.blob.size,
+        "sha256": attachment.blob.sha256,
+        "uploaded_by": attachment.uploaded_by,
+        "uploaded_at": attachment.uploaded_at,
+        "download_url": f"/api/attachments/{attachment.id}/download/",
+    }
+
+
+def serialize_upload(session):
+    return {
+        "id": str(session.id),
+        "offset": session.received,
+        "size": session.size,
+        "chunk_size": settings.ATTACHMENT_CHUNK_SIZE,
+    }
+
+
+def _attach(request_id, blob, filename, content_type, actor):
+    return Attachment.objects.create(
+        request_id=request_id,
+        blob=blob,
+        filename=filename,
+        content_type=content_type,
+        uploaded_by=actor,
+        uploaded_at=timezone.now(),
+    )
+
+
+# ==================================================
+# UPLOADS
+# ==================================================
+
+def start_upload(request_id, data, actor):
+    """Open an upload session for a new attachment of `request_id`."""
+    if not PartCodeModificationRequest.objects.filter(id=request_id).exists():
+        raise AttachmentError("Request not found", status=404)
+
+    filename = os.path.basename(str(data.get("filename") or "")).strip()
+    if not filename:
+        raise AttachmentError("filename is required")
+
+    try:
+        size = int(data.get("size"))
+    except (TypeError, ValueError):
+        raise AttachmentError("size must be an integer")
+    if size <= 0:
+        raise AttachmentError("size must be positive")
+    if size > settings.ATTACHMENT_MAX_SIZE:
+        raise AttachmentError(
+            f"Attachments are limited to {settings.ATTACHMENT_MAX_SIZE} bytes",
+            status=413,
+        )
+
+    sha256 = (data.get("sha256") or "").lower() or None
+    if sha256 and not _SHA256.match(sha256):
+        raise AttachmentError("sha256 must be 64 hex characters")
+
+    content_type = data.get("content_type") or "application/octet-stream"
+
+    session = UploadSession(
+        id=uuid.uuid4(),
+        request_id=request_id,
+        filename=filename,
+        content_type=content_type,
+        size=size,
+        sha256=sha256,
+        uploaded_by=actor,
+        created_at=timezone.now(),
+    )
+    storage().create_upload(session.id)
+    session.save(force_insert=True)
+    return session
+
+
+def get_upload(upload_id, actor):
+    """The caller's upload session; AttachmentError(404) for anyone else's."""
+    session = UploadSession.objects.filter(id=upload_id, uploaded_by=actor).first()
+    if session is None:
+        raise AttachmentError("Upload not found", status=404)
+    return session
+
+
+def _claim_offset(session, start):
+    """Mark the chunk at `start` as being written; returns the claim stamp."""
+    now = timezone.now()
+    stalled = now - timedelta(seconds=settings.ATTACHMENT_CHUNK_TIMEOUT)
+    claimed = (
+        UploadSession.objects
+        .filter(id=session.id, received=start)
+        .filter(Q(chunk_started_at__isnull=True) | Q(chunk_started_at__lt=stalled))
+        .update(chunk_started_at=now)
+    )
+    if not claimed:
+        # Another PUT got there first (or the offset moved meanwhile)
+        current = UploadSession.objects.filter(id=session.id).first()
+        raise AttachmentError(
+            "Another chunk of this upload is in progress",
+            status=409,
+            offset=current.received if current else start,
+        )
+    return now
+
+
+def receive_chunk(upload_id, content_range, stream, actor):
+    """
+    Append one chunk to the caller's upload. Returns `(session,
+    attachment)`; the attachment is set once the upload is complete.
+    """
+    match = _CONTENT_RANGE.match(content_range or "")
+    if not match:
+        raise AttachmentError("Content-Range: bytes <start>-<end>/<size> is required")
+    start, end, total = (int(n) for n in match.groups())
+    length = end - start + 1
+
+    if length <= 0:
+        raise AttachmentError("Invalid Content-Range")
+    if length > settings.ATTACHMENT_MAX_CHUNK_SIZE:
+        raise AttachmentError(
+            f"Chunks are limited to {settings.ATTACHMENT_MAX_CHUNK_SIZE} bytes",
+            status=413,
+        )
+
+    session = get_upload(upload_id, actor)
+    if total != session.size or end >= session.size:
+        raise AttachmentError("Content-Range does not match the upload size")
+    if start != session.received:
+        raise AttachmentError(
+            "Chunk does not start at the current offset",
+            status=409,
+            offset=session.received,
+        )
+
+    claim = _claim_offset(session, start)
+    written = 0
+    try:
+        written = storage().write_upload(session.id, start, stream, length)
+    finally:
+        # Record what arrived (a failed read keeps the offset) and release
+        released = UploadSession.objects.filter(
+            id=session.id, chunk_started_at=claim
+        ).update(received=start + written, chunk_started_at=None)
+    if not released:
+        # Stalled past ATTACHMENT_CHUNK_TIMEOUT and taken over by a retry
+        raise AttachmentError("Chunk timed out", status=409)
+    session.received = start + written
+
+    if written < length:
+        raise AttachmentError(
+            "Chunk body was shorter than its Content-Range",
+            offset=session.received,
+        )
+
+    if session.received < session.size:
+        return session, None
+    return session, finish_upload(session)
+
+
+def finish_upload(session):
+    store = storage()
+    sha256 = store.hash_upload(session.id)
+
+    if session.sha256 and session.sha256 != sha256:
+        store.discard_upload(session.id)
+        session.delete()
+        raise AttachmentError("Uploaded content does not match sha256")
+
+    store.commit_upload(session.id, sha256)
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                blob, _ = AttachmentBlob.objects.get_or_create(
+                    sha256=sha256, defaults={"size": session.size}
+                )
+        except IntegrityError:
+            # Same content finished concurrently by another upload
+            blob = AttachmentBlob.objects.get(sha256=sha256)
+
+        attachment = _attach(
+            session.request_id,
+            blob,
+            session.filename,
+            session.content_type,
+            session.uploaded_by,
+        )
+        session.delete()
+
+    return attachment
+
+
+def purge_stale_uploads(max_age):
+    """Delete uploads started over `max_age` seconds ago; returns how many."""
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    store = storage()
+    stale = list(
+        UploadSession.objects
+        .filter(created_at__lt=cutoff)
+        .values_list("id", flat=True)
+    )
+    for upload_id in stale:
+        store.discard_upload(upload_id)
+    UploadSession.objects.filter(id__in=stale).delete()
+    return len(stale)
+
+
+# ==================================================
+# DOWNLOADS (Range)
+# ==================================================
+
+def parse_range(header, size):
+    """
+    `(start, end)` for a single satisfiable byte range, None to serve the
+    whole file. Raises AttachmentError(416) for unsatisfiable ranges.
+    """
+    match = _RANGE.match((header or "").strip())
+    if not match:
+        # Absent, malformed or multi-range: a full 200 is always allowed
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise AttachmentError("Range not satisfiable", status=416)
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise AttachmentError("Range not satisfiable", status=416)
+    return start, end
+
+
+def _read_span(handle, start, length):
+    with handle:
+        handle.seek(start)
+        while length > 0:
+            data = handle.read(min(COPY_BUFFER, length))
+            if not data:
+                return
+            length -= len(data)
+            yield data
+
+
+def download_response(request, attachment):
+    blob = attachment.blob
+    etag = quote_etag(blob.sha256)
+
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if if_range is None or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get("Range"), blob.size)
+        except AttachmentError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{blob.size}"
+            return response
+
+    handle = storage().open_blob(blob.sha256)
+
+    if byte_range is None:
+        response = FileResponse(
+            handle,
+            as_attachment=True,
+            filename=attachment.filename,
+            content_type=attachment.content_type,
+        )
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_span(handle, start, end - start + 1),
+            status=206,
+            content_type=attachment.content_type,
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{blob.size}"
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Disposition"] = content_disposition_header(
+            True, attachment.filename
+        )
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    # Content never changes under a given attachment id
+    response["Cache-Control"] = "private, max-age=31536000, immutable"
+    return response
@@ -1,9 +1,177 @@
 # core/auth.py
+import functools
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
 import jwt
 from django.conf import settings
+from django.http import JsonResponse
+from django.utils import timezone
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+from .models import User
+
+
+# ==================================================
+# TOKEN → PRINCIPAL
+# ==================================================
+# A bearer token is an HS256 JWT signed with SECRET_KEY whose `email`
+# claim names an active row of the User table. The resolved principal
+# (email + workflow role) is kept in a bounded per-process TTL cache
+# keyed by the token, so a repeat request costs one dict lookup instead
+# of a signature check plus a User query.
+#
+# Role changes and deactivations are picked up once the entry expires
+# (AUTH_CACHE_TTL seconds at most).
+
+JWT_ALGORITHM = "HS256"
+
+
+class Principal:
+    """Authenticated caller; becomes `request.user`."""
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, email, role):
+        self.id = user_id
+        self.email = email
+        self.role = role
+
+    def __str__(self):
+        return self.email
+
+
+class TokenCache:
+    """LRU mapping token -> (Principal, expiry) with a size bound."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+
+            principal, expires = entry
+            if expires <= time.time():
+                del self._entries[token]
+                return None
+
+            self._entries.move_to_end(token)
+            return principal
+
+    def set(self, token, principal, token_expiry=None):
+        expires = time.time() + self.ttl
+        if token_expiry is not None:
+            # Never outlive the token itself
+            expires = min(expires, token_expiry)
+
+        with self._lock:
+            self._entries[token] = (principal, expires)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = TokenCache(
+    maxsize=getattr(settings, "AUTH_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "AUTH_CACHE_TTL", 60),
+)
+
+
+def issue_token(user):
+    now = timezone.now()
+    payload = {
+        "email": user.email,
+        "iat": now,
+        "exp": now + timedelta(seconds=settings.JWT_LIFETIME),
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+
+def _decode(token):
+    """Return `(email, exp)` from a valid token; AuthenticationFailed otherwise."""
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[JWT_ALGORITHM]
+        )
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationFailed("Token expired")
+    except Exception:
+        raise AuthenticationFailed("Invalid token")
+
+    email = payload.get("email")
+    if not email:
+        raise AuthenticationFailed("Invalid token")
+    return email, payload.get("exp")
+
+
+def _active_users(email):
+    return (
+        User.objects
+        .filter(email=email, is_active=True)
+        .values_list("id", "email", "role")
+    )
+
+
+def resolve_token(token):
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    email, expiry = _decode(token)
+    row = _active_users(email).first()
+    if row is None:
+        raise AuthenticationFailed("User not found or inactive")
+
+    principal = Principal(*row)
+    principal_cache.set(token, principal, expiry)
+    return principal
+
+
+async def aresolve_token(token):
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    email, expiry = _decode(token)
+    row = await _active_users(email).afirst()
+    if row is None:
+        raise AuthenticationFailed("User not found or inactive")
+
+    principal = Principal(*row)
+    principal_cache.set(token, principal, expiry)
+    return principal
+
+
+def bearer_token(header):
+    try:
+        prefix, token = header.split(" ")
+    except ValueError:
+        raise AuthenticationFailed("Invalid token")
+
+    if prefix.lower() != "bearer":
+        raise AuthenticationFailed("Invalid token prefix")
+    return token
+
+
+# ==================================================
+# DRF AUTHENTICATION (every @api_view)
+# ==================================================
 
 class JWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
@@ -12,20 +180,46 @@ class JWTAuthentication(BaseAuthentication):
         if not header:
             raise AuthenticationFailed("Authorization header missing")
 
-        try:
-            prefix, token = header.split(" ")
-            if prefix.lower() != "bearer":
-                raise AuthenticationFailed("Invalid token prefix")
-
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY,
-                algorithms=["HS256"]
-            )
-        except jwt.ExpiredSignatureError:
-            raise AuthenticationFailed("Token expired")
-        except Exception:
-            raise AuthenticationFailed("Invalid token")
-
-        # IMPORTANT: payload becomes request.user
-        return (payload, None)
+        # IMPORTANT: the principal becomes request.user
+        return (resolve_token(bearer_token(header)), None)
+
+    def authenticate_header(self, request):
+        # Makes DRF answer 401 (not 403) on failures
+        return 'Bearer realm="api"'
+
+
+# ==================================================
+# ASYNC VIEWS (plain Django, no DRF)
+# ==================================================
+
+def async_login_required(allow_query_token=False):
+    """
+    Authenticate an async view like JWTAuthentication does and expose
+    the principal as `request.principal`.
+
+    `allow_query_token` also accepts `?token=` for clients that cannot
+    set headers (browser EventSource).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            header = request.headers.get("Authorization")
+            try:
+                if header:
+                    token = bearer_token(header)
+                elif allow_query_token and request.GET.get("token"):
+                    token = request.GET["token"]
+                else:
+                    raise AuthenticationFailed("Authorization header missing")
+
+                request.principal = await aresolve_token(token)
+            except AuthenticationFailed as exc:
+                response = JsonResponse({"detail": str(exc.detail)}, status=401)
+                response["WWW-Authenticate"] = 'Bearer realm="api"'
+                return response
+
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,331 @@
+import http.client
+import json
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import PartCodeModificationRequest
+from .registry import PART_CODE_MODIFICATION
+from .work_items import newest_id, sync_work_items
+
+
+# ==================================================
+# LOAD TESTING HELPERS
+# ==================================================
+# Used by `manage.py seed_requests`, `load_test` and `benchmark_servers`.
+# Clients are plain threads with one keep-alive connection each, so the
+# driver itself adds little overhead compared to the servers measured.
+
+SEED_CHUNK_SIZE = 5000
+
+# Roughly what a live table looks like: most rows are finished
+SEED_STATUS_WEIGHTS = {
+    "PENDING_FOR_APPROVAL": 10,
+    "APPROVED": 10,
+    "RETURNED_FOR_CORRECTION": 5,
+    "REJECTED": 15,
+    "VALIDATED": 60,
+}
+
+SEED_PLANTS = [f"BP{n:02d}" for n in range(1, 41)]
+SEED_CREATORS = 500
+SEED_APPROVERS = 25
+SEED_VALIDATORS = 10
+
+_PARTS = ["Bracket", "Housing", "Gasket", "Shaft", "Bearing", "Valve",
+          "Sensor", "Harness", "Bush", "Cover", "Spring", "Pulley"]
+_QUALIFIERS = ["LH", "RH", "front", "rear", "upper", "lower", "M8", "M10",
+               "assy", "kit", "steel", "rubber"]
+_STATES = ["MH", "KA", "TN", "GJ", "UP", "HR", "TS", "WB"]
+_TAX_RATES = ["5", "12", "18", "28"]
+
+
+class _SeedPicker:
+    def __init__(self, rng):
+        self.rng = rng
+        self.statuses = list(SEED_STATUS_WEIGHTS)
+        self.status_weights = list(SEED_STATUS_WEIGHTS.values())
+        # A few big plants carry most of the traffic
+        self.plant_weights = [1 / (n + 1) for n in range(len(SEED_PLANTS))]
+        self.hsn_codes = [f"8{rng.randrange(10**7):07d}" for _ in range(300)]
+
+    def status(self):
+        return self.rng.choices(self.statuses, self.status_weights)[0]
+
+    def plant(self):
+        return self.rng.choices(SEED_PLANTS, self.plant_weights)[0]
+
+    def person(self, kind, count):
+        return f"{kind}{self.rng.randrange(count)}@example.com"
+
+    def after(self, moment, max_days, now):
+        return min(now, moment + timedelta(seconds=self.rng.randrange(max_days * 86400)))
+
+
+def _synthetic_request(pick, now, days):
+    rng = pick.rng
+    status = pick.status()
+    created = now - timedelta(seconds=rng.randrange(days * 86400))
+    plant = pick.plant()
+
+    row = dict(
+        plant=plant,
+        sap_part_code=f"{rng.randrange(10**9):09d}",
+        new_material_description=(
+            f"{rng.choice(_PARTS)} {rng.choice(_QUALIFIERS)} {rng.randrange(1000):03d}"
+        ),
+        hsn_code=rng.choice(pick.hsn_codes),
+        from_state_to_state=f"{rng.choice(_STATES)}-{rng.choice(_STATES)}",
+        tax=rng.choice(_TAX_RATES),
+        sales_views=rng.choice(["Yes", "No"]),
+        supplying_plant=plant,
+        receiving_plant=pick.plant(),
+        tax_indication_of_the_material=rng.choice(["0", "1"]),
+        procurement_type=rng.choice(["E", "F", "X"]),
+        activate_storage_location=rng.choice(["Yes", "No"]),
+        production_version_update=rng.choice(["Yes", "No"]),
+        quality_management=rng.choice(["Yes", "No"]),
+        remarks=rng.choice([None, None, "Urgent", "Supplier change"]),
+        status=status,
+        created=created,
+        submitted_at=created,
+        created_by=pick.person("user", SEED_CREATORS),
+    )
+
+    # Timestamps and actors follow the path the request took
+    moment = created
+    validator_stage = (
+        status in ("APPROVED", "VALIDATED")
+        or (status in ("REJECTED", "RETURNED_FOR_CORRECTION") and rng.random() < 0.3)
+    )
+    if status != "PENDING_FOR_APPROVAL" and validator_stage:
+        moment = pick.after(moment, 3, now)
+        row["approved_at"] = moment
+        row["approved_by"] = pick.person("approver", SEED_APPROVERS)
+
+    if status in ("VALIDATED", "REJECTED", "RETURNED_FOR_CORRECTION"):
+        moment = pick.after(moment, 5, now)
+        actor = (
+            pick.person("validator", SEED_VALIDATORS) if validator_stage
+            else pick.person("approver", SEED_APPROVERS)
+        )
+        if validator_stage:
+            row["sap_validation_status"] = (
+                "VALID" if status == "VALIDATED" else "INVALID"
+            )
+        if status == "VALIDATED":
+            row["sap_validated_at"] = moment
+            row["sap_validated_by"] = actor
+        elif status == "REJECTED":
+            row["rejected_at"] = moment
+            row["rejected_by"] = actor
+        else:
+            row["last_returned_by_role"] = (
+                "VALIDATOR" if validator_stage else "APPROVER"
+            )
+
+    row["last_modified"] = moment
+    return row
+
+
+SEED_COLUMNS = [
+    "plant", "sap_part_code", "new_material_description", "hsn_code",
+    "from_state_to_state", "tax", "sales_views", "supplying_plant",
+    "receiving_plant", "tax_indication_of_the_material", "procurement_type",
+    "activate_storage_location", "production_version_update",
+    "quality_management", "remarks", "status", "sap_validation_status",
+    "created", "last_modified", "created_by", "submitted_at", "approved_at",
+    "approved_by", "rejected_at", "rejected_by", "sap_validated_at",
+    "sap_validated_by", "last_returned_by_role",
+]
+_SEED_DATETIMES = {
+    "created", "last_modified", "submitted_at", "approved_at",
+    "rejected_at", "sap_validated_at",
+}
+
+
+def seed_requests(count, chunk_size=SEED_CHUNK_SIZE, days=365, seed=None, progress=None):
+    """
+    Insert `count` synthetic requests created over the last `days`, with
+    consistent statuses, actors and timestamps. The same `seed` (default:
+    `count`) produces the same rows. `progress(inserted)` runs per chunk.
+    """
+    rng = random.Random(count if seed is None else seed)
+    pick = _SeedPicker(rng)
+    now = timezone.now()
+
+    # Plain executemany: building model instances for bulk_create costs
+    # more than the INSERTs themselves at millions of rows
+    adapt = connection.ops.adapt_datetimefield_value
+    quote = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(PartCodeModificationRequest._meta.db_table),
+        ", ".join(quote(column) for column in SEED_COLUMNS),
+        ", ".join(["%s"] * len(SEED_COLUMNS)),
+    )
+
+    inserted = 0
+    while inserted < count:
+        batch = []
+        for _ in range(min(chunk_size, count - inserted)):
+            row = _synthetic_request(pick, now, days)
+            batch.append([
+                adapt(row.get(column)) if column in _SEED_DATETIMES
+                else row.get(column)
+                for column in SEED_COLUMNS
+            ])
+        with transaction.atomic():
+            newest = newest_id(PartCodeModificationRequest)
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, batch)
+            # Raw inserts send no signal: index the new rows here
+            sync_work_items(
+                PART_CODE_MODIFICATION,
+                PartCodeModificationRequest.objects
+                .filter(id__gt=newest)
+                .values_list("id", flat=True),
+            )
+        inserted += len(batch)
+        if progress:
+            progress(inserted)
+
+    return inserted
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+# One request of a load test; a plain path string means a GET
+Operation = namedtuple(
+    "Operation", ["name", "method", "path", "body", "headers"],
+    defaults=[None, None],
+)
+
+
+def _operation(item):
+    if isinstance(item, Operation):
+        return item
+    return Operation(item, "GET", item)
+
+
+class _Client:
+    def __init__(self, base, headers):
+        parts = urlsplit(base)
+        self.headers = headers
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.https = parts.scheme == "https"
+        self.conn = None
+
+    def request(self, method, path, timeout, body=None, headers=None):
+        """Returns `(status, X-DB-Queries header or None)`."""
+        if self.conn is None:
+            factory = (
+                http.client.HTTPSConnection if self.https
+                else http.client.HTTPConnection
+            )
+            self.conn = factory(self.host, self.port, timeout=timeout)
+
+        headers = {**self.headers, **(headers or {})}
+        if body is not None:
+            body = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            return response.status, response.getheader("X-DB-Queries")
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def _summary(latencies, errors, queries, wall):
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_samples": sorted(set(map(str, errors)))[:5],
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "max": latencies[-1] if latencies else None,
+        # Needs a server started with METRICS_QUERY_HEADER=1
+        "queries_per_request": sum(queries) / len(queries) if queries else None,
+    }
+
+
+def run_load(base, paths, total, concurrency, headers=None, timeout=30):
+    """
+    Send `total` requests against `base` (cycling through `paths`, plain
+    GET paths or Operations) from `concurrency` threads. Returns
+    throughput, latency percentiles and queries per request, overall and
+    per operation name under "endpoints".
+    """
+    prefix = urlsplit(base).path.rstrip("/")
+    operations = [_operation(item) for item in paths]
+    counter = iter(range(total))
+    lock = threading.Lock()
+    # name -> (latencies, errors, query counts)
+    results = {}
+
+    def worker():
+        client = _Client(base, headers or {})
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                client.close()
+                return
+            op = operations[n % len(operations)]
+            path = prefix + "/" + op.path.lstrip("/")
+            started = time.perf_counter()
+            queries = None
+            try:
+                status, queries = client.request(
+                    op.method, path, timeout, op.body, op.headers
+                )
+            except Exception as exc:
+                status = type(exc).__name__
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies, errors, counts = results.setdefault(op.name, ([], [], []))
+                latencies.append(elapsed)
+                if status not in (200, 201, 304):
+                    errors.append(status)
+                if queries is not None:
+                    counts.append(int(queries))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - started
+
+    endpoints = {
+        name: _summary(*results[name], wall) for name in sorted(results)
+    }
+    overall = _summary(
+        [x for latencies, _, _ in results.values() for x in latencies],
+        [x for _, errors, _ in results.values() for x in errors],
+        [x for _, _, counts in results.values() for x in counts],
+        wall,
+    )
+    return {**overall, "seconds": wall, "endpoints": endpoints}
@@ -0,0 +1,185 @@
+import csv
+import io
+
+from django.db import transaction
+from django.utils import timezone
+
+from .master_data import clean_reference_fields
+from .models import PartCodeModificationRequest
+from .utils import (
+    CREATE_FIELDS,
+    CREATE_LABELS,
+    REQUIRED_CREATE_FIELDS,
+    new_request_fields,
+    plant_errors,
+)
+from .work_items import newest_id
+from .workflow import notify
+
+
+# ==================================================
+# BULK IMPORT (CSV / XLSX)
+# ==================================================
+# The upload is read row by row (Django has already spooled large files
+# to a temp file) and inserted in `bulk_create` chunks, so memory holds
+# one chunk of model objects plus the per-row report. Each chunk commits
+# on its own (see `import_requests`).
+
+CHUNK_SIZE = 500
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def _clean(value):
+    if value is None:
+        return None
+    # XLSX numeric cells: 8708.0 → "8708"
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def _iter_csv(uploaded):
+    text = io.TextIOWrapper(uploaded.file, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text)
+    try:
+        yield from reader
+    except (csv.Error, UnicodeDecodeError) as exc:
+        raise ImportFileError(f"Unreadable CSV (line {reader.line_num}): {exc}")
+    finally:
+        text.detach()
+
+
+def _iter_xlsx(uploaded):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("XLSX upload requires the openpyxl package")
+
+    try:
+        workbook = load_workbook(uploaded.file, read_only=True, data_only=True)
+    except Exception as exc:
+        raise ImportFileError(f"Unreadable XLSX file: {exc}")
+
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_table(uploaded):
+    """Yield the raw cell values of each row of a .csv or .xlsx file."""
+    name = (uploaded.name or "").lower()
+
+    if name.endswith(".csv"):
+        return _iter_csv(uploaded)
+    if name.endswith(".xlsx"):
+        return _iter_xlsx(uploaded)
+    raise ImportFileError("Only .csv and .xlsx files are supported")
+
+
+def iter_rows(uploaded):
+    """
+    Yield `(row_number, {camelCaseField: value})` for each non-blank data
+    row. Row numbers match the spreadsheet (header is row 1).
+    """
+    rows = iter_table(uploaded)
+
+    header = next(rows, None)
+    if not header:
+        raise ImportFileError("File is empty")
+
+    header = [_clean(h) for h in header]
+    missing = [f for f in REQUIRED_CREATE_FIELDS if f not in header]
+    if missing:
+        raise ImportFileError(f"Missing columns: {', '.join(missing)}")
+
+    # Unknown columns (serial numbers, notes...) are ignored
+    columns = [
+        (index, key)
+        for index, key in enumerate(header)
+        if key in CREATE_FIELDS
+    ]
+
+    for row_number, values in enumerate(rows, start=2):
+        row = {
+            key: _clean(values[index]) if index < len(values) else None
+            for index, key in columns
+        }
+        if any(row.values()):
+            yield row_number, row
+
+
+def validate_row(row):
+    return [
+        f"{field} is required"
+        for field in REQUIRED_CREATE_FIELDS
+        if not row.get(field)
+    ]
+
+
+def import_requests(uploaded, user_email, chunk_size=CHUNK_SIZE):
+    """
+    Validate and insert every row of `uploaded`.
+
+    Invalid rows are reported and skipped. The file is parsed once up
+    front, so an unreadable file inserts nothing; valid rows are then
+    inserted chunk by chunk, each chunk in its own short transaction and
+    stamped when it is written. (Delta sync assumes no write commits a
+    `last_modified` older than core.sync.SETTLE_SECONDS; one transaction
+    around a large file would.)
+    """
+    for _ in iter_rows(uploaded):
+        pass
+    uploaded.seek(0)
+
+    report = []
+    batch = []
+
+    def flush():
+        objs = [obj for _, obj in batch]
+        with transaction.atomic():
+            now = timezone.now()
+            for obj in objs:
+                obj.created = obj.last_modified = obj.submitted_at = now
+            newest = newest_id(PartCodeModificationRequest)
+            PartCodeModificationRequest.objects.bulk_create(objs)
+            if objs[0].id is None:
+                # No ids back (MySQL): re-select this chunk's rows; one
+                # INSERT hands out ids in row order
+                ids = list(
+                    PartCodeModificationRequest.objects
+                    .filter(id__gt=newest, created_by=user_email, created=now)
+                    .order_by("id")
+                    .values_list("id", flat=True)
+                )
+                for obj, pk in zip(objs, ids):
+                    obj.id = pk
+            notify([obj.id for obj in objs], None, "PENDING_FOR_APPROVAL", user_email)
+        for row_number, obj in batch:
+            report.append({"row": row_number, "status": "created", "id": obj.id})
+        batch.clear()
+
+    for row_number, row in iter_rows(uploaded):
+        fields = new_request_fields(row, user_email, None)
+        errors = (
+            validate_row(row)
+            + plant_errors(fields, CREATE_LABELS)
+            + clean_reference_fields(fields, CREATE_LABELS)
+        )
+        if errors:
+            report.append({"row": row_number, "status": "error", "errors": errors})
+            continue
+
+        batch.append((row_number, PartCodeModificationRequest(**fields)))
+        if len(batch) >= chunk_size:
+            flush()
+
+    if batch:
+        flush()
+
+    report.sort(key=lambda item: item["row"])
+    return report
@@ -0,0 +1,116 @@
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import urlencode
+
+
+# ==================================================
+# RENDERED LIST CACHE
+# ==================================================
+# Rendered list pages are cached per endpoint + normalised query string
+# (function, cursor, page size, ...). Each endpoint has a generation
+# stamp that is part of the key; invalidating an endpoint just writes a
+# new stamp, orphaning its old pages until they expire.
+#
+# The "queues" cache alias is local memory by default. With several
+# worker processes, configure a shared backend so an invalidation in
+# one worker is seen by all of them.
+
+CACHE_ALIAS = "queues"
+
+# Headers replayed on a cache hit
+CACHED_HEADERS = ["ETag", "Cache-Control", "Link", "X-Next-Cursor"]
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _generation(name):
+    # Never reuse an old stamp, even if the key was evicted meanwhile
+    return _cache().get_or_set(f"gen:{name}", time.time_ns, timeout=None)
+
+
+def _key(request, name, generation, media_type):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    # The path matters too: cached Link headers point back at it
+    digest = hashlib.md5(
+        f"{request.path}?{query}|{media_type}".encode()
+    ).hexdigest()
+    return f"list:{name}:{generation}:{digest}"
+
+
+def _response(request, entry):
+    not_modified = get_conditional_response(
+        request, etag=entry["headers"].get("ETag")
+    )
+    if not_modified is not None:
+        return not_modified
+
+    response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    for header, value in entry["headers"].items():
+        response[header] = value
+    return response
+
+
+def _entry(rendered):
+    return {
+        "content": rendered.content,
+        "content_type": rendered["Content-Type"],
+        "headers": {
+            header: rendered[header]
+            for header in CACHED_HEADERS
+            if rendered.has_header(header)
+        },
+    }
+
+
+def cache_key(request, name):
+    return _key(request, name, _generation(name), request.accepted_media_type)
+
+
+def lookup(request, key):
+    entry = _cache().get(key)
+    if entry is None:
+        return None
+    return _response(request, entry)
+
+
+def remember(key, response):
+    if response.status_code != 200:
+        return
+
+    def store(rendered):
+        _cache().set(key, _entry(rendered))
+
+    response.add_post_render_callback(store)
+
+
+# Async counterparts for the views in core.async_views (same entries,
+# same generation stamps, so invalidation covers both).
+
+async def acache_key(request, name, media_type):
+    generation = await _cache().aget_or_set(
+        f"gen:{name}", time.time_ns, timeout=None
+    )
+    return _key(request, name, generation, media_type)
+
+
+async def alookup(request, key):
+    entry = await _cache().aget(key)
+    if entry is None:
+        return None
+    return _response(request, entry)
+
+
+async def aremember(key, response):
+    if response.status_code == 200:
+        await _cache().aset(key, _entry(response))
+
+
+def invalidate(names):
+    now = time.time_ns()
+    _cache().set_many({f"gen:{name}": now for name in names}, timeout=None)
@@ -0,0 +1,7 @@
+from django.db.backends.mysql import base
+
+from core.db.pool import PoolStatsMixin
+
+
+class DatabaseWrapper(PoolStatsMixin, base.DatabaseWrapper):
+    pass
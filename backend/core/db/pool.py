@@ -0,0 +1,117 @@
+import threading
+import time
+import weakref
+
+from django.db import connections
+
+
+# ==================================================
+# PERSISTENT CONNECTION STATS
+# ==================================================
+# With CONN_MAX_AGE > 0 each worker thread keeps its database
+# connection between requests, i.e. the threads form the pool: its size
+# is the number of worker threads, a checkout is a request reusing its
+# thread's connection, and CONN_HEALTH_CHECKS pings a reused connection
+# once per request before trusting it.
+#
+# The engines in core.db.backends wrap Django's MySQL / SQLite backends
+# with PoolStatsMixin, which counts connects, reuses and health check
+# failures and times how long requests wait for a usable connection
+# (connect + health check). `pool_stats()` is reported by /api/ping/.
+
+_lock = threading.Lock()
+_wrappers = weakref.WeakSet()
+
+_counters = {
+    "connects": 0,
+    "reuses": 0,
+    "health_check_failures": 0,
+    "closes": 0,
+    "wait_seconds": 0.0,
+    "max_wait_seconds": 0.0,
+    "waits": 0,
+}
+
+
+def _record_wait(seconds):
+    with _lock:
+        _counters["waits"] += 1
+        _counters["wait_seconds"] += seconds
+        _counters["max_wait_seconds"] = max(_counters["max_wait_seconds"], seconds)
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+class PoolStatsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Set when a cursor is opened, cleared at the request boundary
+        self.pool_busy = False
+        with _lock:
+            _wrappers.add(self)
+
+    def connect(self):
+        started = time.monotonic()
+        super().connect()
+        _count("connects")
+        _record_wait(time.monotonic() - started)
+
+    def close_if_health_check_failed(self):
+        checking = (
+            self.connection is not None
+            and self.health_check_enabled
+            and not self.health_check_done
+        )
+        started = time.monotonic()
+        super().close_if_health_check_failed()
+
+        if checking:
+            if self.connection is None:
+                # Reconnects in ensure_connection(), which records its wait
+                _count("health_check_failures")
+            else:
+                _count("reuses")
+                _record_wait(time.monotonic() - started)
+
+    def close(self):
+        was_open = self.connection is not None
+        super().close()
+        if was_open and self.connection is None:
+            _count("closes")
+
+    def close_if_unusable_or_obsolete(self):
+        # Runs on request_started / request_finished for this thread
+        super().close_if_unusable_or_obsolete()
+        self.pool_busy = False
+
+    def _cursor(self, name=None):
+        self.pool_busy = True
+        return super()._cursor(name)
+
+
+def pool_stats(alias="default"):
+    settings_dict = connections[alias].settings_dict
+
+    with _lock:
+        wrappers = [w for w in _wrappers if w.alias == alias]
+        counters = dict(_counters)
+
+    open_ = [w for w in wrappers if w.connection is not None]
+    busy = [w for w in open_ if w.pool_busy]
+    waits = counters.pop("waits")
+    wait_seconds = counters.pop("wait_seconds")
+    max_wait = counters.pop("max_wait_seconds")
+
+    return {
+        "conn_max_age": settings_dict["CONN_MAX_AGE"],
+        "health_checks": settings_dict["CONN_HEALTH_CHECKS"],
+        "open": len(open_),
+        "in_use": len(busy),
+        "idle": len(open_) - len(busy),
+        **counters,
+        "avg_wait_ms": round(wait_seconds / waits * 1000, 3) if waits else 0.0,
+        "max_wait_ms": round(max_wait * 1000, 3),
+    }
@@ -0,0 +1,278 @@
+import asyncio
+import itertools
+import json
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import WorkflowEvent
+from .signals import requests_transitioned
+
+
+# ==================================================
+# LIVE QUEUE EVENTS
+# ==================================================
+# Every committed transition becomes one small event per request:
+#
+#   {"seq": 17, "id": 42, "from_status": "PENDING_FOR_APPROVAL",
+#    "status": "APPROVED", "actor": "...", "at": "2026-..."}
+#
+# (`id` is null for bulk inserts whose primary keys are unknown; clients
+# should refetch the list.) Events fan out to the SSE streams of
+# core.async_views through one of two backends, chosen by
+# settings.WORKFLOW_EVENTS_BACKEND:
+#
+#   "local"     in-process broadcaster; enough for a single ASGI worker
+#   "database"  events are inserted into `workflow_events` inside the
+#               transition's transaction, and each worker process polls
+#               the table and relays new rows to its own subscribers.
+#               Stands in for Redis/Postgres pub-sub with several workers,
+#               and lets reconnecting clients replay via Last-Event-ID.
+
+SUBSCRIBER_BUFFER = 1000
+RELAY_BATCH_SIZE = 500
+
+# Sent instead of the backlog when a subscriber falls too far behind
+RESYNC = {"type": "resync"}
+
+
+def events_backend():
+    return getattr(settings, "WORKFLOW_EVENTS_BACKEND", "local")
+
+
+class Broadcaster:
+    """
+    Fan-out to asyncio queues owned by the SSE streams. `publish` may be
+    called from any thread (sync views run in a thread pool under ASGI).
+    """
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._relay = None
+
+    def subscribe(self):
+        subscription = (
+            asyncio.get_running_loop(),
+            asyncio.Queue(maxsize=SUBSCRIBER_BUFFER),
+        )
+        with self._lock:
+            self._subscribers.add(subscription)
+
+        if events_backend() == "database":
+            self._ensure_relay()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, events):
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, events)
+            except RuntimeError:
+                # Event loop already closed
+                self.unsubscribe((loop, queue))
+
+    def _ensure_relay(self):
+        if self._relay is None or self._relay.done():
+            self._relay = asyncio.get_running_loop().create_task(
+                relay_database_events(self)
+            )
+
+
+def _offer(queue, events):
+    for event in events:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog; the client refetches its lists instead
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+            return
+
+
+broadcaster = Broadcaster()
+
+_local_seq = itertools.count(1)
+
+
+# ==================================================
+# PUBLISHING
+# ==================================================
+
+@receiver(requests_transitioned)
+def publish_transition(sender, ids, from_status, to_status, actor, **kwargs):
+    now = timezone.now()
+    request_ids = ids or [None]
+
+    if events_backend() == "database":
+        # Same transaction as the transition: rolled back together
+        WorkflowEvent.objects.bulk_create([
+            WorkflowEvent(
+                request_id=pk,
+                from_status=from_status,
+                to_status=to_status,
+                actor=actor,
+                created_at=now,
+            )
+            for pk in request_ids
+        ])
+        return
+
+    events = [
+        {
+            "seq": next(_local_seq),
+            "id": pk,
+            "from_status": from_status,
+            "status": to_status,
+            "actor": actor,
+            "at": now,
+        }
+        for pk in request_ids
+    ]
+    transaction.on_commit(lambda: broadcaster.publish(events))
+
+
+def event_from_row(row):
+    return {
+        "seq": row.id,
+        "id": row.request_id,
+        "from_status": row.from_status,
+        "status": row.to_status,
+        "actor": row.actor,
+        "at": row.created_at,
+    }
+
+
+# ==================================================
+# DATABASE RELAY (one task per worker process)
+# ==================================================
+
+# Ids are handed out at insert time, but a row only becomes visible
+# when its transaction commits, so a lower id can appear after higher
+# ones were relayed. Ids between the settled floor and the highest id
+# relayed are therefore looked up again on every poll, until they are
+# RELAY_SETTLE_SECONDS old (like core.sync's SETTLE_SECONDS); ids that
+# never show up belong to rolled-back transactions. Late events are
+# relayed out of `seq` order.
+
+RELAY_SETTLE_SECONDS = 5
+
+
+async def recent_events(after, limit=RELAY_BATCH_SIZE):
+    rows = WorkflowEvent.objects.filter(id__gt=after).order_by("id")[:limit]
+    return [event_from_row(row) async for row in rows]
+
+
+async def late_events(floor, ceiling, relayed):
+    rows = (
+        WorkflowEvent.objects
+        .filter(id__gt=floor, id__lt=ceiling)
+        .exclude(id__in=relayed)
+        .order_by("id")
+    )
+    return [event_from_row(row) async for row in rows]
+
+
+async def replay_events(after, limit=RELAY_BATCH_SIZE):
+    """
+    Events a client that last saw `after` may have missed: every later
+    one, plus earlier ones created less than RELAY_SETTLE_SECONDS before
+    it (their transactions may have committed after it was sent; some
+    of those repeat). None when that is more than `limit` events, or
+    `after` is gone (pruned): the client should resync instead.
+    """
+    anchor = await WorkflowEvent.objects.filter(id=after).only("created_at").afirst()
+    if anchor is None:
+        return None
+
+    settle = timedelta(seconds=RELAY_SETTLE_SECONDS)
+    late = WorkflowEvent.objects.filter(
+        id__lt=after, created_at__gte=anchor.created_at - settle
+    )
+    rows = [event_from_row(row) async for row in late.order_by("id")[:limit + 1]]
+    rows += await recent_events(after, limit + 1 - len(rows))
+    if len(rows) > limit:
+        return None
+    return rows
+
+
+async def latest_event_id():
+    row = await WorkflowEvent.objects.order_by("-id").only("id").afirst()
+    return row.id if row else 0
+
+
+def _settle(floor, relayed):
+    """Advance the floor past relayed events older than the settle window."""
+    settled = timezone.now() - timedelta(seconds=RELAY_SETTLE_SECONDS)
+    old = [seq for seq, at in relayed.items() if at <= settled]
+    if old:
+        floor = max(floor, max(old))
+        for seq in [seq for seq in relayed if seq <= floor]:
+            del relayed[seq]
+    return floor
+
+
+async def relay_database_events(target):
+    interval = getattr(settings, "WORKFLOW_EVENTS_POLL_INTERVAL", 1.0)
+    retention = getattr(settings, "WORKFLOW_EVENTS_RETENTION", 86400)
+
+    # Every id <= floor is settled; `relayed` holds the ids above it
+    # already published (seq -> created_at), up to last_seen
+    floor = last_seen = await latest_event_id()
+    relayed = {}
+    last_pruned = timezone.now()
+
+    while target.subscriber_count():
+        events = []
+        if last_seen > floor + len(relayed):
+            events += await late_events(floor, last_seen, list(relayed))
+        new = await recent_events(last_seen)
+        events += new
+
+        if events:
+            for event in events:
+                relayed[event["seq"]] = event["at"]
+            if new:
+                last_seen = new[-1]["seq"]
+            target.publish(events)
+        floor = _settle(floor, relayed)
+
+        # A full batch means more are waiting: skip the sleep
+        if len(new) == RELAY_BATCH_SIZE:
+            continue
+
+        now = timezone.now()
+        if now - last_pruned > timedelta(seconds=retention / 24):
+            cutoff = now - timedelta(seconds=retention)
+            await WorkflowEvent.objects.filter(created_at__lt=cutoff).adelete()
+            last_pruned = now
+
+        await asyncio.sleep(interval)
+
+
+# ==================================================
+# SSE FORMATTING
+# ==================================================
+
+def format_event(event):
+    if event is RESYNC:
+        return "event: resync\ndata: {}\n\n"
+
+    data = json.dumps(event, cls=DjangoJSONEncoder)
+    return f"id: {event['seq']}\nevent: transition\ndata: {data}\n\n"
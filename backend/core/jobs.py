@@ -0,0 +1,266 @@
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from .models import Job
+
+
+logger = logging.getLogger("core.jobs")
+
+
+# ==================================================
+# BACKGROUND JOB QUEUE
+# ==================================================
+# Slow side effects of a write (mail, calls to SAP) run outside the
+# request that caused them. `enqueue` inserts a row into `jobs` on the
+# caller's connection, so inside the write's transaction the job
+# commits or rolls back with it, and a worker never sees a job for a
+# transition that did not happen.
+#
+# Workers (`manage.py run_jobs`) poll for due jobs and claim a few at a
+# time with one conditional UPDATE, like the workflow transitions: of
+# two workers racing for a job, the loser updates 0 rows. A job that
+# raises is retried after an exponential backoff until `max_attempts`,
+# then left FAILED with its traceback. Jobs of a worker that died stay
+# RUNNING until JOB_LOCK_TIMEOUT, then go back to the queue.
+#
+# Delivery is at least once: handlers must tolerate running twice.
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+
+# Characters of traceback kept in `last_error`
+MAX_ERROR_LENGTH = 4000
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for failures a retry cannot fix."""
+
+
+class JobHandler:
+    def __init__(self, name, func, max_attempts):
+        self.name = name
+        self.func = func
+        self.max_attempts = max_attempts
+
+
+JOB_HANDLERS = {}
+
+
+def job(name, max_attempts=None):
+    """Register the decorated function as the handler of job `name`."""
+    def decorator(func):
+        if name in JOB_HANDLERS:
+            raise ValueError(f"Job {name!r} is already registered")
+        JOB_HANDLERS[name] = JobHandler(
+            name, func, max_attempts or settings.JOB_MAX_ATTEMPTS
+        )
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, delay=0):
+    """
+    Queue job `name`; the handler is called with `**payload`, which must
+    be JSON-serializable. Call it inside the transaction of the write
+    the job belongs to.
+    """
+    handler = JOB_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown job {name!r}")
+
+    now = timezone.now()
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        max_attempts=handler.max_attempts,
+        run_at=now + timedelta(seconds=delay),
+        created_at=now,
+    )
+
+
+def retry_delay(attempts):
+    """Seconds before retry number `attempts`: doubling, capped, jittered."""
+    delay = min(
+        settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1),
+        settings.JOB_RETRY_MAX_DELAY,
+    )
+    # Spread out jobs that failed together (e.g. SAP was down)
+    return delay * random.uniform(0.75, 1.25)
+
+
+# ==================================================
+# WORKER
+# ==================================================
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(worker, limit):
+    """Lock up to `limit` due jobs for `worker`; returns them."""
+    now = timezone.now()
+    candidates = list(
+        Job.objects
+        .filter(status=QUEUED, run_at__lte=now)
+        .order_by("run_at", "id")
+        .values_list("id", flat=True)[:limit]
+    )
+    if not candidates:
+        return []
+
+    Job.objects.filter(id__in=candidates, status=QUEUED).update(
+        status=RUNNING,
+        locked_by=worker,
+        locked_at=now,
+        attempts=F("attempts") + 1,
+    )
+    return list(
+        Job.objects
+        .filter(id__in=candidates, status=RUNNING, locked_by=worker, locked_at=now)
+        .order_by("run_at", "id")
+    )
+
+
+def run_job(job):
+    """Run a claimed job and record the outcome; True if it succeeded."""
+    handler = JOB_HANDLERS.get(job.name)
+    started = time.perf_counter()
+    try:
+        if handler is None:
+            raise PermanentJobError(f"No handler registered for job {job.name!r}")
+        handler.func(**job.payload)
+    except Exception as exc:
+        _failed(job, exc)
+        return False
+
+    _finish(job, status=DONE)
+    logger.info(
+        "Job %s #%d done in %.1f ms",
+        job.name, job.id, (time.perf_counter() - started) * 1000,
+    )
+    return True
+
+
+def _finish(job, **changes):
+    # Conditional: a job reclaimed as stale meanwhile belongs to another worker
+    Job.objects.filter(id=job.id, status=RUNNING, locked_by=job.locked_by).update(
+        finished_at=timezone.now(), **changes
+    )
+
+
+def _failed(job, exc):
+    error = traceback.format_exc()[-MAX_ERROR_LENGTH:]
+
+    if isinstance(exc, PermanentJobError) or job.attempts >= job.max_attempts:
+        _finish(job, status=FAILED, last_error=error)
+        logger.error(
+            "Job %s #%d failed after %d attempts: %s",
+            job.name, job.id, job.attempts, exc,
+        )
+        return
+
+    delay = retry_delay(job.attempts)
+    Job.objects.filter(id=job.id, status=RUNNING, locked_by=job.locked_by).update(
+        status=QUEUED,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        locked_by=None,
+        locked_at=None,
+        last_error=error,
+    )
+    logger.warning(
+        "Job %s #%d attempt %d/%d failed, retrying in %.0fs: %s",
+        job.name, job.id, job.attempts, job.max_attempts, delay, exc,
+    )
+
+
+def recover_stale_jobs(timeout=None):
+    """Requeue (or fail) RUNNING jobs locked longer than `timeout` seconds."""
+    if timeout is None:
+        timeout = settings.JOB_LOCK_TIMEOUT
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=RUNNING, locked_at__lt=now - timedelta(seconds=timeout)
+    )
+
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=FAILED,
+        finished_at=now,
+        last_error="Worker stopped while running the job",
+    )
+    requeued = stale.update(
+        status=QUEUED, run_at=now, locked_by=None, locked_at=None
+    )
+    return requeued, failed
+
+
+def prune_jobs(retention=None):
+    """Delete jobs that finished successfully more than `retention` seconds ago."""
+    if retention is None:
+        retention = settings.JOB_RETENTION
+    cutoff = timezone.now() - timedelta(seconds=retention)
+    return Job.objects.filter(status=DONE, finished_at__lt=cutoff).delete()[0]
+
+
+def queue_stats():
+    counts = dict(
+        Job.objects.values_list("status").annotate(n=Count("id")).order_by()
+    )
+    oldest = Job.objects.filter(status=QUEUED).aggregate(oldest=Min("run_at"))["oldest"]
+    return {
+        "counts": {status: counts.get(status, 0) for status in (QUEUED, RUNNING, DONE, FAILED)},
+        # How far behind the workers are
+        "oldest_due_seconds": (
+            max(0.0, (timezone.now() - oldest).total_seconds()) if oldest else None
+        ),
+    }
+
+
+def work(worker=None, batch_size=10, poll_interval=None, burst=False, should_stop=None):
+    """
+    Claim and run jobs until `should_stop()` is true, or, with `burst`,
+    until no job is due. Returns the number of jobs run.
+    """
+    worker = worker or worker_name()
+    poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+    should_stop = should_stop or (lambda: False)
+
+    processed = 0
+    next_maintenance = 0.0
+    while not should_stop():
+        # Same connection hygiene as a request: drop expired/broken ones
+        close_old_connections()
+
+        if time.monotonic() >= next_maintenance:
+            recover_stale_jobs()
+            prune_jobs()
+            next_maintenance = time.monotonic() + settings.JOB_MAINTENANCE_INTERVAL
+
+        jobs = claim(worker, batch_size)
+        for job in jobs:
+            run_job(job)
+            processed += 1
+
+        if not jobs:
+            if burst:
+                break
+            _sleep(poll_interval, should_stop)
+
+    return processed
+
+
+def _sleep(seconds, should_stop):
+    deadline = time.monotonic() + seconds
+    while not should_stop() and time.monotonic() < deadline:
+        time.sleep(min(0.1, seconds))
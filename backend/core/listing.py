@@ -0,0 +1,502 @@
+import hashlib
+from operator import itemgetter
+
+from asgiref.sync import sync_to_async
+from django.db import OperationalError, transaction
+from django.db.models import Count, Max, Q
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+
+from . import caching
+from .models import (
+    ArchivedPartCodeModificationRequest,
+    ArchivedWorkItem,
+    PartCodeModificationRequest,
+    WorkItem,
+)
+from .pagination import (
+    merge_rows,
+    next_link,
+    page_query,
+    paginate,
+    paginated_response,
+    split_page,
+)
+from .registry import WORKFLOWS
+from .renderers import json_renderer
+from .search import (
+    apply_filters,
+    forget_fulltext,
+    fulltext_ready,
+    range_starts,
+    search_terms,
+)
+from .signals import requests_transitioned
+from .workflow import STATUSES
+
+
+# ==================================================
+# LIST ROW LAYER
+# ==================================================
+# Each list endpoint is described once: which rows it shows, how they
+# are ordered and which columns it emits. Lists read the shared
+# work-item table (core.work_items), so `function=all` spans every
+# registered workflow in one indexed query. Rows are fetched as
+# `values_list` tuples of just those columns and zipped straight into
+# the output dicts, so no model instances are loaded.
+#
+# The `id` a list emits is the request's own id (`object_id`); the
+# work item's id is only the keyset pagination tie-breaker.
+#
+# Histories (`archived=True`) also read the archived work items when the
+# request has a date range that reaches back past the newest archived
+# row; without a date range they show the live rows only.
+
+class ListSpec:
+    def __init__(
+        self,
+        name,
+        where,
+        statuses,
+        order_field,
+        fields,
+        archived=False,
+    ):
+        self.name = name
+        self.where = where
+        # Statuses a row can have while listed here (cache invalidation)
+        self.statuses = frozenset(statuses)
+        self.order_field = order_field
+        # True when finished (archivable) requests are listed here
+        self.archived = archived
+
+        # output key -> work-item column
+        self.keys = tuple(fields)
+        columns = list(fields.values())
+
+        # Keyset pagination needs (order_field, id) from every row;
+        # trailing columns past len(keys) are dropped by zip()
+        for column in (order_field, "id"):
+            if column not in columns:
+                columns.append(column)
+
+        self.columns = tuple(columns)
+        self.position = itemgetter(
+            self.columns.index(order_field), self.columns.index("id")
+        )
+
+    def queryset(self, function_key=None, model=WorkItem):
+        qs = model.objects.all()
+
+        if self.where is not None:
+            qs = qs.filter(self.where)
+
+        if function_key and function_key != "all":
+            if function_key in WORKFLOWS:
+                qs = qs.filter(function=function_key)
+            else:
+                qs = qs.none()
+
+        return qs
+
+    def filtered(self, params):
+        """
+        Queryset for a request's query parameters (function + filters).
+        Raises ValueError for malformed filter values.
+        """
+        return apply_filters(self.queryset(params.get("function")), params)
+
+    def sources(self, params):
+        """
+        Querysets to list for a request: the live work items, plus the
+        archived ones when the request's date range reaches them.
+        Raises ValueError for malformed filter values.
+        """
+        live = self.filtered(params)
+        if not self.archived or not _reaches_archive(params):
+            return [live]
+
+        archived = self.queryset(params.get("function"), model=ArchivedWorkItem)
+        return [live, apply_filters(archived, params)]
+
+    def project(self, qs):
+        return qs.values_list(*self.columns)
+
+    def serialize(self, rows):
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+
+def _reaches_archive(params):
+    starts = range_starts(params)
+    if starts is None:
+        return False
+
+    newest = ArchivedWorkItem.objects.aggregate(
+        newest=Max("last_modified")
+    )["newest"]
+    if newest is None:
+        return False
+    # submitted_at and created never exceed last_modified
+    return all(start <= newest for start in starts)
+
+
+# ==================================================
+# CONDITIONAL GET (ETag)
+# ==================================================
+# The ETag comes from one aggregate over the filtered set. Every
+# transition bumps `last_modified` on the row it moves, so
+# (count, max(last_modified)) changes whenever a row joins, leaves or is
+# edited. No Last-Modified is sent: it cannot see a row *leaving* (the
+# remaining rows keep their timestamps), and even the histories lose
+# rows to archival (core.archive).
+
+def _state_aggregates():
+    return {"count": Count("id"), "latest": Max("last_modified")}
+
+
+def _combine_states(states):
+    latest = [state["latest"] for state in states if state["latest"]]
+    return {
+        "count": sum(state["count"] for state in states),
+        "latest": max(latest) if latest else None,
+    }
+
+
+def list_etag(request, spec, querysets):
+    state = _combine_states([
+        qs.aggregate(**_state_aggregates()) for qs in querysets
+    ])
+    return etag_from_state(
+        request, spec, state, request.accepted_media_type
+    )
+
+
+def etag_from_state(request, spec, state, media_type):
+    latest = state["latest"]
+
+    digest = hashlib.md5(
+        "|".join([
+            spec.name,
+            str(state["count"]),
+            latest.isoformat() if latest else "",
+            request.get_full_path(),
+            media_type or "",
+        ]).encode()
+    ).hexdigest()
+    return quote_etag(digest)
+
+
+def list_response(request, spec):
+    key = caching.cache_key(request, spec.name)
+
+    cached = caching.lookup(request, key)
+    if cached is not None:
+        return cached
+
+    try:
+        response = _list_response(request, spec)
+    except OperationalError:
+        # The full-text index may have been dropped: re-check and retry
+        if not (search_terms(request.GET.get("q")) and forget_fulltext()):
+            raise
+        response = _list_response(request, spec)
+    caching.remember(key, response)
+    return response
+
+
+def _list_response(request, spec):
+    try:
+        querysets = spec.sources(request.GET)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=400)
+
+    etag = list_etag(request, spec, querysets)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        page, next_cursor = paginate(
+            request,
+            [spec.project(qs) for qs in querysets],
+            spec.order_field,
+            spec.position,
+        )
+    except ValueError:
+        return Response({"error": "Invalid cursor"}, status=400)
+
+    response = paginated_response(request, spec.serialize(page), next_cursor)
+
+    response["ETag"] = etag
+    # Let browsers keep the body but revalidate on every load
+    response["Cache-Control"] = "no-cache"
+
+    return response
+
+
+# ==================================================
+# ASYNC LIST RESPONSES (core.async_views)
+# ==================================================
+# Same queries, validators, cache entries and JSON bytes as above, but
+# awaited through the async ORM so a slow query does not hold a thread.
+# Plain Django responses: there is no DRF content negotiation here.
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        json_renderer().render(data),
+        content_type=JSON_MEDIA_TYPE,
+        status=status,
+    )
+
+
+async def alist_response(request, spec):
+    key = await caching.acache_key(request, spec.name, JSON_MEDIA_TYPE)
+
+    cached = await caching.alookup(request, key)
+    if cached is not None:
+        return cached
+
+    try:
+        response = await _alist_response(request, spec)
+    except OperationalError:
+        # The full-text index may have been dropped: re-check and retry
+        if not (search_terms(request.GET.get("q")) and forget_fulltext()):
+            raise
+        response = await _alist_response(request, spec)
+    await caching.aremember(key, response)
+    return response
+
+
+async def _alist_response(request, spec):
+    if search_terms(request.GET.get("q")):
+        # Introspection query (memoized for FULLTEXT_CHECK_INTERVAL);
+        # must not run on the event loop
+        await sync_to_async(fulltext_ready)()
+
+    try:
+        # May read the newest archived timestamp: not on the event loop
+        querysets = await sync_to_async(spec.sources)(request.GET)
+    except ValueError as exc:
+        return json_response({"error": str(exc)}, status=400)
+
+    state = _combine_states([
+        await qs.aaggregate(**_state_aggregates()) for qs in querysets
+    ])
+    etag = etag_from_state(request, spec, state, JSON_MEDIA_TYPE)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    row_lists = []
+    for qs in querysets:
+        try:
+            query, page_size = page_query(
+                request, spec.project(qs), spec.order_field
+            )
+        except ValueError:
+            return json_response({"error": "Invalid cursor"}, status=400)
+        row_lists.append([row async for row in query])
+
+    page, next_cursor = split_page(
+        merge_rows(row_lists, spec.position), page_size, spec.position
+    )
+
+    response = json_response(spec.serialize(page))
+
+    if next_cursor:
+        response["Link"] = next_link(request, next_cursor)
+        response["X-Next-Cursor"] = next_cursor
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+
+    return response
+
+
+# ==================================================
+# ENDPOINT SPECS
+# ==================================================
+
+# Creator history
+CREATED_REQUESTS = ListSpec(
+    "created-requests",
+    where=None,
+    statuses=STATUSES,
+    order_field="created",
+    archived=True,
+    fields={
+        "id": "object_id",
+        "plant": "plant",
+        "created_by": "created_by",
+        "new_material_description": "new_material_description",
+        "sap_part_code": "sap_part_code",
+        "status": "status",
+        "approver": "approved_by",
+        "submission_date": "submitted_at",
+        "reason_for_return": "remarks",
+        "last_modified": "last_modified",
+        "validation_status": "sap_validation_status",
+        "validated_by": "sap_validated_by",
+        "function": "function",
+    },
+)
+
+# Approver queue
+APPROVE_REQUESTS = ListSpec(
+    "approve-requests",
+    where=Q(status="PENDING_FOR_APPROVAL"),
+    statuses=["PENDING_FOR_APPROVAL"],
+    order_field="submitted_at",
+    fields={
+        "id": "object_id",
+        "plant": "plant",
+        "owner": "created_by",
+        "new_material_description": "new_material_description",
+        "part_code": "sap_part_code",
+        "submission_date": "submitted_at",
+        "status": "status",
+        "approver": "approved_by",
+        "previous_remarks": "remarks",
+        "modified_date": "last_modified",
+        "function": "function",
+    },
+)
+
+# Approver history
+APPROVED_REQUESTS = ListSpec(
+    "approved-requests",
+    where=~Q(status="PENDING_FOR_APPROVAL"),
+    statuses=[st for st in STATUSES if st != "PENDING_FOR_APPROVAL"],
+    order_field="last_modified",
+    archived=True,
+    fields={
+        "id": "object_id",
+        "plant": "plant",
+        "owner": "created_by",
+        "new_material_description": "new_material_description",
+        "part_code": "sap_part_code",
+        "status": "status",
+        "approver": "approved_by",
+        "submission_date": "submitted_at",
+        "modified_date": "last_modified",
+        "validation_status": "sap_validation_status",
+        "validated_by": "sap_validated_by",
+    },
+)
+
+# Validator queue
+VALIDATION_REQUESTS = ListSpec(
+    "validation-requests",
+    where=Q(status="APPROVED"),
+    statuses=["APPROVED"],
+    order_field="submitted_at",
+    fields={
+        "id": "object_id",
+        "plant": "plant",
+        "owner": "created_by",
+        "new_material_description": "new_material_description",
+        "part_code": "sap_part_code",
+        "submission_date": "submitted_at",
+        "status": "status",
+        "approver": "approved_by",
+        "modified_date": "last_modified",
+        "validation_status": "sap_validation_status",
+        "validated_by": "sap_validated_by",
+        "function": "function",
+    },
+)
+
+# Validator history (terminal statuses only)
+VALIDATED_REQUESTS = ListSpec(
+    "validated-requests",
+    where=Q(status__in=["VALIDATED", "REJECTED"]),
+    statuses=["VALIDATED", "REJECTED"],
+    order_field="last_modified",
+    archived=True,
+    fields={
+        "id": "object_id",
+        "plant": "plant",
+        "owner": "created_by",
+        "new_material_description": "new_material_description",
+        "part_code": "sap_part_code",
+        "submission_date": "submitted_at",
+        "status": "status",
+        "approver": "approved_by",
+        "modified_date": "last_modified",
+        "validation_status": "sap_validation_status",
+        "validated_by": "sap_validated_by",
+    },
+)
+
+LIST_SPECS = {
+    spec.name: spec
+    for spec in [
+        CREATED_REQUESTS,
+        APPROVE_REQUESTS,
+        APPROVED_REQUESTS,
+        VALIDATION_REQUESTS,
+        VALIDATED_REQUESTS,
+    ]
+}
+
+# Single request view (request_detail GET)
+DETAIL_FIELDS = [
+    "id",
+    "plant",
+    "sap_part_code",
+    "new_material_description",
+    "hsn_code",
+    "from_state_to_state",
+    "tax",
+    "sales_views",
+    "supplying_plant",
+    "receiving_plant",
+    "tax_indication_of_the_material",
+    "procurement_type",
+    "activate_storage_location",
+    "production_version_update",
+    "quality_management",
+    "remarks",
+    "status",
+]
+
+
+def request_detail_data(pk):
+    # Live table first; finished requests may have been archived
+    for model in (PartCodeModificationRequest, ArchivedPartCodeModificationRequest):
+        data = model.objects.filter(id=pk).values(*DETAIL_FIELDS).first()
+        if data is not None:
+            return data
+    return None
+
+
+async def arequest_detail_data(pk):
+    for model in (PartCodeModificationRequest, ArchivedPartCodeModificationRequest):
+        data = await model.objects.filter(id=pk).values(*DETAIL_FIELDS).afirst()
+        if data is not None:
+            return data
+    return None
+
+
+# ==================================================
+# CACHE INVALIDATION
+# ==================================================
+# A transition can only change lists that show its old or new status;
+# creator history shows every status, so it is dropped on any change.
+
+@receiver(requests_transitioned)
+def invalidate_lists(sender, from_status, to_status, **kwargs):
+    touched = {from_status, to_status}
+    names = [
+        spec.name
+        for spec in LIST_SPECS.values()
+        if spec.statuses & touched
+    ]
+
+    transaction.on_commit(lambda: caching.invalidate(names))
@@ -0,0 +1,90 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.archive import archive_batch, archive_candidates, archive_cutoff
+from core.registry import WORKFLOWS
+
+
+class Command(BaseCommand):
+    help = (
+        "Move finished (VALIDATED / REJECTED) requests last modified more "
+        "than --days ago into the archive tables, in small transactions. "
+        "Safe to run repeatedly, e.g. nightly from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ARCHIVE_AFTER_DAYS,
+            help="Archive requests untouched for this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.ARCHIVE_BATCH_SIZE,
+            help="Requests moved per transaction.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.1,
+            help="Seconds to sleep between batches (lets other writers in).",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what the first batch would move, without moving it.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0 or options["batch_size"] <= 0:
+            raise CommandError("--days must be >= 0 and --batch-size positive")
+
+        cutoff = archive_cutoff(options["days"])
+        self.stdout.write(f"Archiving finished requests last modified before {cutoff:%Y-%m-%d %H:%M}")
+
+        for workflow in WORKFLOWS.values():
+            if workflow.archive_model is None:
+                continue
+
+            if options["dry_run"]:
+                ids = archive_candidates(workflow, cutoff, options["batch_size"])
+                self.stdout.write(
+                    f"  {workflow.key}: {len(ids)} requests in the first batch"
+                )
+                continue
+
+            started = time.perf_counter()
+            moved = batches = 0
+            skipped = None
+            while options["max_batches"] is None or batches < options["max_batches"]:
+                candidates, ids = archive_batch(workflow, cutoff, options["batch_size"])
+                if not candidates:
+                    break
+                if not ids:
+                    # All changed under us; their work items moved on too,
+                    # unless the projection is out of date
+                    if candidates == skipped:
+                        self.stderr.write(
+                            f"  {workflow.key}: work items of requests "
+                            f"{candidates} are stale; run sync_work_items"
+                        )
+                        break
+                    skipped = candidates
+                moved += len(ids)
+                batches += 1
+                if options["pause"]:
+                    time.sleep(options["pause"])
+
+            self.stdout.write(self.style.SUCCESS(
+                f"  {workflow.key}: {moved} requests archived in {batches} "
+                f"batches ({time.perf_counter() - started:.1f}s)"
+            ))
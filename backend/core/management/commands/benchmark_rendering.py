@@ -0,0 +1,118 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core import middleware, renderers
+from core.listing import LIST_SPECS
+from core.middleware import compress_bytes
+
+
+class Command(BaseCommand):
+    help = (
+        "Time JSON serialization of list pages with DRF's renderer and the "
+        "orjson renderer (FAST_JSON_RENDERER=1), and report the bytes on "
+        "the wire uncompressed, gzipped and brotli-compressed "
+        "(COMPRESS_RESPONSES). Pages are read from the database like the "
+        "list endpoints do; seed it first (manage.py seed_requests)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--list",
+            default="validated-requests",
+            choices=sorted(LIST_SPECS),
+            help="List whose rows are rendered.",
+        )
+        parser.add_argument(
+            "--rows",
+            default="50,500,5000",
+            help="Comma-separated page sizes to measure.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Renders per measurement (the best is reported).",
+        )
+        parser.add_argument(
+            "--json",
+            dest="json_path",
+            help="Also write the results to this file.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(n) for n in options["rows"].split(",")]
+        except ValueError:
+            raise CommandError("--rows must be a list of integers")
+
+        spec = LIST_SPECS[options["list"]]
+        query = spec.project(spec.queryset()).order_by(spec.order_field)
+        rows = list(query[:max(sizes)])
+        if not rows:
+            raise CommandError("No rows to render; run seed_requests")
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING(
+                "orjson is not installed: the fast renderer falls back to DRF's"
+            ))
+
+        encodings = ["gzip"] + (["br"] if middleware.brotli is not None else [])
+        repeat = options["repeat"]
+
+        self.stdout.write(
+            f"{'rows':>6} {'renderer':<8} {'render ms':>10} {'dicts ms':>9} "
+            f"{'bytes':>10} " + " ".join(
+                f"{e + ' bytes':>10} {e + ' ms':>8}" for e in encodings
+            )
+        )
+        results = []
+        for size in sizes:
+            page = rows[:size]
+            dicts_seconds, data = _best(repeat, lambda: spec.serialize(page))
+
+            for name, renderer in (
+                ("drf", JSONRenderer()),
+                ("orjson", renderers.FastJSONRenderer()),
+            ):
+                seconds, content = _best(repeat, lambda: renderer.render(data))
+                result = {
+                    "rows": len(page),
+                    "renderer": name,
+                    "dicts_ms": dicts_seconds * 1000,
+                    "render_ms": seconds * 1000,
+                    "bytes": len(content),
+                }
+                for encoding in encodings:
+                    elapsed, compressed = _best(
+                        max(1, repeat // 4),
+                        lambda: compress_bytes(content, encoding),
+                    )
+                    result[f"{encoding}_bytes"] = len(compressed)
+                    result[f"{encoding}_ms"] = elapsed * 1000
+                results.append(result)
+
+                self.stdout.write(
+                    f"{len(page):>6} {name:<8} {result['render_ms']:>10.2f} "
+                    f"{result['dicts_ms']:>9.2f} {result['bytes']:>10} " + " ".join(
+                        f"{result[e + '_bytes']:>10} {result[e + '_ms']:>8.2f}"
+                        for e in encodings
+                    )
+                )
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(results, fh, indent=2)
+
+
+def _best(repeat, func):
+    """Fastest of `repeat` calls, and the last result."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
@@ -0,0 +1,131 @@
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import run_load, seed_requests
+from core.listing import LIST_SPECS
+from core.models import PartCodeModificationRequest
+
+
+DETAIL_SAMPLE_SIZE = 200
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput and tail latency of the sync read endpoints "
+        "(WSGI) and their async ORM twins (ASGI) under concurrent clients. "
+        "Start both servers first, e.g.\n"
+        "  gunicorn config.wsgi -b 127.0.0.1:8000 -w 4 --threads 8\n"
+        "  uvicorn config.asgi:application --port 8001 --workers 4"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--wsgi",
+            default="http://127.0.0.1:8000/api/",
+            help="Base URL of the sync endpoints on the WSGI server.",
+        )
+        parser.add_argument(
+            "--asgi",
+            default="http://127.0.0.1:8001/api/async/",
+            help="Base URL of the async endpoints on the ASGI server.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            default="10,50,200",
+            help="Comma-separated numbers of concurrent clients to try.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Requests per server and concurrency level.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert this many synthetic requests before measuring.",
+        )
+        parser.add_argument(
+            "--token",
+            help="Bearer token sent with every request (see /api/auth/login/).",
+        )
+        parser.add_argument(
+            "--cached",
+            action="store_true",
+            help="Let list pages be served from the rendered-page cache "
+                 "(by default every request reaches the database).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(n) for n in options["concurrency"].split(",")]
+        except ValueError:
+            raise CommandError("--concurrency must be a list of integers")
+
+        if options["seed"]:
+            inserted = seed_requests(options["seed"])
+            self.stdout.write(f"Seeded {inserted} requests")
+
+        headers = {}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+
+        paths = self.request_paths(options["requests"], options["cached"])
+        if not paths:
+            raise CommandError("No requests in the database; use --seed")
+
+        self.stdout.write(
+            f"{'server':<6} {'clients':>7} {'req/s':>9} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>6}"
+        )
+        for concurrency in levels:
+            for label in ["wsgi", "asgi"]:
+                stats = run_load(
+                    options[label],
+                    paths,
+                    options["requests"],
+                    concurrency,
+                    headers=headers,
+                )
+                self.report(label, concurrency, stats)
+
+    def request_paths(self, total, cached):
+        ids = list(
+            PartCodeModificationRequest.objects
+            .order_by("-id")
+            .values_list("id", flat=True)[:DETAIL_SAMPLE_SIZE]
+        )
+        if not ids:
+            return []
+
+        rng = random.Random(total)
+        paths = []
+        for n in range(total):
+            if n % 2:
+                paths.append(f"requests/{rng.choice(ids)}/")
+                continue
+
+            name = list(LIST_SPECS)[n // 2 % len(LIST_SPECS)]
+            # One page, as the dashboard reads it; a unique (ignored)
+            # parameter defeats the rendered-page cache
+            suffix = "" if cached else f"&bench={n}"
+            paths.append(f"{name}/?page_size={settings.LIST_PAGE_SIZE}{suffix}")
+
+        return paths
+
+    def report(self, label, concurrency, stats):
+        def ms(value):
+            return f"{value * 1000:8.1f}" if value is not None else f"{'-':>8}"
+
+        self.stdout.write(
+            f"{label:<6} {concurrency:>7} {stats['throughput']:>9.1f} "
+            f"{ms(stats['p50'])} {ms(stats['p95'])} {ms(stats['p99'])} "
+            f"{ms(stats['max'])} {stats['errors']:>6}"
+        )
+        if stats["errors"]:
+            self.stdout.write(self.style.WARNING(
+                f"       errors: {', '.join(stats['error_samples'])}"
+            ))
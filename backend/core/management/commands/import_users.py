@@ -0,0 +1,200 @@
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from core.models import User
+
+
+BATCH_SIZE = 1000
+
+ROLES = [role for role, _ in User.ROLES]
+
+
+def _init_worker(settings_module):
+    # Spawned workers (Windows / macOS) start without Django configured
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users from a CSV file (columns: email, password, and "
+        "optionally role, is_active). Passwords are hashed in a process "
+        "pool and rows inserted with bulk_create; existing emails "
+        "(compared case-insensitively) are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_file")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Hashing processes (default: one per CPU).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Rows per INSERT.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file and report, without hashing or inserting.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        rows, errors = self.read_rows(options["csv_file"])
+        for line, message in errors:
+            self.stderr.write(f"  line {line}: {message}")
+
+        # File emails are lowercased; stored ones may not be
+        existing = set(
+            User.objects
+            .annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=[row["email"] for row in rows])
+            .values_list("email_lower", flat=True)
+        )
+        new_rows = [row for row in rows if row["email"] not in existing]
+
+        self.stdout.write(
+            f"{len(rows) + len(errors)} rows read: {len(new_rows)} new, "
+            f"{len(existing)} already exist, {len(errors)} invalid"
+        )
+        if options["dry_run"] or not new_rows:
+            return
+
+        hash_started = time.perf_counter()
+        hashes = self.hash_passwords(
+            [row["password"] for row in new_rows], options["workers"]
+        )
+        hash_seconds = time.perf_counter() - hash_started
+
+        insert_started = time.perf_counter()
+        users = [
+            User(
+                email=row["email"],
+                password=hashed,
+                role=row["role"],
+                is_active=row["is_active"],
+            )
+            for row, hashed in zip(new_rows, hashes)
+        ]
+        created = self.insert_users(
+            users, [row["line"] for row in new_rows], options["batch_size"]
+        )
+        insert_seconds = time.perf_counter() - insert_started
+
+        total = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} users in {total:.2f}s "
+            f"({created / total:.1f} users/s)"
+        ))
+        self.stdout.write(
+            f"  hashing: {hash_seconds:.2f}s on {options['workers']} "
+            f"processes ({len(users) / hash_seconds:.1f} passwords/s)"
+        )
+        self.stdout.write(f"  insert:  {insert_seconds:.2f}s")
+
+    def read_rows(self, path):
+        """Return `(rows, [(line, error)])`; duplicate emails keep the first."""
+        try:
+            handle = open(path, encoding="utf-8-sig", newline="")
+        except OSError as exc:
+            raise CommandError(f"Cannot open {path}: {exc}")
+
+        rows = []
+        errors = []
+        seen = set()
+
+        with handle:
+            reader = csv.DictReader(handle)
+            fields = [f.strip().lower() for f in reader.fieldnames or []]
+            missing = {"email", "password"} - set(fields)
+            if missing:
+                raise CommandError(f"Missing columns: {', '.join(sorted(missing))}")
+            reader.fieldnames = fields
+
+            for record in reader:
+                line = reader.line_num
+                email = (record.get("email") or "").strip().lower()
+                password = record.get("password") or ""
+                role = (record.get("role") or "CREATOR").strip().upper()
+                active = (record.get("is_active") or "true").strip().lower()
+
+                try:
+                    validate_email(email)
+                except ValidationError:
+                    errors.append((line, f"invalid email {email!r}"))
+                    continue
+                if not password:
+                    errors.append((line, "password is required"))
+                    continue
+                if role not in ROLES:
+                    errors.append((line, f"role must be one of {', '.join(ROLES)}"))
+                    continue
+                if email in seen:
+                    errors.append((line, f"duplicate email {email}"))
+                    continue
+
+                seen.add(email)
+                rows.append({
+                    "line": line,
+                    "email": email,
+                    "password": password,
+                    "role": role,
+                    "is_active": active not in ["0", "false", "no", "n"],
+                })
+
+        return rows, errors
+
+    def insert_users(self, users, lines, batch_size):
+        """
+        Insert `users` one batch per transaction and return how many were
+        created. A batch that hits an email created since the existence
+        check is retried row by row, and the conflicting rows reported.
+        """
+        created = 0
+        for start in range(0, len(users), batch_size):
+            batch = users[start:start + batch_size]
+            try:
+                # bulk_create skips User.save(), so nothing is hashed twice
+                with transaction.atomic():
+                    User.objects.bulk_create(batch)
+                created += len(batch)
+                continue
+            except IntegrityError:
+                pass
+
+            for user, line in zip(batch, lines[start:start + batch_size]):
+                try:
+                    with transaction.atomic():
+                        User.objects.bulk_create([user])
+                    created += 1
+                except IntegrityError:
+                    self.stderr.write(f"  line {line}: {user.email} already exists")
+        return created
+
+    def hash_passwords(self, passwords, workers):
+        if workers <= 1:
+            return [make_password(password) for password in passwords]
+
+        chunksize = max(1, len(passwords) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(os.environ["DJANGO_SETTINGS_MODULE"],),
+        ) as pool:
+            return list(pool.map(make_password, passwords, chunksize=chunksize))
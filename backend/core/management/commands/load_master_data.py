@@ -0,0 +1,52 @@
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk_import import ImportFileError, iter_table
+from core.master_data import DATASETS, load_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Replace a master-data dataset with the codes in a .csv or .xlsx "
+        "file: first column the code, optional second column a "
+        "description, one header row. Running processes pick up the new "
+        "version within MASTER_DATA_CHECK_INTERVAL seconds. Datasets: "
+        + ", ".join(
+            f"{name} ({', '.join(dataset.fields)})"
+            for name, dataset in DATASETS.items()
+        )
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(DATASETS))
+        parser.add_argument("path", help="CSV or XLSX file to load.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            with open(path, "rb") as fh:
+                rows = iter_table(File(fh, name=os.path.basename(path)))
+                next(rows, None)  # header
+                codes = [
+                    (row[0], row[1] if len(row) > 1 else None)
+                    for row in rows
+                    if row and row[0] is not None
+                ]
+        except (OSError, ImportFileError) as exc:
+            raise CommandError(str(exc))
+
+        try:
+            version, changed = load_dataset(options["dataset"], codes, source=path)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if changed:
+            self.stdout.write(self.style.SUCCESS(
+                f"{options['dataset']}: loaded version {version} from {path}"
+            ))
+        else:
+            self.stdout.write(
+                f"{options['dataset']}: unchanged, still version {version}"
+            )
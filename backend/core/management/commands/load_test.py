@@ -0,0 +1,345 @@
+import json
+import random
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.auth import issue_token
+from core.benchmark import SEED_PLANTS, Operation, run_load
+from core.listing import LIST_SPECS
+from core.models import PartCodeModificationRequest, User
+from core.pagination import MAX_PAGE_SIZE, encode_cursor
+
+
+# Relative share of each endpoint in the request mix
+ENDPOINT_WEIGHTS = {
+    # queues
+    "approve-requests": 15,
+    "validation-requests": 15,
+    # histories
+    "created-requests": 8,
+    "approved-requests": 8,
+    "validated-requests": 9,
+    # single request, dashboard
+    "request-detail": 25,
+    "dashboard-summary": 5,
+    # actions (each consumes one request in the right status)
+    "approve-action": 7,
+    "validate-action": 5,
+    "resubmit": 3,
+}
+
+# Action -> status of the requests it consumes
+ACTION_STATUSES = {
+    "approve-action": "PENDING_FOR_APPROVAL",
+    "validate-action": "APPROVED",
+    "resubmit": "RETURNED_FOR_CORRECTION",
+}
+
+DETAIL_SAMPLE_SIZE = 1000
+
+# Cursors sampled per list for the deep-page reads
+CURSOR_SAMPLE_SIZE = 50
+
+LOAD_TEST_USERS = {
+    "CREATOR": "loadtest-creator@example.com",
+    "APPROVER": "loadtest-approver@example.com",
+    "VALIDATOR": "loadtest-validator@example.com",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the queue, history, detail, dashboard and action endpoints "
+        "of a running server concurrently and report p50/p95/p99 latency, "
+        "throughput and queries per request for each. Start the server "
+        "against the same database with METRICS_QUERY_HEADER=1 (for query "
+        "counts), e.g.\n"
+        "  DB_ENGINE=sqlite METRICS_QUERY_HEADER=1 "
+        "gunicorn config.wsgi -b 127.0.0.1:8000 -w 4 --threads 8\n"
+        "Actions change data: run it against a seeded database "
+        "(manage.py seed_requests), not production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base",
+            default="http://127.0.0.1:8000/api/",
+            help="Base URL of the API.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            default="10,50",
+            help="Comma-separated numbers of concurrent clients to try.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=5000,
+            help="Requests per concurrency level.",
+        )
+        parser.add_argument(
+            "--only",
+            help="Comma-separated endpoint names to run "
+                 f"(default: all of {', '.join(ENDPOINT_WEIGHTS)}).",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=settings.LIST_PAGE_SIZE,
+            help=f"page_size sent with the list reads (max {MAX_PAGE_SIZE}).",
+        )
+        parser.add_argument(
+            "--deep-pages",
+            type=float,
+            default=0.2,
+            help="Share of list reads that continue from a cursor deep "
+                 "into the list instead of reading the first page.",
+        )
+        parser.add_argument(
+            "--read-only",
+            action="store_true",
+            help="Leave out the actions.",
+        )
+        parser.add_argument(
+            "--cached",
+            action="store_true",
+            help="Let list pages be served from the rendered-page cache "
+                 "(by default every request reaches the database).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1,
+            help="Random seed for the request mix.",
+        )
+        parser.add_argument(
+            "--json",
+            dest="json_path",
+            help="Also write the results to this file.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(n) for n in options["concurrency"].split(",")]
+        except ValueError:
+            raise CommandError("--concurrency must be a list of integers")
+
+        weights = dict(ENDPOINT_WEIGHTS)
+        if options["only"]:
+            names = [n.strip() for n in options["only"].split(",")]
+            unknown = [n for n in names if n not in weights]
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(unknown)}")
+            weights = {n: weights[n] for n in names}
+        if options["read_only"]:
+            for name in ACTION_STATUSES:
+                weights.pop(name, None)
+        if not weights:
+            raise CommandError("No endpoints left to run")
+
+        if not 0 < options["page_size"] <= MAX_PAGE_SIZE:
+            raise CommandError(f"--page-size must be between 1 and {MAX_PAGE_SIZE}")
+        if not 0 <= options["deep_pages"] <= 1:
+            raise CommandError("--deep-pages must be between 0 and 1")
+
+        self.rng = random.Random(options["seed"])
+        self.cached = options["cached"]
+        self.page_size = options["page_size"]
+        self.deep_pages = options["deep_pages"]
+        self.tokens = self.auth_headers()
+        self.prepare_samples(weights, options["requests"] * len(levels))
+        if not self.detail_ids:
+            raise CommandError("No requests in the database; run seed_requests")
+
+        results = []
+        for concurrency in levels:
+            operations = self.plan(weights, options["requests"])
+            stats = run_load(
+                options["base"], operations, len(operations), concurrency
+            )
+            self.report(concurrency, stats)
+            results.append({"concurrency": concurrency, **stats})
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(results, fh, indent=2)
+
+    # -------------------------
+    # Setup
+    # -------------------------
+    def auth_headers(self):
+        """Bearer headers for one load-test user per role."""
+        headers = {}
+        for role, email in LOAD_TEST_USERS.items():
+            user, created = User.objects.get_or_create(
+                email=email,
+                defaults={"role": role, "password": secrets.token_urlsafe(16)},
+            )
+            if not created and (user.role != role or not user.is_active):
+                User.objects.filter(id=user.id).update(role=role, is_active=True)
+            headers[role] = {"Authorization": f"Bearer {issue_token(user)}"}
+        return headers
+
+    def prepare_samples(self, weights, total):
+        requests = PartCodeModificationRequest.objects
+        self.detail_ids = list(
+            requests.order_by("-id").values_list("id", flat=True)[:DETAIL_SAMPLE_SIZE]
+        )
+        self.creators = list(
+            requests.order_by("-id")
+            .values_list("created_by", flat=True)[:DETAIL_SAMPLE_SIZE]
+        )
+
+        # Deep pages: cursors at random depths of each (unfiltered) list,
+        # as a client that followed X-Next-Cursor that far would send.
+        # Seeking is by position, so they also work on filtered reads.
+        self.cursors = {}
+        for name in weights:
+            spec = LIST_SPECS.get(name)
+            if spec is None:
+                continue
+            query = spec.project(spec.queryset()).order_by(
+                f"-{spec.order_field}", "-id"
+            )
+            count = query.count()
+            depths = sorted(
+                self.rng.randrange(count)
+                for _ in range(min(count, CURSOR_SAMPLE_SIZE))
+            )
+            self.cursors[name] = [
+                encode_cursor(*spec.position(query[depth])) for depth in depths
+            ]
+
+        # Each action consumes one request; take the oldest, as a queue would
+        share = total / sum(weights.values())
+        self.action_ids = {}
+        for name, status in ACTION_STATUSES.items():
+            if name not in weights:
+                continue
+            needed = int(weights[name] * share * 1.5) + 1
+            self.action_ids[name] = list(
+                requests.filter(status=status)
+                .order_by("submitted_at", "id")
+                .values_list("id", flat=True)[:needed]
+            )
+            self.action_ids[name].reverse()
+
+    # -------------------------
+    # Request mix
+    # -------------------------
+    def plan(self, weights, total):
+        names = list(weights)
+        chosen = self.rng.choices(names, [weights[n] for n in names], k=total)
+        reads = [n for n in names if n not in ACTION_STATUSES]
+
+        operations = []
+        exhausted = set()
+        for n, name in enumerate(chosen):
+            if name in ACTION_STATUSES and not self.action_ids[name]:
+                exhausted.add(name)
+                if not reads:
+                    continue
+                name = self.rng.choice(reads)
+            operations.append(self.operation(name, n))
+
+        for name in sorted(exhausted):
+            self.stdout.write(self.style.WARNING(
+                f"Ran out of requests for {name}; replaced by reads"
+            ))
+        return operations
+
+    def operation(self, name, n):
+        rng = self.rng
+        # A unique (ignored) parameter defeats the rendered-page cache
+        bust = "" if self.cached else f"bench={n}"
+        creator = self.tokens["CREATOR"]
+        approver = self.tokens["APPROVER"]
+        validator = self.tokens["VALIDATOR"]
+
+        if name in self.cursors:
+            # Every list read is one page, as the dashboard reads them
+            page = [bust, f"page_size={self.page_size}"]
+            if self.cursors[name] and rng.random() < self.deep_pages:
+                page.append(f"cursor={rng.choice(self.cursors[name])}")
+
+        if name in ("approve-requests", "validation-requests"):
+            headers = approver if name == "approve-requests" else validator
+            params = page
+            if rng.random() < 0.3:
+                params.append(f"plant={rng.choice(SEED_PLANTS[:10])}")
+            return Operation(name, "GET", f"{name}/?{_query(params)}", headers=headers)
+
+        if name == "created-requests":
+            params = page + [f"created_by={rng.choice(self.creators)}"]
+            return Operation(name, "GET", f"{name}/?{_query(params)}", headers=creator)
+
+        if name in ("approved-requests", "validated-requests"):
+            headers = approver if name == "approved-requests" else validator
+            end = timezone.localdate() - timedelta(days=rng.randrange(300))
+            start = end - timedelta(days=rng.choice([7, 30, 90]))
+            params = page + [
+                f"modified_from={start.isoformat()}",
+                f"modified_to={end.isoformat()}",
+            ]
+            if rng.random() < 0.5:
+                params.append(f"plant={rng.choice(SEED_PLANTS[:10])}")
+            return Operation(name, "GET", f"{name}/?{_query(params)}", headers=headers)
+
+        if name == "request-detail":
+            pk = rng.choice(self.detail_ids)
+            return Operation(name, "GET", f"requests/{pk}/", headers=creator)
+
+        if name == "dashboard-summary":
+            return Operation(name, "GET", f"{name}/", headers=creator)
+
+        pk = self.action_ids[name].pop()
+        if name == "approve-action":
+            return Operation(
+                name, "POST", f"approve-requests/{pk}/action/",
+                {"action": "APPROVE"}, approver,
+            )
+        if name == "validate-action":
+            return Operation(
+                name, "POST", f"validation-requests/{pk}/action/",
+                {"action": "APPROVE"}, validator,
+            )
+        return Operation(
+            name, "PUT", f"requests/{pk}/", {"remarks": "Corrected"}, creator,
+        )
+
+    # -------------------------
+    # Output
+    # -------------------------
+    def report(self, concurrency, stats):
+        def ms(value):
+            return f"{value * 1000:8.1f}" if value is not None else f"{'-':>8}"
+
+        def queries(value):
+            return f"{value:7.1f}" if value is not None else f"{'-':>7}"
+
+        self.stdout.write(
+            f"\n{concurrency} clients, {stats['requests']} requests in "
+            f"{stats['seconds']:.1f}s\n"
+            f"{'endpoint':<20} {'reqs':>6} {'req/s':>8} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'q/req':>7} {'errors':>6}"
+        )
+        rows = list(stats["endpoints"].items()) + [("all", stats)]
+        for name, row in rows:
+            self.stdout.write(
+                f"{name:<20} {row['requests']:>6} {row['throughput']:>8.1f} "
+                f"{ms(row['p50'])} {ms(row['p95'])} {ms(row['p99'])} "
+                f"{ms(row['max'])} {queries(row['queries_per_request'])} "
+                f"{row['errors']:>6}"
+            )
+            if row["errors"] and name != "all":
+                self.stdout.write(self.style.WARNING(
+                    f"{'':<20} errors: {', '.join(row['error_samples'])}"
+                ))
+
+
+def _query(params):
+    return "&".join(p for p in params if p)
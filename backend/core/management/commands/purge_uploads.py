@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.attachments import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete attachment uploads that were started but never finished."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=settings.UPLOAD_SESSION_TTL,
+            help="Age in seconds after which an unfinished upload is dropped.",
+        )
+
+    def handle(self, *args, **options):
+        purged = purge_stale_uploads(options["max_age"])
+        self.stdout.write(f"Purged {purged} unfinished uploads")
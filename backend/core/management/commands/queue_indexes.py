@@ -0,0 +1,215 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from core.listing import LIST_SPECS
+from core.models import WorkItem
+from core.pagination import seek_after
+from core.search import FTS_TABLE, FULLTEXT_INDEX, SEARCH_FIELDS
+
+
+# ==================================================
+# INDEX SET FOR THE LIST QUERIES
+# ==================================================
+# The queue / history endpoints read the work-item table (core.models.
+# WorkItem), whose composite indexes come with its migration. This
+# command adds what migrations cannot express, the full-text index for
+# `q`, and (--check) verifies that every list query uses an index, on
+# the first page and on cursor pages.
+#
+# part_code_modification_requests needs no secondary index: lists, the
+# dashboard summary, delta sync and archival all filter and sort on the
+# work-item table, and reach request rows by primary key only.
+
+
+def fulltext_sql():
+    """
+    Statements creating the free-text search index (core.search): a
+    FULLTEXT index on MySQL, an external-content FTS5 table kept in sync
+    by triggers on SQLite.
+    """
+    qn = connection.ops.quote_name
+    table = qn(WorkItem._meta.db_table)
+    columns = ", ".join(qn(field) for field in SEARCH_FIELDS)
+
+    if connection.vendor == "mysql":
+        return [
+            f"ALTER TABLE {table} ADD FULLTEXT INDEX {qn(FULLTEXT_INDEX)} ({columns})"
+        ]
+
+    fts = qn(FTS_TABLE)
+    new = ", ".join(f"new.{qn(field)}" for field in SEARCH_FIELDS)
+    old = ", ".join(f"old.{qn(field)}" for field in SEARCH_FIELDS)
+
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, "
+        f"content='{WorkItem._meta.db_table}', content_rowid='id')",
+
+        f"CREATE TRIGGER {qn(FTS_TABLE + '_ai')} AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new}); END",
+
+        f"CREATE TRIGGER {qn(FTS_TABLE + '_ad')} AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old}); END",
+
+        f"CREATE TRIGGER {qn(FTS_TABLE + '_au')} AFTER UPDATE OF {columns} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new}); END",
+
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def analyze_sql():
+    table = connection.ops.quote_name(WorkItem._meta.db_table)
+    if connection.vendor == "mysql":
+        return f"ANALYZE TABLE {table}"
+    return f"ANALYZE {table}"
+
+
+def existing_indexes():
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, WorkItem._meta.db_table
+        )
+        tables = connection.introspection.table_names(cursor)
+
+    present = set(constraints)
+    if FTS_TABLE in tables:
+        present.add(FULLTEXT_INDEX)
+    return present
+
+
+# ==================================================
+# PLAN CHECKS
+# ==================================================
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def plan_problems(plan):
+    """Return the reasons a plan is rejected (empty list = plan is fine)."""
+    problems = []
+
+    if connection.vendor == "mysql":
+        for node in _walk(json.loads(plan)):
+            if node.get("access_type") == "ALL":
+                problems.append(f"full scan of {node.get('table_name')}")
+            if node.get("using_filesort"):
+                problems.append("filesort")
+        return problems
+
+    table = WorkItem._meta.db_table
+    for line in plan.splitlines():
+        # "<id> <parent> <notused> <detail>"
+        detail = line.split(maxsplit=3)[-1]
+        if detail == f"SCAN {table}":
+            problems.append(f"full scan of {table}")
+        if "USE TEMP B-TREE FOR ORDER BY" in detail:
+            problems.append("filesort")
+    return problems
+
+
+def list_queries(spec):
+    """
+    `(label, query)` for the pages of `spec` as core.pagination runs
+    them: the first page, a cursor page, and for a nullable order field
+    a cursor page inside the NULL tail.
+    """
+    qs = spec.project(spec.queryset())
+    cursors = [("first page", None), ("cursor page", (timezone.now(), 2**31))]
+    if WorkItem._meta.get_field(spec.order_field).null:
+        cursors.append(("cursor page, NULL tail", (None, 2**31)))
+
+    for label, cursor in cursors:
+        page = qs
+        if cursor is not None:
+            page = page.filter(seek_after(spec.order_field, *cursor))
+        yield label, page.order_by(f"-{spec.order_field}", "-id")[: settings.LIST_PAGE_SIZE + 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the full-text index the queue/history endpoints use for "
+        "`q` on the work-item table, or (--check) EXPLAIN every list query "
+        "and fail on full scans / filesorts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only EXPLAIN the list queries; exit non-zero on a bad plan.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the DDL for missing indexes without running it.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ["mysql", "sqlite"]:
+            raise CommandError(f"Unsupported database vendor: {connection.vendor}")
+
+        if options["check"]:
+            return self.check_plans()
+
+        present = existing_indexes()
+        statements = []
+
+        if FULLTEXT_INDEX in present:
+            self.stdout.write(f"  {FULLTEXT_INDEX}: present")
+        else:
+            statements += [(FULLTEXT_INDEX, sql) for sql in fulltext_sql()]
+
+        if not statements:
+            return
+
+        # Refresh statistics so the planner actually picks the new indexes
+        # (e.g. the IN (...) history walks last_modified instead of sorting)
+        statements.append(("statistics", analyze_sql()))
+
+        for position, (name, sql) in enumerate(statements):
+            if options["dry_run"]:
+                self.stdout.write(f"{sql};")
+                continue
+
+            with connection.cursor() as cursor:
+                cursor.execute(sql)
+
+            # Some entries take several statements; report each once
+            following = statements[position + 1:position + 2]
+            if not following or following[0][0] != name:
+                self.stdout.write(self.style.SUCCESS(f"  {name}: done"))
+
+    def check_plans(self):
+        failed = False
+
+        for name, spec in LIST_SPECS.items():
+            for label, qs in list_queries(spec):
+                if connection.vendor == "mysql":
+                    plan = qs.explain(format="JSON")
+                else:
+                    plan = qs.explain()
+
+                problems = plan_problems(plan)
+                if problems:
+                    failed = True
+                    self.stdout.write(
+                        self.style.ERROR(f"  {name} ({label}): {', '.join(problems)}")
+                    )
+                    self.stdout.write(plan)
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"  {name} ({label}): ok"))
+
+        if failed:
+            raise CommandError("One or more list queries regressed to a full scan or filesort")
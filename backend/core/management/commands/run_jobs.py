@@ -0,0 +1,104 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.jobs import queue_stats, work, worker_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs (notifications, SAP hand-off) from the jobs "
+        "table. Run it under a process supervisor next to the web "
+        "server; SIGTERM lets running jobs finish before exiting."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Worker processes to fork.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Jobs claimed per poll.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for more.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print the number of jobs per status and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            stats = queue_stats()
+            for status, count in stats["counts"].items():
+                self.stdout.write(f"{status:<8} {count}")
+            if stats["oldest_due_seconds"] is not None:
+                self.stdout.write(
+                    f"oldest queued job due {stats['oldest_due_seconds']:.0f}s ago"
+                )
+            return
+
+        if options["processes"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--processes and --batch-size must be positive")
+
+        if options["processes"] == 1:
+            processed = _run_worker(options["batch_size"], options["burst"])
+            self.stdout.write(f"{worker_name()}: {processed} jobs run")
+            return
+
+        # Children must not share the parent's database connections
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        children = [
+            context.Process(
+                target=_run_worker,
+                args=(options["batch_size"], options["burst"]),
+                daemon=False,
+            )
+            for _ in range(options["processes"])
+        ]
+        for child in children:
+            child.start()
+
+        def forward(signum, frame):
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+
+        signal.signal(signal.SIGTERM, forward)
+        for child in children:
+            try:
+                child.join()
+            except KeyboardInterrupt:
+                # Ctrl+C reaches the children too; wait for them
+                child.join()
+
+        failed = [child.pid for child in children if child.exitcode]
+        if failed:
+            raise CommandError(f"Workers exited with errors: {failed}")
+
+
+def _run_worker(batch_size, burst):
+    stopping = []
+
+    def stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    return work(
+        batch_size=batch_size,
+        burst=burst,
+        should_stop=lambda: bool(stopping),
+    )
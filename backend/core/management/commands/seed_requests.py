@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import SEED_CHUNK_SIZE, SEED_STATUS_WEIGHTS, seed_requests
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert synthetic part code modification requests for load tests "
+        "(millions are fine; rows go in with bulk_create in chunks). "
+        "Statuses follow SEED_STATUS_WEIGHTS in core.benchmark; actors and "
+        "timestamps match each row's status. Their work items are synced "
+        "afterwards so the lists see them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("count", type=int, help="Rows to insert.")
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread creation dates over this many days back from now.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SEED_CHUNK_SIZE,
+            help="Rows per INSERT.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Random seed; the same seed and count give the same rows.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        if count <= 0:
+            raise CommandError("count must be positive")
+        if options["days"] <= 0 or options["chunk_size"] <= 0:
+            raise CommandError("--days and --chunk-size must be positive")
+
+        started = time.perf_counter()
+        step = max(options["chunk_size"], count // 20)
+        reported = [0]
+
+        def progress(inserted):
+            if inserted - reported[0] >= step or inserted == count:
+                reported[0] = inserted
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"  {inserted}/{count} rows "
+                    f"({inserted / elapsed:.0f} rows/s)"
+                )
+
+        inserted = seed_requests(
+            count,
+            chunk_size=options["chunk_size"],
+            days=options["days"],
+            seed=options["seed"],
+            progress=progress,
+        )
+
+        mix = ", ".join(
+            f"{status} {weight}%" for status, weight in SEED_STATUS_WEIGHTS.items()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Inserted {inserted} requests in "
+            f"{time.perf_counter() - started:.1f}s ({mix})"
+        ))
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.registry import WORKFLOWS
+from core.work_items import SYNC_CHUNK_SIZE, rebuild_work_items
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-sync the work-item table from each workflow's own table and "
+        "drop items whose request is gone. Needed after writes that "
+        "bypass the workflow code (raw SQL, restores); safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--function",
+            help=f"Only this workflow ({', '.join(WORKFLOWS)}).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SYNC_CHUNK_SIZE,
+            help="Requests per upsert.",
+        )
+
+    def handle(self, *args, **options):
+        keys = list(WORKFLOWS)
+        if options["function"]:
+            if options["function"] not in WORKFLOWS:
+                raise CommandError(f"Unknown function: {options['function']}")
+            keys = [options["function"]]
+
+        for key in keys:
+            started = time.perf_counter()
+            synced, removed = rebuild_work_items(
+                WORKFLOWS[key], chunk_size=options["chunk_size"]
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"  {key}: {synced} synced, {removed} removed "
+                f"in {time.perf_counter() - started:.1f}s"
+            ))
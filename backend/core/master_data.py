@@ -0,0 +1,210 @@
+import hashlib
+import re
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import MasterDataCode, MasterDataVersion
+
+
+# ==================================================
+# MASTER-DATA REFERENCE CODES
+# ==================================================
+# Plant, HSN, tax and procurement-type values of new and resubmitted
+# requests are checked against reference datasets, so a typo is caught
+# on the form instead of by the SAP validator a few days later.
+#
+# Each process keeps every dataset in memory as a set of normalized
+# codes. Every MASTER_DATA_CHECK_INTERVAL seconds, one query reads the
+# dataset versions, and only a dataset whose version changed is
+# reloaded. Validating a request needs no queries at all.
+#
+# A dataset that was never loaded is not checked, so the forms keep
+# working until master data has been loaded.
+
+
+def _text(value):
+    # XLSX numeric cells: 8708.0 → "8708"
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _upper(value):
+    return _text(value).upper()
+
+
+def _hsn(value):
+    # "8708 99.00" → "87089900"
+    return re.sub(r"[\s.]", "", _text(value))
+
+
+def _rate(value):
+    # "18 %", "18.0", "18" → "18"
+    text = _text(value).rstrip("%").strip()
+    try:
+        rate = Decimal(text)
+    except InvalidOperation:
+        return text
+    return format(rate.normalize(), "f") if rate.is_finite() else text
+
+
+class Dataset:
+    def __init__(self, name, label, fields, normalize):
+        self.name = name
+        self.label = label
+        # Request columns whose values must be codes of this dataset
+        self.fields = list(fields)
+        self.normalize = normalize
+
+
+DATASETS = {
+    dataset.name: dataset
+    for dataset in [
+        Dataset(
+            "plants", "plant",
+            ["plant", "supplying_plant", "receiving_plant"], _upper,
+        ),
+        Dataset("hsn_codes", "HSN code", ["hsn_code"], _hsn),
+        Dataset("tax_codes", "tax rate", ["tax"], _rate),
+        Dataset("procurement_types", "procurement type", ["procurement_type"], _upper),
+    ]
+}
+
+
+# ==================================================
+# IN-PROCESS CACHE
+# ==================================================
+
+class ReferenceCache:
+    def __init__(self):
+        # dataset name -> (version, frozenset of codes)
+        self._datasets = {}
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def codes(self):
+        """dataset name -> codes, for every loaded dataset."""
+        if time.monotonic() >= self._next_check:
+            self.refresh()
+        return {name: codes for name, (_, codes) in self._datasets.items()}
+
+    def refresh(self):
+        with self._lock:
+            if time.monotonic() < self._next_check:
+                return
+            # Versions first: a load committing in between only causes
+            # one more reload at the next check
+            versions = dict(
+                MasterDataVersion.objects.values_list("dataset", "version")
+            )
+            datasets = {}
+            for name, version in versions.items():
+                current = self._datasets.get(name)
+                if current is None or current[0] != version:
+                    current = (version, frozenset(
+                        MasterDataCode.objects
+                        .filter(dataset=name)
+                        .values_list("code", flat=True)
+                    ))
+                datasets[name] = current
+            self._datasets = datasets
+            self._next_check = time.monotonic() + settings.MASTER_DATA_CHECK_INTERVAL
+
+    def invalidate(self):
+        self._next_check = 0.0
+
+
+reference_cache = ReferenceCache()
+
+
+def clean_reference_fields(fields, labels=None):
+    """
+    Check the master-data columns of `fields` ({model column: value})
+    and replace valid values with their normalized codes, in place.
+    Returns error messages naming fields by `labels` (column -> name).
+    """
+    labels = labels or {}
+    errors = []
+    loaded = reference_cache.codes()
+
+    for dataset in DATASETS.values():
+        codes = loaded.get(dataset.name)
+        if not codes:
+            continue
+        for field in dataset.fields:
+            value = fields.get(field)
+            if value is None or _text(value) == "":
+                continue
+            code = dataset.normalize(value)
+            if code in codes:
+                fields[field] = code
+            else:
+                errors.append(
+                    f"{labels.get(field, field)} '{value}' is not a known {dataset.label}"
+                )
+    return errors
+
+
+# ==================================================
+# LOADING
+# ==================================================
+
+def load_dataset(name, rows, source=None):
+    """
+    Replace dataset `name` with `rows` of `(code, description)`.
+    Returns `(version, changed)`; an identical reload changes nothing.
+    """
+    dataset = DATASETS.get(name)
+    if dataset is None:
+        raise ValueError(f"Unknown dataset {name!r}")
+
+    codes = {}
+    for code, description in rows:
+        code = dataset.normalize(code) if code is not None else ""
+        if code:
+            codes.setdefault(code, description or None)
+    if not codes:
+        raise ValueError(f"No codes to load into {name}")
+
+    digest = hashlib.sha256()
+    for code, description in sorted(codes.items()):
+        digest.update(f"{code}\t{description or ''}\n".encode())
+    checksum = digest.hexdigest()
+
+    with transaction.atomic():
+        current = (
+            MasterDataVersion.objects.select_for_update()
+            .filter(dataset=name)
+            .first()
+        )
+        if current is not None and current.checksum == checksum:
+            return current.version, False
+
+        MasterDataCode.objects.filter(dataset=name).delete()
+        MasterDataCode.objects.bulk_create(
+            [
+                MasterDataCode(dataset=name, code=code, description=description)
+                for code, description in codes.items()
+            ],
+            batch_size=1000,
+        )
+        version = current.version + 1 if current is not None else 1
+        MasterDataVersion.objects.update_or_create(
+            dataset=name,
+            defaults={
+                "version": version,
+                "checksum": checksum,
+                "row_count": len(codes),
+                "source": source,
+                "loaded_at": timezone.now(),
+            },
+        )
+
+    # Other processes notice the version within MASTER_DATA_CHECK_INTERVAL
+    reference_cache.invalidate()
+    return version, True
@@ -0,0 +1,143 @@
+import bisect
+import threading
+
+
+# ==================================================
+# IN-PROCESS METRICS (Prometheus text format)
+# ==================================================
+# A tiny registry of counters and fixed-bucket histograms, rendered in
+# the Prometheus exposition format by /api/metrics/. Values are per
+# worker process; Prometheus sums them when it scrapes every worker.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets, labels=()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {labels: list(state) for labels, state in self._values.items()}
+
+        names = self.labels + ("le",)
+        for labels, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket{_labels(names, labels + (_number(bound),))} "
+                    f"{cumulative}"
+                )
+            suffix = _labels(self.labels, labels)
+            yield f"{self.name}_sum{suffix} {_number(state[-1])}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.add(Counter(
+    "http_requests_total",
+    "Requests handled, by route and status code.",
+    labels=("method", "route", "status"),
+))
+LATENCY = REGISTRY.add(Histogram(
+    "http_request_duration_seconds",
+    "Time from request to response (first byte for streams).",
+    LATENCY_BUCKETS,
+    labels=("method", "route"),
+))
+DB_QUERIES = REGISTRY.add(Histogram(
+    "http_request_db_queries",
+    "Database queries per request.",
+    QUERY_COUNT_BUCKETS,
+    labels=("method", "route"),
+))
+DB_TIME = REGISTRY.add(Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries per request.",
+    LATENCY_BUCKETS,
+    labels=("method", "route"),
+))
+RESPONSE_SIZE = REGISTRY.add(Histogram(
+    "http_response_size_bytes",
+    "Response body size (not measured for streaming responses).",
+    SIZE_BUCKETS,
+    labels=("method", "route"),
+))
@@ -0,0 +1,310 @@
+import logging
+import time
+import zlib
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.cache import patch_vary_headers
+
+from . import metrics
+
+try:
+    import brotli
+except ImportError:  # optional dependency; gzip only
+    brotli = None
+
+
+logger = logging.getLogger("core.slow_requests")
+
+# Statements kept per request for the slow-request log
+MAX_LOGGED_QUERIES = 200
+
+
+# ==================================================
+# REQUEST METRICS
+# ==================================================
+# Times every request and counts the queries it runs on the default
+# database, labelled by URL route pattern (`api/requests/<int:id>/`,
+# not the concrete path) so the series stay bounded.
+#
+# Every connection gets one permanent execute wrapper that reports to
+# the recorder of the current request, found through a context variable.
+# Context variables follow a request into sync_to_async threads, so the
+# async ORM queries of async views are counted too.
+#
+# With SLOW_REQUEST_MS set, requests slower than that are logged on the
+# `core.slow_requests` logger together with their SQL. With
+# METRICS_QUERY_HEADER set, every response carries its query count in
+# an `X-DB-Queries` header (for load tests; off in production).
+
+class _QueryRecorder:
+    def __init__(self, keep_sql):
+        self.count = 0
+        self.seconds = 0.0
+        self.keep_sql = keep_sql
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            if self.keep_sql and len(self.statements) < MAX_LOGGED_QUERIES:
+                self.statements.append((elapsed, sql))
+
+
+_recorder = ContextVar("query_recorder", default=None)
+
+
+def _dispatch(execute, sql, params, many, context):
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def _install(wrapper):
+    if _dispatch not in wrapper.execute_wrappers:
+        wrapper.execute_wrappers.append(_dispatch)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    _install(connection)
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.route or match.view_name or "unknown"
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "SLOW_REQUEST_MS", None)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        # Connections opened before this module was loaded
+        _install(connection)
+
+        recorder = _QueryRecorder(keep_sql=self.slow_ms is not None)
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        recorder = _QueryRecorder(keep_sql=self.slow_ms is not None)
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, recorder, seconds):
+        if getattr(settings, "METRICS_QUERY_HEADER", False):
+            # Read by `manage.py load_test` for queries per request
+            response["X-DB-Queries"] = str(recorder.count)
+
+        route = _route(request)
+        if route in getattr(settings, "METRICS_EXCLUDED_ROUTES", []):
+            return
+
+        labels = (request.method, route)
+        metrics.REQUESTS.inc(labels + (str(response.status_code),))
+        metrics.LATENCY.observe(seconds, labels)
+        metrics.DB_QUERIES.observe(recorder.count, labels)
+        metrics.DB_TIME.observe(recorder.seconds, labels)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(len(response.content), labels)
+
+        if self.slow_ms is not None and seconds * 1000 >= self.slow_ms:
+            logger.warning(
+                "Slow request %s %s (%s) %.1f ms, %d queries in %.1f ms%s",
+                request.method,
+                request.get_full_path(),
+                route,
+                seconds * 1000,
+                recorder.count,
+                recorder.seconds * 1000,
+                "".join(
+                    f"\n  [{elapsed * 1000:.1f} ms] {sql}"
+                    for elapsed, sql in recorder.statements
+                ),
+            )
+
+
+# ==================================================
+# RESPONSE COMPRESSION
+# ==================================================
+# Compresses JSON, CSV and other text responses with the best encoding
+# the client's Accept-Encoding allows: brotli (`br`) when the `brotli`
+# package is installed, gzip otherwise. Streamed exports are compressed
+# as they are produced.
+#
+# Left alone: bodies under COMPRESS_MIN_SIZE, already-encoded or binary
+# content (attachments, xlsx), ranged responses, and event streams,
+# which must reach the client message by message. Strong ETags become
+# weak, so If-None-Match still matches the identity representation.
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def negotiate_encoding(accept_encoding):
+    """Preferred supported coding for an Accept-Encoding header, or None."""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    best, best_quality = None, 0.0
+    # On equal quality, the first listed here wins
+    for coding in ("br", "gzip") if brotli is not None else ("gzip",):
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class Compressor:
+    def __init__(self, encoding):
+        if encoding == "br":
+            self._stream = brotli.Compressor(
+                quality=getattr(settings, "BROTLI_QUALITY", 5)
+            )
+            self.compress = self._stream.process
+            self.finish = self._stream.finish
+        else:
+            # wbits=31: gzip header and trailer
+            self._stream = zlib.compressobj(
+                getattr(settings, "GZIP_LEVEL", 6), zlib.DEFLATED, 31
+            )
+            self.compress = self._stream.compress
+            self.finish = self._stream.flush
+
+
+def compress_bytes(data, encoding):
+    compressor = Compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+def _compress_stream(chunks, encoding):
+    compressor = Compressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _acompress_stream(chunks, encoding):
+    compressor = Compressor(encoding)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def _compressible(response):
+    content_type = response.get("Content-Type", "").lower()
+    return (
+        content_type.startswith(COMPRESSIBLE_TYPES)
+        and not content_type.startswith(UNCOMPRESSED_TYPES)
+        and not response.has_header("Content-Encoding")
+        and not response.has_header("Content-Range")
+        and not response.has_header("Accept-Ranges")
+        and response.status_code != 206
+    )
+
+
+class CompressionMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if not getattr(settings, "COMPRESS_RESPONSES", True):
+            return response
+        if not _compressible(response):
+            return response
+        min_size = getattr(settings, "COMPRESS_MIN_SIZE", 1024)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _acompress_stream(
+                    response.streaming_content, encoding
+                )
+            else:
+                response.streaming_content = _compress_stream(
+                    response.streaming_content, encoding
+                )
+            # Compressed size is unknown until the stream ends
+            response.headers.pop("Content-Length", None)
+        else:
+            compressed = compress_bytes(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
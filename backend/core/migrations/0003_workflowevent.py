@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_partcodemodificationrequest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkflowEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_id', models.BigIntegerField(blank=True, null=True)),
+                ('from_status', models.TextField(blank=True, null=True)),
+                ('to_status', models.TextField()),
+                ('actor', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'workflow_events',
+            },
+        ),
+    ]
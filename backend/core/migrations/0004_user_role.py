@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+def add_password_column(apps, schema_editor):
+    # Databases set up by hand before migrations covered it already have
+    # the column; fresh ones get it here
+    User = apps.get_model('core', 'User')
+    table = User._meta.db_table
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        columns = [
+            column.name
+            for column in connection.introspection.get_table_description(cursor, table)
+        ]
+    if 'password' not in columns:
+        field = models.CharField(default='', max_length=128)
+        field.set_attributes_from_name('password')
+        schema_editor.add_field(User, field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_workflowevent'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='user',
+                    name='password',
+                    field=models.CharField(default='', max_length=128),
+                    preserve_default=False,
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(add_password_column, migrations.RunPython.noop),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('CREATOR', 'Creator'), ('APPROVER', 'Approver'), ('VALIDATOR', 'Validator')], default='CREATOR', max_length=20),
+        ),
+    ]
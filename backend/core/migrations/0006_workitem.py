@@ -0,0 +1,69 @@
+from django.db import migrations, models
+
+
+# Columns shared by work_items and part_code_modification_requests
+COPIED_COLUMNS = [
+    'status', 'plant', 'sap_part_code', 'new_material_description',
+    'remarks', 'sap_validation_status', 'created_by', 'approved_by',
+    'sap_validated_by', 'created', 'submitted_at', 'last_modified',
+]
+
+
+def backfill_work_items(apps, schema_editor):
+    # One INSERT ... SELECT for the existing requests; the table is
+    # unmanaged, so it may not exist (e.g. a fresh test database)
+    connection = schema_editor.connection
+    source = 'part_code_modification_requests'
+    with connection.cursor() as cursor:
+        if source not in connection.introspection.table_names(cursor):
+            return
+
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(column) for column in COPIED_COLUMNS)
+    # plant is TEXT in the source, VARCHAR(100) here
+    values = ', '.join(
+        f"SUBSTR({qn(column)}, 1, 100)" if column == 'plant' else qn(column)
+        for column in COPIED_COLUMNS
+    )
+    schema_editor.execute(
+        f"INSERT INTO {qn('work_items')} "
+        f"({qn('function')}, {qn('object_id')}, {columns}) "
+        f"SELECT 'part-code-modification', {qn('id')}, {values} "
+        f"FROM {qn(source)}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_attachments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('function', models.CharField(max_length=64)),
+                ('object_id', models.BigIntegerField()),
+                ('status', models.CharField(max_length=32)),
+                ('plant', models.CharField(blank=True, max_length=100, null=True)),
+                ('sap_part_code', models.TextField(blank=True, null=True)),
+                ('new_material_description', models.TextField(blank=True, null=True)),
+                ('remarks', models.TextField(blank=True, null=True)),
+                ('sap_validation_status', models.TextField(blank=True, null=True)),
+                ('created_by', models.CharField(blank=True, max_length=254, null=True)),
+                ('approved_by', models.TextField(blank=True, null=True)),
+                ('sap_validated_by', models.TextField(blank=True, null=True)),
+                ('created', models.DateTimeField()),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('last_modified', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'work_items',
+                'indexes': [models.Index(fields=['status', 'submitted_at'], name='wi_status_submitted_idx'), models.Index(fields=['function', 'status', 'submitted_at'], name='wi_fn_status_submitted_idx'), models.Index(fields=['status', 'last_modified'], name='wi_status_modified_idx'), models.Index(fields=['last_modified'], name='wi_modified_idx'), models.Index(fields=['function', 'last_modified'], name='wi_fn_modified_idx'), models.Index(fields=['created'], name='wi_created_idx'), models.Index(fields=['created_by', 'created'], name='wi_owner_created_idx'), models.Index(fields=['status', 'plant', 'submitted_at'], name='wi_status_plant_idx')],
+                'constraints': [models.UniqueConstraint(fields=('function', 'object_id'), name='work_item_object_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_work_items, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_workitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPartCodeModificationRequest',
+            fields=[
+                ('plant', models.TextField(blank=True, null=True)),
+                ('sap_part_code', models.TextField(blank=True, null=True)),
+                ('reason_for_rejection', models.TextField(blank=True, null=True)),
+                ('new_material_description', models.TextField(blank=True, null=True)),
+                ('hsn_code', models.TextField(blank=True, null=True)),
+                ('from_state_to_state', models.TextField(blank=True, null=True)),
+                ('tax', models.TextField(blank=True, null=True)),
+                ('sales_views', models.TextField(blank=True, null=True)),
+                ('supplying_plant', models.TextField(blank=True, null=True)),
+                ('receiving_plant', models.TextField(blank=True, null=True)),
+                ('tax_indication_of_the_material', models.TextField(blank=True, null=True)),
+                ('procurement_type', models.TextField(blank=True, null=True)),
+                ('activate_storage_location', models.TextField(blank=True, null=True)),
+                ('production_version_update', models.TextField(blank=True, null=True)),
+                ('quality_management', models.TextField(blank=True, null=True)),
+                ('remarks', models.TextField(blank=True, null=True)),
+                ('sap_remarks_only_for_sap_validation_member_access', models.TextField(blank=True, null=True)),
+                ('status', models.TextField()),
+                ('sap_validation_status', models.TextField(blank=True, null=True)),
+                ('attachment_urls', models.TextField(blank=True, null=True)),
+                ('created', models.DateTimeField()),
+                ('last_modified', models.DateTimeField()),
+                ('created_by', models.TextField(blank=True, null=True)),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('approved_by', models.TextField(blank=True, null=True)),
+                ('rejected_at', models.DateTimeField(blank=True, null=True)),
+                ('rejected_by', models.TextField(blank=True, null=True)),
+                ('sap_validated_at', models.DateTimeField(blank=True, null=True)),
+                ('sap_validated_by', models.TextField(blank=True, null=True)),
+                ('last_returned_by_role', models.TextField(blank=True, null=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'part_code_modification_requests_archive',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedWorkItem',
+            fields=[
+                ('function', models.CharField(max_length=64)),
+                ('object_id', models.BigIntegerField()),
+                ('status', models.CharField(max_length=32)),
+                ('plant', models.CharField(blank=True, max_length=100, null=True)),
+                ('sap_part_code', models.TextField(blank=True, null=True)),
+                ('new_material_description', models.TextField(blank=True, null=True)),
+                ('remarks', models.TextField(blank=True, null=True)),
+                ('sap_validation_status', models.TextField(blank=True, null=True)),
+                ('created_by', models.CharField(blank=True, max_length=254, null=True)),
+                ('approved_by', models.TextField(blank=True, null=True)),
+                ('sap_validated_by', models.TextField(blank=True, null=True)),
+                ('created', models.DateTimeField()),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('last_modified', models.DateTimeField()),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'db_table': 'work_items_archive',
+                'indexes': [models.Index(fields=['status', 'last_modified'], name='wia_status_modified_idx'), models.Index(fields=['last_modified'], name='wia_modified_idx'), models.Index(fields=['created'], name='wia_created_idx'), models.Index(fields=['created_by', 'created'], name='wia_owner_created_idx')],
+                'constraints': [models.UniqueConstraint(fields=('function', 'object_id'), name='archived_work_item_object_uniq')],
+            },
+        ),
+    ]
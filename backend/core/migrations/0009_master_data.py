@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MasterDataCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(max_length=32)),
+                ('code', models.CharField(max_length=64)),
+                ('description', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'master_data',
+                'constraints': [models.UniqueConstraint(fields=('dataset', 'code'), name='master_data_code_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MasterDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(max_length=32, unique=True)),
+                ('version', models.PositiveIntegerField()),
+                ('checksum', models.CharField(max_length=64)),
+                ('row_count', models.PositiveIntegerField()),
+                ('source', models.TextField(blank=True, null=True)),
+                ('loaded_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'master_data_versions',
+            },
+        ),
+    ]
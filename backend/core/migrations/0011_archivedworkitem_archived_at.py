@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_uploadsession_chunk_started_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedworkitem',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='archivedworkitem',
+            index=models.Index(fields=['archived_at'], name='wia_archived_idx'),
+        ),
+    ]
@@ -2,8 +2,15 @@ from django.db import models
 from django.contrib.auth.hashers import make_password
 
 class User(models.Model):
+    ROLES = [
+        ("CREATOR", "Creator"),
+        ("APPROVER", "Approver"),
+        ("VALIDATOR", "Validator"),
+    ]
+
     email = models.EmailField(unique=True)
     password = models.CharField(max_length=128)  # ✅ REQUIRED
+    role = models.CharField(max_length=20, choices=ROLES, default="CREATOR")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -20,8 +27,9 @@ class User(models.Model):
 # --------------------------------------------------
 # Part Code Modification – WORKFLOW MODEL
 # --------------------------------------------------
+# Columns shared by the live table and its archive (core.archive)
 
-class PartCodeModificationRequest(models.Model):
+class PartCodeModificationFields(models.Model):
     plant = models.TextField(null=True, blank=True)
     sap_part_code = models.TextField(null=True, blank=True)
     reason_for_rejection = models.TextField(null=True, blank=True)
@@ -62,9 +70,276 @@ class PartCodeModificationRequest(models.Model):
 
     last_returned_by_role = models.TextField(null=True, blank=True)
 
+    class Meta:
+        abstract = True
+
+
+class PartCodeModificationRequest(PartCodeModificationFields):
     class Meta:
         db_table = "part_code_modification_requests"
         managed = False   # 🔥 VERY IMPORTANT
 
     def __str__(self):
         return f"{self.sap_part_code or 'NEW'} | {self.status}"
+
+
+# --------------------------------------------------
+# Live events – CROSS-WORKER RELAY
+# --------------------------------------------------
+# Only written when WORKFLOW_EVENTS_BACKEND = "database" (see core.events);
+# rows are pruned after WORKFLOW_EVENTS_RETENTION seconds.
+
+class WorkflowEvent(models.Model):
+    request_id = models.BigIntegerField(null=True, blank=True)
+    from_status = models.TextField(null=True, blank=True)
+    to_status = models.TextField()
+    actor = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "workflow_events"
+
+    def __str__(self):
+        return f"{self.request_id} | {self.from_status} -> {self.to_status}"
+
+
+# --------------------------------------------------
+# Attachments – CONTENT-ADDRESSED FILES (see core.attachments)
+# --------------------------------------------------
+
+class AttachmentBlob(models.Model):
+    # One stored file per distinct content, named by its SHA-256
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "attachment_blobs"
+
+    def __str__(self):
+        return self.sha256
+
+
+class Attachment(models.Model):
+    # Plain id: part_code_modification_requests is not managed by Django
+    request_id = models.BigIntegerField(db_index=True)
+    blob = models.ForeignKey(
+        AttachmentBlob, on_delete=models.PROTECT, related_name="attachments"
+    )
+    filename = models.TextField()
+    content_type = models.TextField()
+    uploaded_by = models.TextField(null=True, blank=True)
+    uploaded_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "attachments"
+
+    def __str__(self):
+        return f"{self.request_id} | {self.filename}"
+
+
+class UploadSession(models.Model):
+    # A resumable upload in progress; bytes land in a temp file
+    id = models.UUIDField(primary_key=True)
+    request_id = models.BigIntegerField()
+    filename = models.TextField()
+    content_type = models.TextField()
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, null=True, blank=True)
+    uploaded_by = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(db_index=True)
+    # Set while a chunk is being written (claims the current offset)
+    chunk_started_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "upload_sessions"
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+# --------------------------------------------------
+# Work items – ONE ROW PER REQUEST OF ANY WORKFLOW (see core.work_items)
+# --------------------------------------------------
+# The queue / history / dashboard columns of every registered workflow
+# (core.registry), kept in step with the detail rows on each transition,
+# so cross-workflow lists are single indexed queries.
+
+class WorkItemFields(models.Model):
+    function = models.CharField(max_length=64)
+    # Primary key of the row in the workflow's own table
+    object_id = models.BigIntegerField()
+
+    status = models.CharField(max_length=32)
+    plant = models.CharField(max_length=100, null=True, blank=True)
+    sap_part_code = models.TextField(null=True, blank=True)
+    new_material_description = models.TextField(null=True, blank=True)
+    remarks = models.TextField(null=True, blank=True)
+    sap_validation_status = models.TextField(null=True, blank=True)
+
+    created_by = models.CharField(max_length=254, null=True, blank=True)
+    approved_by = models.TextField(null=True, blank=True)
+    sap_validated_by = models.TextField(null=True, blank=True)
+
+    created = models.DateTimeField()
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    last_modified = models.DateTimeField()
+
+    class Meta:
+        abstract = True
+
+
+class WorkItem(WorkItemFields):
+    class Meta:
+        db_table = "work_items"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["function", "object_id"], name="work_item_object_uniq"
+            ),
+        ]
+        indexes = [
+            # queues: status = ? ORDER BY submitted_at
+            models.Index(fields=["status", "submitted_at"], name="wi_status_submitted_idx"),
+            models.Index(
+                fields=["function", "status", "submitted_at"],
+                name="wi_fn_status_submitted_idx",
+            ),
+            # validated history: status IN (...) ORDER BY last_modified
+            models.Index(fields=["status", "last_modified"], name="wi_status_modified_idx"),
+            # approved history, delta sync: ORDER BY last_modified
+            models.Index(fields=["last_modified"], name="wi_modified_idx"),
+            models.Index(fields=["function", "last_modified"], name="wi_fn_modified_idx"),
+            # creator history
+            models.Index(fields=["created"], name="wi_created_idx"),
+            models.Index(fields=["created_by", "created"], name="wi_owner_created_idx"),
+            # dashboard: GROUP BY status, plant with MIN(submitted_at)
+            models.Index(
+                fields=["status", "plant", "submitted_at"],
+                name="wi_status_plant_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.function} #{self.object_id} | {self.status}"
+
+
+# --------------------------------------------------
+# Archive – FINISHED REQUESTS MOVED OUT OF THE LIVE TABLES (core.archive)
+# --------------------------------------------------
+# Rows keep their ids: request ids stay valid for detail views and
+# attachments, work-item ids keep the history pagination order.
+
+class ArchivedPartCodeModificationRequest(PartCodeModificationFields):
+    id = models.BigIntegerField(primary_key=True)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "part_code_modification_requests_archive"
+
+    def __str__(self):
+        return f"{self.sap_part_code or 'NEW'} | {self.status} (archived)"
+
+
+class ArchivedWorkItem(WorkItemFields):
+    id = models.BigIntegerField(primary_key=True)
+    # Delta sync reports rows archived since a watermark as removed
+    archived_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "work_items_archive"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["function", "object_id"],
+                name="archived_work_item_object_uniq",
+            ),
+        ]
+        indexes = [
+            # histories: ORDER BY last_modified / created
+            models.Index(fields=["status", "last_modified"], name="wia_status_modified_idx"),
+            models.Index(fields=["last_modified"], name="wia_modified_idx"),
+            models.Index(fields=["created"], name="wia_created_idx"),
+            models.Index(fields=["created_by", "created"], name="wia_owner_created_idx"),
+            models.Index(fields=["archived_at"], name="wia_archived_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.function} #{self.object_id} | {self.status} (archived)"
+
+
+# --------------------------------------------------
+# Background jobs – DATABASE-BACKED QUEUE (see core.jobs)
+# --------------------------------------------------
+# Inserted in the same transaction as the write that causes them, so a
+# job exists only if that write commits; run by `manage.py run_jobs`.
+
+class Job(models.Model):
+    # Handler registered in core.jobs.JOB_HANDLERS
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+
+    # QUEUED -> RUNNING -> DONE, or back to QUEUED (retry) / FAILED
+    status = models.CharField(max_length=16, default="QUEUED")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField()
+    run_at = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, null=True, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+
+    created_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "jobs"
+        indexes = [
+            # workers: status = 'QUEUED' AND run_at <= now ORDER BY run_at
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),
+            # stale-lock recovery, pruning
+            models.Index(fields=["status", "locked_at"], name="job_status_locked_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.id} | {self.status}"
+
+
+# --------------------------------------------------
+# Master data – REFERENCE CODES CHECKED AT CREATE TIME (see core.master_data)
+# --------------------------------------------------
+# Plants, HSN codes, tax rates and procurement types, loaded from files
+# with `manage.py load_master_data`. Each load of a dataset bumps its
+# version, which tells every process to reload its in-memory copy.
+
+class MasterDataCode(models.Model):
+    # Dataset name in core.master_data.DATASETS
+    dataset = models.CharField(max_length=32)
+    # Normalized code, as stored on requests
+    code = models.CharField(max_length=64)
+    description = models.TextField(null=True, blank=True)
+
+    class Meta:
+        db_table = "master_data"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dataset", "code"], name="master_data_code_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.dataset} | {self.code}"
+
+
+class MasterDataVersion(models.Model):
+    dataset = models.CharField(max_length=32, unique=True)
+    version = models.PositiveIntegerField()
+    # SHA-256 of the loaded codes; reloading the same file is a no-op
+    checksum = models.CharField(max_length=64)
+    row_count = models.PositiveIntegerField()
+    source = models.TextField(null=True, blank=True)
+    loaded_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "master_data_versions"
+
+    def __str__(self):
+        return f"{self.dataset} v{self.version} ({self.row_count} codes)"
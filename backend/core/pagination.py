@@ -0,0 +1,147 @@
+import base64
+from datetime import datetime
+from itertools import chain
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import WorkItem
+
+
+# ==================================================
+# KEYSET (CURSOR) PAGINATION
+# ==================================================
+# Every list endpoint is ordered by one timestamp column DESC with `id`
+# as tie-breaker. A page seeks past the last (timestamp, id) pair the
+# client saw instead of using OFFSET, so page N costs the same as page 1.
+#
+# The body stays a plain JSON list (the dashboard reads it as-is); the
+# next cursor travels in the `Link` / `X-Next-Cursor` headers. Every
+# request is paged: LIST_PAGE_SIZE rows unless it asks for another
+# `page_size`, up to MAX_PAGE_SIZE.
+#
+# A list may span several tables (live + archive, see core.archive):
+# each is queried for the page with the same cursor and the rows are
+# merged, since the ids are shared and unique across them.
+
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(value, pk):
+    raw = f"{value.isoformat() if value else ''}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    # binascii.Error / UnicodeDecodeError are both ValueErrors
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    value, pk = raw.rsplit("|", 1)
+    return (datetime.fromisoformat(value) if value else None), int(pk)
+
+
+def get_page_size(request):
+    try:
+        size = int(request.GET["page_size"])
+    except (KeyError, ValueError):
+        return settings.LIST_PAGE_SIZE
+    if size <= 0:
+        return settings.LIST_PAGE_SIZE
+    return min(size, MAX_PAGE_SIZE)
+
+
+def seek_after(order_field, value, pk):
+    """
+    Rows strictly after (value, pk) in `-order_field, -id` order.
+
+    MySQL and SQLite both sort NULLs last on DESC, so a nullable column
+    (`submitted_at`) keeps its NULL rows at the tail of the listing.
+    """
+    nullable = WorkItem._meta.get_field(order_field).null
+
+    if value is None:
+        return Q(**{f"{order_field}__isnull": True, "id__lt": pk})
+
+    after = (
+        Q(**{f"{order_field}__lt": value})
+        | Q(**{order_field: value, "id__lt": pk})
+    )
+    if nullable:
+        after |= Q(**{f"{order_field}__isnull": True})
+    return after
+
+
+def page_query(request, qs, order_field):
+    """
+    Return `(query, page_size)`: the LIMITed query for the current page,
+    fetching one extra row to detect whether there is a next page.
+
+    Raises ValueError for a malformed `cursor` parameter.
+    """
+    page_size = get_page_size(request)
+    cursor = request.GET.get("cursor")
+
+    if cursor:
+        qs = qs.filter(seek_after(order_field, *decode_cursor(cursor)))
+
+    return qs.order_by(f"-{order_field}", "-id")[: page_size + 1], page_size
+
+
+def order_key(position):
+    """Sort key for an `(order_value, id)` pair; DESC puts NULLs last."""
+    value, pk = position
+    return value is not None, value, pk
+
+
+def merge_rows(row_lists, position):
+    """Rows fetched from several tables, in `-order_field, -id` order."""
+    if len(row_lists) == 1:
+        return row_lists[0]
+    return sorted(
+        chain.from_iterable(row_lists),
+        key=lambda row: order_key(position(row)),
+        reverse=True,
+    )
+
+
+def split_page(rows, page_size, position):
+    """`(page, next_cursor)` from the rows fetched by `page_query`."""
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(*position(rows[-1]))
+
+    return rows, next_cursor
+
+
+def paginate(request, querysets, order_field, position):
+    """
+    Return `(page, next_cursor)` for the current request over one or
+    more querysets.
+
+    `position(row)` gives the `(order_value, id)` pair of a fetched row.
+    Raises ValueError for a malformed `cursor` parameter.
+    """
+    row_lists = []
+    for qs in querysets:
+        query, page_size = page_query(request, qs, order_field)
+        row_lists.append(list(query))
+    return split_page(merge_rows(row_lists, position), page_size, position)
+
+
+def next_link(request, next_cursor):
+    next_url = replace_query_param(
+        request.build_absolute_uri(), "cursor", next_cursor
+    )
+    return f'<{next_url}>; rel="next"'
+
+
+def paginated_response(request, data, next_cursor):
+    response = Response(data)
+
+    if next_cursor:
+        response["Link"] = next_link(request, next_cursor)
+        response["X-Next-Cursor"] = next_cursor
+
+    return response
@@ -0,0 +1,87 @@
+from .models import ArchivedPartCodeModificationRequest, PartCodeModificationRequest
+from .workflow import APPROVER, STATUSES, VALIDATOR
+
+
+# ==================================================
+# WORKFLOW REGISTRY
+# ==================================================
+# Every workflow ("function" in the API) is declared once here: its key,
+# the model holding its requests and how that model's columns map onto
+# the shared work-item table (core.models.WorkItem). Lists take the
+# function key from `?function=`; `all` (or no parameter) spans every
+# registered workflow.
+#
+# A new workflow (e.g. Part Code Creation) registers its model with a
+# `columns` map for whatever it names differently, sends
+# `requests_transitioned` from its writes, and its requests show up in
+# every queue, history and dashboard count. With an `archive_model`,
+# requests in `final_statuses` are moved there by core.archive.
+
+# Work-item columns copied from the workflow's model
+WORK_ITEM_COLUMNS = [
+    "status",
+    "plant",
+    "sap_part_code",
+    "new_material_description",
+    "remarks",
+    "sap_validation_status",
+    "created_by",
+    "approved_by",
+    "sap_validated_by",
+    "created",
+    "submitted_at",
+    "last_modified",
+]
+
+
+class Workflow:
+    def __init__(
+        self,
+        key,
+        label,
+        model,
+        statuses,
+        stages,
+        columns=None,
+        final_statuses=(),
+        archive_model=None,
+    ):
+        self.key = key
+        self.label = label
+        self.model = model
+        self.statuses = list(statuses)
+        self.stages = list(stages)
+        # Statuses no action leaves; such requests can be archived
+        self.final_statuses = list(final_statuses)
+        self.archive_model = archive_model
+        # work-item column -> model column (same name unless listed)
+        self.columns = {column: column for column in WORK_ITEM_COLUMNS}
+        self.columns.update(columns or {})
+
+
+WORKFLOWS = {}
+
+
+def register(workflow):
+    if workflow.key in WORKFLOWS:
+        raise ValueError(f"Workflow {workflow.key!r} is already registered")
+    WORKFLOWS[workflow.key] = workflow
+    return workflow
+
+
+def workflow_for_model(model):
+    for workflow in WORKFLOWS.values():
+        if workflow.model is model:
+            return workflow
+    return None
+
+
+PART_CODE_MODIFICATION = register(Workflow(
+    key="part-code-modification",
+    label="Part Code Modification",
+    model=PartCodeModificationRequest,
+    statuses=STATUSES,
+    stages=[APPROVER, VALIDATOR],
+    final_statuses=["VALIDATED", "REJECTED"],
+    archive_model=ArchivedPartCodeModificationRequest,
+))
@@ -0,0 +1,45 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+# ==================================================
+# FAST JSON RENDERING (opt-in: FAST_JSON_RENDERER=1)
+# ==================================================
+# Same bytes as DRF's compact JSONRenderer for the payloads these views
+# return (timestamps as ISO 8601 with `Z` for UTC, UTF-8 text, None
+# dict keys as "null", U+2028 / U+2029 escaped for embedding in
+# <script>), but serialized by orjson, which handles datetimes natively
+# instead of calling back into Python per value.
+# Anything orjson does not know (Decimal, lazy strings, ...) goes
+# through DRF's encoder. Without orjson installed it is DRF's renderer.
+
+ORJSON_OPTIONS = (
+    orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+)
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        ret = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        # orjson writes these two line terminators raw; DRF escapes them
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+def json_renderer():
+    """The renderer the JSON endpoints are configured with."""
+    from django.conf import settings
+
+    return FastJSONRenderer() if settings.FAST_JSON_RENDERER else JSONRenderer()
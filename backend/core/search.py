@@ -0,0 +1,201 @@
+import re
+from datetime import datetime, time, timedelta
+from time import monotonic
+
+from django.db import connection
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import WorkItem
+
+
+# ==================================================
+# LIST FILTERS & FULL-TEXT SEARCH
+# ==================================================
+# Query parameters understood by every list / export endpoint, on top
+# of `function`:
+#
+#   plant, created_by, status    exact match
+#   sap_part_code                prefix match
+#   submitted_from / submitted_to, modified_from / modified_to
+#                                ISO date or datetime; a bare `_to` date
+#                                includes that whole day
+#   q                            free text over part code, plant,
+#                                description and creator
+#
+# A date range also decides whether a history reads the archive
+# (core.archive): see `range_starts`.
+#
+# `q` uses the full-text index `manage.py queue_indexes` creates on the
+# work-item table (MySQL FULLTEXT, SQLite FTS5). Without it, it falls
+# back to case-insensitive substring matching. Whether the index exists
+# is re-checked every FULLTEXT_CHECK_INTERVAL seconds, and right away
+# when a search query fails (see `forget_fulltext`).
+
+EXACT_FILTERS = ["plant", "created_by", "status"]
+
+DATE_RANGES = {
+    "submitted": "submitted_at",
+    "modified": "last_modified",
+}
+
+SEARCH_FIELDS = ["sap_part_code", "plant", "new_material_description", "created_by"]
+
+FULLTEXT_INDEX = "wi_fulltext_idx"
+FTS_TABLE = "work_items_fts"
+
+FULLTEXT_CHECK_INTERVAL = 300
+
+_fulltext_ready = None
+_fulltext_checked = 0.0
+
+
+def _parse_moment(value, name):
+    """Return `(aware datetime, is_date_only)` for an ISO date/datetime."""
+    try:
+        day = parse_date(value)
+        date_only = day is not None
+        if date_only:
+            moment = datetime.combine(day, time.min)
+        else:
+            moment = parse_datetime(value)
+            if moment is None:
+                raise ValueError
+    except ValueError:
+        raise ValueError(f"Invalid date for {name}: {value}")
+
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment, date_only
+
+
+def _date_filter(params, prefix, column):
+    condition = Q()
+
+    start = params.get(f"{prefix}_from")
+    if start:
+        moment, _ = _parse_moment(start, f"{prefix}_from")
+        condition &= Q(**{f"{column}__gte": moment})
+
+    end = params.get(f"{prefix}_to")
+    if end:
+        moment, date_only = _parse_moment(end, f"{prefix}_to")
+        if date_only:
+            condition &= Q(**{f"{column}__lt": moment + timedelta(days=1)})
+        else:
+            condition &= Q(**{f"{column}__lte": moment})
+
+    return condition
+
+
+def range_starts(params):
+    """
+    Lower bounds of the request's date ranges (possibly none, for `_to`
+    only), or None when it has no date range at all.
+    Raises ValueError for malformed dates.
+    """
+    if not any(
+        params.get(f"{prefix}_{end}")
+        for prefix in DATE_RANGES
+        for end in ("from", "to")
+    ):
+        return None
+
+    return [
+        _parse_moment(params[f"{prefix}_from"], f"{prefix}_from")[0]
+        for prefix in DATE_RANGES
+        if params.get(f"{prefix}_from")
+    ]
+
+
+def search_terms(text):
+    return re.findall(r"\w+", text or "")
+
+
+def fulltext_ready():
+    global _fulltext_ready, _fulltext_checked
+
+    if (
+        _fulltext_ready is None
+        or monotonic() - _fulltext_checked > FULLTEXT_CHECK_INTERVAL
+    ):
+        _fulltext_checked = monotonic()
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                tables = connection.introspection.table_names(cursor)
+                _fulltext_ready = FTS_TABLE in tables
+            elif connection.vendor == "mysql":
+                constraints = connection.introspection.get_constraints(
+                    cursor, WorkItem._meta.db_table
+                )
+                _fulltext_ready = FULLTEXT_INDEX in constraints
+            else:
+                _fulltext_ready = False
+
+    return _fulltext_ready
+
+
+def forget_fulltext():
+    """
+    Drop the memoized check, e.g. after a query using the index failed.
+    Returns True if the index was believed to exist.
+    """
+    global _fulltext_ready
+
+    was_ready = bool(_fulltext_ready)
+    _fulltext_ready = None
+    return was_ready
+
+
+def text_search(terms, model=WorkItem):
+    qn = connection.ops.quote_name
+    table = qn(WorkItem._meta.db_table)
+    # Only the live work items carry the full-text index
+    indexed = model is WorkItem and fulltext_ready()
+
+    if indexed and connection.vendor == "mysql":
+        columns = ", ".join(qn(field) for field in SEARCH_FIELDS)
+        return RawSQL(
+            f"MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)",
+            [" ".join(f"+{term}*" for term in terms)],
+            output_field=BooleanField(),
+        )
+
+    if indexed and connection.vendor == "sqlite":
+        return RawSQL(
+            f"{table}.{qn('id')} IN "
+            f"(SELECT rowid FROM {qn(FTS_TABLE)} WHERE {qn(FTS_TABLE)} MATCH %s)",
+            [" ".join(f'"{term}"*' for term in terms)],
+            output_field=BooleanField(),
+        )
+
+    condition = Q()
+    for term in terms:
+        any_field = Q()
+        for field in SEARCH_FIELDS:
+            any_field |= Q(**{f"{field}__icontains": term})
+        condition &= any_field
+    return condition
+
+
+def apply_filters(qs, params):
+    """Narrow a list queryset by the request's filter parameters."""
+    for field in EXACT_FILTERS:
+        value = params.get(field)
+        if value:
+            qs = qs.filter(**{field: value})
+
+    part_code = params.get("sap_part_code")
+    if part_code:
+        qs = qs.filter(sap_part_code__startswith=part_code)
+
+    for prefix, column in DATE_RANGES.items():
+        qs = qs.filter(_date_filter(params, prefix, column))
+
+    terms = search_terms(params.get("q"))
+    if terms:
+        qs = qs.filter(text_search(terms, qs.model))
+
+    return qs
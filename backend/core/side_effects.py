@@ -0,0 +1,163 @@
+import json
+import logging
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.core.serializers.json import DjangoJSONEncoder
+from django.dispatch import receiver
+
+from .jobs import PermanentJobError, enqueue, job
+from .models import User
+from .registry import WORKFLOWS, workflow_for_model
+from .signals import requests_transitioned
+
+
+logger = logging.getLogger("core.jobs")
+
+
+# ==================================================
+# POST-TRANSITION SIDE EFFECTS (run by core.jobs workers)
+# ==================================================
+# Every transition queues, in its own transaction:
+#
+#   notify_next_actor   mail to whoever acts next: approvers for new
+#                       and resubmitted requests, validators for
+#                       approved ones, the creator when a request is
+#                       returned, rejected or validated
+#   sap_handoff         validated requests POSTed to SAP_HANDOFF_URL
+#
+# Both read the requests when they run, not when they were queued, and
+# may run more than once (SAP should de-duplicate on request id).
+
+# New status -> role notified ("creator": each request's creator)
+NEXT_ACTORS = {
+    "PENDING_FOR_APPROVAL": "APPROVER",
+    "APPROVED": "VALIDATOR",
+    "RETURNED_FOR_CORRECTION": "creator",
+    "REJECTED": "creator",
+    "VALIDATED": "creator",
+}
+
+SUBJECTS = {
+    "PENDING_FOR_APPROVAL": "awaiting your approval",
+    "APPROVED": "awaiting SAP validation",
+    "RETURNED_FOR_CORRECTION": "returned for correction",
+    "REJECTED": "rejected",
+    "VALIDATED": "validated",
+}
+
+# Requests listed in one mail; the rest are summarized
+MAX_LISTED_REQUESTS = 50
+
+# Client errors worth retrying (timeouts, rate limits)
+RETRYABLE_STATUSES = {408, 425, 429}
+
+
+@receiver(requests_transitioned)
+def queue_side_effects(sender, ids, from_status, to_status, actor, **kwargs):
+    workflow = workflow_for_model(sender)
+    if workflow is None or not ids:
+        return
+
+    if to_status in NEXT_ACTORS:
+        enqueue("notify_next_actor", {
+            "function": workflow.key,
+            "ids": ids,
+            "to_status": to_status,
+            "actor": actor,
+        })
+    if to_status == "VALIDATED":
+        enqueue("sap_handoff", {"function": workflow.key, "ids": ids})
+
+
+# ==================================================
+# NOTIFICATIONS
+# ==================================================
+
+@job("notify_next_actor")
+def notify_next_actor(function, ids, to_status, actor=None):
+    workflow = WORKFLOWS[function]
+    # Requests that moved on meanwhile are no longer the recipient's to act on
+    requests = list(
+        workflow.model.objects
+        .filter(id__in=ids, status=to_status)
+        .order_by("id")
+        .values("id", "sap_part_code", "plant", "created_by")
+    )
+    if not requests:
+        return
+
+    role = NEXT_ACTORS[to_status]
+    if role == "creator":
+        by_recipient = {}
+        for row in requests:
+            if row["created_by"]:
+                by_recipient.setdefault(row["created_by"], []).append(row)
+    else:
+        recipients = User.objects.filter(role=role, is_active=True).values_list(
+            "email", flat=True
+        )
+        by_recipient = {email: requests for email in recipients}
+
+    by_recipient.pop(actor, None)
+    messages = [
+        _message(workflow, to_status, rows, email)
+        for email, rows in by_recipient.items()
+    ]
+    if messages:
+        send_mass_mail(messages, fail_silently=False)
+
+
+def _message(workflow, to_status, rows, email):
+    count = len(rows)
+    subject = (
+        f"{count} {workflow.label} request{'s' if count != 1 else ''} "
+        f"{SUBJECTS[to_status]}"
+    )
+    lines = [
+        f"#{row['id']}  {row['sap_part_code'] or 'NEW'}  {row['plant'] or ''}".rstrip()
+        for row in rows[:MAX_LISTED_REQUESTS]
+    ]
+    if count > MAX_LISTED_REQUESTS:
+        lines.append(f"... and {count - MAX_LISTED_REQUESTS} more")
+    return (subject, "\n".join(lines), settings.DEFAULT_FROM_EMAIL, [email])
+
+
+# ==================================================
+# SAP HAND-OFF
+# ==================================================
+
+@job("sap_handoff", max_attempts=10)
+def sap_handoff(function, ids):
+    url = settings.SAP_HANDOFF_URL
+    if not url:
+        logger.info("SAP_HANDOFF_URL is not set; %d requests not handed off", len(ids))
+        return
+
+    workflow = WORKFLOWS[function]
+    rows = list(
+        workflow.model.objects
+        .filter(id__in=ids, status="VALIDATED")
+        .order_by("id")
+        .values()
+    )
+    if not rows:
+        return
+
+    body = json.dumps(
+        {"function": function, "requests": rows}, cls=DjangoJSONEncoder
+    ).encode()
+    headers = {"Content-Type": "application/json"}
+    if settings.SAP_HANDOFF_TOKEN:
+        headers["Authorization"] = f"Bearer {settings.SAP_HANDOFF_TOKEN}"
+
+    request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=settings.SAP_HANDOFF_TIMEOUT):
+            pass
+    except urllib.error.HTTPError as exc:
+        if 400 <= exc.code < 500 and exc.code not in RETRYABLE_STATUSES:
+            raise PermanentJobError(f"SAP rejected the hand-off: HTTP {exc.code}")
+        raise
@@ -0,0 +1,19 @@
+from django.dispatch import Signal
+
+
+# ==================================================
+# WORKFLOW SIGNALS
+# ==================================================
+# Sent whenever PartCodeModificationRequest rows are created or change
+# status, after the write has been issued (possibly inside a still-open
+# transaction: receivers with side effects should use on_commit, or
+# queue a core.jobs job, which commits together with the transition).
+#
+# kwargs:
+#   ids          list of request ids (may be empty for bulk inserts on
+#                backends that do not return primary keys)
+#   from_status  previous status, None for newly created requests
+#   to_status    new status
+#   actor        email of the user who made the change
+
+requests_transitioned = Signal()
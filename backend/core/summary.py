@@ -0,0 +1,62 @@
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import WorkItem
+from .workflow import STATUSES
+
+
+# ==================================================
+# DASHBOARD SUMMARY
+# ==================================================
+# One GROUP BY (status, plant) over the work items; per-status and
+# per-plant totals and the oldest waiting items are folded from its
+# rows in Python (a few dozen rows at most).
+
+# Statuses that are waiting on someone: approver, then validator
+WAITING_STATUSES = ["PENDING_FOR_APPROVAL", "APPROVED"]
+
+
+def request_summary(created_by=None, function_key=None):
+    qs = WorkItem.objects.all()
+    if created_by:
+        qs = qs.filter(created_by=created_by)
+    if function_key and function_key != "all":
+        qs = qs.filter(function=function_key)
+
+    groups = (
+        qs.order_by()
+        .values_list("status", "plant")
+        .annotate(count=Count("id"), oldest=Min("submitted_at"))
+    )
+
+    by_status = dict.fromkeys(STATUSES, 0)
+    by_plant = {}
+    oldest = dict.fromkeys(WAITING_STATUSES)
+    total = 0
+
+    for status, plant, count, submitted_at in groups:
+        total += count
+        by_status[status] = by_status.get(status, 0) + count
+
+        plant_counts = by_plant.setdefault(plant, {"total": 0})
+        plant_counts["total"] += count
+        plant_counts[status] = plant_counts.get(status, 0) + count
+
+        if status in oldest and submitted_at is not None:
+            if oldest[status] is None or submitted_at < oldest[status]:
+                oldest[status] = submitted_at
+
+    now = timezone.now()
+
+    return {
+        "total": total,
+        "by_status": by_status,
+        "by_plant": by_plant,
+        "oldest_waiting": {
+            status: {
+                "submitted_at": submitted_at,
+                "age_seconds": int((now - submitted_at).total_seconds()),
+            } if submitted_at else None
+            for status, submitted_at in oldest.items()
+        },
+    }
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from operator import itemgetter
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ArchivedWorkItem, WorkItem
+from .pagination import decode_cursor, encode_cursor, get_page_size
+
+
+# ==================================================
+# DELTA SYNC
+# ==================================================
+# GET /api/changes/?queue=<list name>&since=<cursor>
+#
+# Every write bumps `last_modified` on the request and its work item,
+# so the work items' (last_modified, id) is a watermark over all
+# changes. A page scans the work items past the client's watermark in
+# ascending order (the last_modified index), merged with the archived
+# work items past it by `archived_at`, up to one page in total; then
+# one `id IN (...)` query picks out those currently in the queue:
+#
+#   changes   rows now in the queue (upsert them; list endpoint columns)
+#   removed   ids that changed but are not in the queue, or were moved
+#             to the archive (core.archive) in the same span (drop them
+#             if present; ids the client never had can be ignored)
+#   since     watermark for the next call
+#   has_more  call again right away with the new watermark
+#
+# Without `since` only a starting watermark is returned. A client takes
+# it *before* downloading the queue from its list endpoint, so anything
+# that changes during the download is replayed by the first delta.
+# List filters (function, plant, q, ...) apply as on the list endpoints.
+#
+# A write's `last_modified` is taken before its transaction commits, so
+# it can become visible after later timestamps were already handed out.
+# The watermark is therefore never moved closer than SETTLE_SECONDS to
+# the clock; rows in that window are sent again next time (upserts are
+# idempotent).
+
+SETTLE_SECONDS = 5
+
+
+def _after(value, pk, field="last_modified"):
+    return Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk})
+
+
+def _settled():
+    return timezone.now() - timedelta(seconds=SETTLE_SECONDS), 0
+
+
+def delta(request, spec):
+    """
+    Build the delta-sync payload for `spec`.
+    Raises ValueError for a malformed watermark or filter value.
+    """
+    since = request.GET.get("since")
+    queue = spec.filtered(request.GET)
+
+    if not since:
+        return {
+            "changes": [],
+            "removed": [],
+            "since": encode_cursor(*_settled()),
+            "has_more": False,
+        }
+
+    try:
+        watermark = decode_cursor(since)
+    except ValueError:
+        raise ValueError("Invalid watermark")
+    if watermark[0] is None:
+        raise ValueError("Invalid watermark")
+    page_size = get_page_size(request)
+
+    changed = WorkItem.objects.filter(_after(*watermark))
+    # Archived rows leave `work_items` without a new last_modified; they
+    # keep their ids, so `archived_at` orders them in the same stream
+    archived = ArchivedWorkItem.objects.filter(_after(*watermark, field="archived_at"))
+    function_key = request.GET.get("function")
+    if function_key and function_key != "all":
+        # Unknown keys match nothing, as on the list endpoints
+        changed = changed.filter(function=function_key)
+        archived = archived.filter(function=function_key)
+    changed = [
+        (last_modified, pk, object_id, False)
+        for last_modified, pk, object_id in changed
+        .order_by("last_modified", "id")
+        .values_list("last_modified", "id", "object_id")[: page_size + 1]
+    ]
+    archived = [
+        (archived_at, pk, object_id, True)
+        for archived_at, pk, object_id in archived
+        .order_by("archived_at", "id")
+        .values_list("archived_at", "id", "object_id")[: page_size + 1]
+    ]
+    stream = sorted(changed + archived, key=itemgetter(0, 1))
+    has_more = len(stream) > page_size
+    stream = stream[:page_size]
+    ids = [pk for _, pk, _, gone in stream if not gone]
+
+    members = {}
+    if ids:
+        id_index = spec.columns.index("id")
+        for row in spec.project(queue.filter(id__in=ids)):
+            members[row[id_index]] = row
+
+    if stream:
+        watermark = stream[-1][:2]
+    if not has_more:
+        # Everything up to now was scanned: move to the settle line,
+        # forward for a client that was idle, back for a recent write
+        watermark = _settled()
+
+    removed = [object_id for _, pk, object_id, _ in stream if pk not in members]
+
+    return {
+        "changes": spec.serialize([members[pk] for pk in ids if pk in members]),
+        "removed": removed,
+        "since": encode_cursor(*watermark),
+        "has_more": has_more,
+    }
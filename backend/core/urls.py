@@ -1,42 +1,83 @@
-from django.urls import path
+from django.urls import include, path
+from . import async_views
+from .async_views import request_events   # Live queue events (SSE, ASGI only)
 from .views import (
     ping,
+    metrics,                    # Prometheus metrics (local scrape)
+    login,                      # Email + password → bearer token
+    dashboard_summary,          # Dashboard counts
+    request_changes,            # Delta sync for client-side queue copies
 
     # CREATE / CREATOR
     create_requests,            # Create Requests
+    bulk_create_requests,       # Create Requests (CSV / XLSX upload)
     created_requests,           # Created Requests (history)
 
     # INSTANCE (VIEW / CORRECTION)
     request_detail,         # View single request
+    request_attachments,    # List / start attachment upload
+    upload_chunk,           # Resumable upload chunks
+    attachment_download,    # Download (HTTP Range)
                
 
     # APPROVER
     approve_requests,           # Approver queue
     approve_request_action,     # Approver action
+    approve_requests_batch_action,  # Approver action (many ids)
     approved_requests,          # Approver history
+    approved_requests_export,   # Approver history (CSV / NDJSON)
 
     # VALIDATOR
     validation_requests,        # Validator queue
     validation_request_action,  # Validator action
+    validation_requests_batch_action,  # Validator action (many ids)
     validated_requests,         # Validator history
+    validated_requests_export,  # Validator history (CSV / NDJSON)
 )
 
+# Async ORM twins of the read endpoints (see core.async_views)
+async_urlpatterns = [
+    path("created-requests/", async_views.created_requests),
+    path("requests/<int:id>/", async_views.request_detail),
+    path("approve-requests/", async_views.approve_requests),
+    path("approved-requests/", async_views.approved_requests),
+    path("validation-requests/", async_views.validation_requests),
+    path("validated-requests/", async_views.validated_requests),
+]
+
 urlpatterns = [
     # -------------------------
     # HEALTH
     # -------------------------
     path("ping/", ping),
+    path("metrics/", metrics),
+
+    # -------------------------
+    # AUTH
+    # -------------------------
+    path("auth/login/", login),
+
+    # -------------------------
+    # DASHBOARD
+    # -------------------------
+    path("dashboard-summary/", dashboard_summary),
+    path("events/", request_events),
+    path("changes/", request_changes),
 
     # -------------------------
     # CREATE / CREATOR
     # -------------------------
     path("create-requests/", create_requests),
+    path("create-requests/bulk/", bulk_create_requests),
     path("created-requests/", created_requests),
 
     # -------------------------
     # INSTANCE VIEW / CORRECTION
     # -------------------------
     path("requests/<int:id>/", request_detail),      # GET & # PUT
+    path("requests/<int:id>/attachments/", request_attachments),
+    path("uploads/<uuid:upload_id>/", upload_chunk),
+    path("attachments/<int:id>/download/", attachment_download),
             
 
     # -------------------------
@@ -44,7 +85,9 @@ urlpatterns = [
     # -------------------------
     path("approve-requests/", approve_requests),
     path("approve-requests/<int:id>/action/", approve_request_action),
+    path("approve-requests/batch-action/", approve_requests_batch_action),
     path("approved-requests/", approved_requests),
+    path("approved-requests/export/", approved_requests_export),
 
     # -------------------------
     # VALIDATOR
@@ -54,5 +97,15 @@ urlpatterns = [
         "validation-requests/<int:request_id>/action/",
         validation_request_action,
     ),
+    path(
+        "validation-requests/batch-action/",
+        validation_requests_batch_action,
+    ),
     path("validated-requests/", validated_requests),
+    path("validated-requests/export/", validated_requests_export),
+
+    # -------------------------
+    # ASYNC READS (ASGI)
+    # -------------------------
+    path("async/", include(async_urlpatterns)),
 ]
@@ -1,3 +1,61 @@
+from .models import WorkItem
+
+
 def get_current_user_email(request):
-    # TEMP DEMO USER
-    return "snehil.sp@adityaauto.com"
+    # Principal resolved by core.auth.JWTAuthentication
+    return request.user.email
+
+
+# --------------------------------------------------
+# Create Requests payload (camelCase) → model fields
+# --------------------------------------------------
+CREATE_FIELDS = {
+    "plant": "plant",
+    "sapPartCode": "sap_part_code",
+    "newDescription": "new_material_description",
+    "hsnCode": "hsn_code",
+    "fromToState": "from_state_to_state",
+    "taxPercent": "tax",
+    "salesViews": "sales_views",
+    "supplyingPlant": "supplying_plant",
+    "receivingPlant": "receiving_plant",
+    "taxIndication": "tax_indication_of_the_material",
+    "procurementType": "procurement_type",
+    "storageLocation": "activate_storage_location",
+    "productionVersion": "production_version_update",
+    "qualityManagement": "quality_management",
+    "remarks": "remarks",
+}
+
+# Model field → form field, for error messages
+CREATE_LABELS = {field: key for key, field in CREATE_FIELDS.items()}
+
+# Mandatory on the Create Requests form
+REQUIRED_CREATE_FIELDS = ["plant", "sapPartCode", "newDescription"]
+
+# The plant is copied into work_items.plant, an indexed VARCHAR (MySQL
+# cannot index TEXT without a prefix length)
+PLANT_MAX_LENGTH = WorkItem._meta.get_field("plant").max_length
+
+
+def plant_errors(fields, labels=None):
+    plant = fields.get("plant")
+    if plant is not None and len(str(plant).strip()) > PLANT_MAX_LENGTH:
+        label = (labels or {}).get("plant", "plant")
+        return [f"{label} must be at most {PLANT_MAX_LENGTH} characters"]
+    return []
+
+
+def new_request_fields(data, user_email, now):
+    fields = {
+        field: data.get(key)
+        for key, field in CREATE_FIELDS.items()
+    }
+    fields.update(
+        status="PENDING_FOR_APPROVAL",
+        created_by=user_email,
+        created=now,
+        last_modified=now,
+        submitted_at=now,
+    )
+    return fields
@@ -1,18 +1,182 @@
-from rest_framework.decorators import api_view
+import time
+
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
 from rest_framework.response import Response
 from rest_framework import status
+from django.contrib.auth.hashers import check_password
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.http import Http404, HttpResponse
 from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from .attachments import (
+    AttachmentError,
+    download_response,
+    get_upload,
+    receive_chunk,
+    serialize_attachment,
+    serialize_upload,
+    start_upload,
+)
+from .auth import issue_token
+from .bulk_import import ImportFileError, import_requests
+from .db.pool import pool_stats
+from .export import EXPORT_TYPES, export_response
+from .metrics import REGISTRY
+from .models import (
+    ArchivedPartCodeModificationRequest,
+    Attachment,
+    PartCodeModificationRequest,
+    User,
+)
+from .summary import request_summary
+from .sync import delta
+from .listing import (
+    CREATED_REQUESTS,
+    APPROVE_REQUESTS,
+    APPROVED_REQUESTS,
+    VALIDATION_REQUESTS,
+    VALIDATED_REQUESTS,
+    LIST_SPECS,
+    list_response,
+    request_detail_data,
+)
+from .master_data import clean_reference_fields
+from .utils import (
+    CREATE_LABELS,
+    get_current_user_email,
+    new_request_fields,
+    plant_errors,
+)
+from .workflow import (
+    APPROVER,
+    EDITABLE_FIELDS,
+    MAX_BATCH_SIZE,
+    VALIDATOR,
+    action_error,
+    apply_action,
+    apply_batch,
+    notify,
+    resubmit,
+)
+
+
+def _transition_failed(pk, error):
+    # The conditional UPDATE matched no row: either the request does not
+    # exist or its status has already moved on (possibly to the archive)
+    exists = (
+        PartCodeModificationRequest.objects.filter(id=pk).exists()
+        or ArchivedPartCodeModificationRequest.objects.filter(id=pk).exists()
+    )
+    if not exists:
+        return Response({"error": "Request not found"}, status=404)
+    return Response({"error": error}, status=400)
 
-from .models import PartCodeModificationRequest
-from .utils import get_current_user_email
+
+def _role_forbidden(request, stage):
+    # Approver / validator actions are reserved to users with that role
+    if request.user.role == stage.role:
+        return None
+    return Response(
+        {"error": f"Only users with the {stage.role} role can do this"},
+        status=403,
+    )
 
 
 # ==================================================
 # HEALTH CHECK
 # ==================================================
 @api_view(["GET"])
+@authentication_classes([])
+@permission_classes([])
 def ping(request):
-    return Response({"status": "ok"})
+    # One round trip through the (persistent) connection + pool stats
+    started = time.monotonic()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError as exc:
+        return Response(
+            {"status": "error", "database": {"error": str(exc)}},
+            status=503,
+        )
+
+    return Response({
+        "status": "ok",
+        "database": {
+            "vendor": connection.vendor,
+            "ping_ms": round((time.monotonic() - started) * 1000, 3),
+            "pool": pool_stats(),
+        },
+    })
+
+
+# ==================================================
+# METRICS (Prometheus scrape, local addresses only)
+# ==================================================
+@require_GET
+def metrics(request):
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+
+    return HttpResponse(
+        REGISTRY.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+# ==================================================
+# LOGIN (email + password → bearer token)
+# ==================================================
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([])
+def login(request):
+    email = (request.data.get("email") or "").strip()
+    password = request.data.get("password") or ""
+
+    user = User.objects.filter(email__iexact=email, is_active=True).first()
+    if user is None or not check_password(password, user.password):
+        return Response({"error": "Invalid email or password"}, status=401)
+
+    return Response({
+        "token": issue_token(user),
+        "email": user.email,
+        "role": user.role,
+    })
+
+
+# ==================================================
+# DASHBOARD SUMMARY (counts only)
+# ==================================================
+@api_view(["GET"])
+def dashboard_summary(request):
+    return Response(request_summary(
+        request.GET.get("created_by"), request.GET.get("function")
+    ))
+
+
+# ==================================================
+# DELTA SYNC (rows changed since a watermark)
+# ==================================================
+@api_view(["GET"])
+def request_changes(request):
+    spec = LIST_SPECS.get(request.GET.get("queue"))
+    if spec is None:
+        return Response(
+            {"error": f"queue must be one of: {', '.join(LIST_SPECS)}"},
+            status=400
+        )
+
+    try:
+        return Response(delta(request, spec))
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=400)
 
 
 # ==================================================
@@ -24,30 +188,16 @@ def create_requests(request):
     user_email = get_current_user_email(request)
     now = timezone.now()
 
-    obj = PartCodeModificationRequest.objects.create(
-        plant=data.get("plant"),
-        sap_part_code=data.get("sapPartCode"),
-        new_material_description=data.get("newDescription"),
-        hsn_code=data.get("hsnCode"),
-        from_state_to_state=data.get("fromToState"),
-        tax=data.get("taxPercent"),
-        sales_views=data.get("salesViews"),
-        supplying_plant=data.get("supplyingPlant"),
-        receiving_plant=data.get("receivingPlant"),
-        tax_indication_of_the_material=data.get("taxIndication"),
-        procurement_type=data.get("procurementType"),
-        activate_storage_location=data.get("storageLocation"),
-        production_version_update=data.get("productionVersion"),
-        quality_management=data.get("qualityManagement"),
-        remarks=data.get("remarks"),
-
-        status="PENDING_FOR_APPROVAL",
-        created_by=user_email,
-
-        created=now,
-        last_modified=now,
-        submitted_at=now,
+    fields = new_request_fields(data, user_email, now)
+    errors = plant_errors(fields, CREATE_LABELS) + clean_reference_fields(
+        fields, CREATE_LABELS
     )
+    if errors:
+        return Response({"error": "; ".join(errors)}, status=400)
+
+    with transaction.atomic():
+        obj = PartCodeModificationRequest.objects.create(**fields)
+        notify([obj.id], None, obj.status, user_email)
 
     return Response(
         {"id": obj.id, "status": obj.status},
@@ -55,153 +205,157 @@ def create_requests(request):
     )
 
 
+# ==================================================
+# BULK CREATE (CSV / XLSX upload)
+# ==================================================
+@api_view(["POST"])
+def bulk_create_requests(request):
+    uploaded = request.FILES.get("file")
+    if not uploaded:
+        return Response({"error": "file is required"}, status=400)
+
+    user_email = get_current_user_email(request)
+
+    try:
+        report = import_requests(uploaded, user_email)
+    except ImportFileError as exc:
+        return Response({"error": str(exc)}, status=400)
+
+    created = sum(1 for row in report if row["status"] == "created")
+
+    return Response(
+        {"created": created, "failed": len(report) - created, "rows": report},
+        status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+    )
+
+
 # ==================================================
 # CREATED REQUESTS (Creator History)
 # ==================================================
 @api_view(["GET"])
 def created_requests(request):
-    function = request.GET.get("function")
-
-    qs = PartCodeModificationRequest.objects.all()
-
-    if function and function not in ["all", "part-code-modification"]:
-        qs = qs.none()
-
-    qs = qs.order_by("-created")
-
-    return Response([
-        {
-            "id": r.id,
-            "function": "part-code-modification",
-            "plant": r.plant,
-            "created_by": r.created_by,
-            "new_material_description": r.new_material_description,
-            "sap_part_code": r.sap_part_code,
-            "status": r.status,
-            "approver": r.approved_by,
-            "submission_date": r.submitted_at,
-            "reason_for_return": r.remarks,
-            "last_modified": r.last_modified,
-            "validation_status": r.sap_validation_status,
-            "validated_by": r.sap_validated_by,
-        }
-        for r in qs
-    ])
+    return list_response(request, CREATED_REQUESTS)
+
 
 @api_view(["GET", "PUT"])
 def request_detail(request, id):
-    try:
-        r = PartCodeModificationRequest.objects.get(id=id)
-    except PartCodeModificationRequest.DoesNotExist:
-        return Response({"error": "Request not found"}, status=404)
+    # -------------------------
+    # PUT → Resubmit correction
+    # -------------------------
+    if request.method == "PUT":
+        changes = {
+            field: request.data[field]
+            for field in EDITABLE_FIELDS
+            if field in request.data
+        }
+        errors = plant_errors(changes) + clean_reference_fields(changes)
+        if errors:
+            return Response({"error": "; ".join(errors)}, status=400)
+
+        actor = get_current_user_email(request)
+        if not resubmit(id, changes, actor, timezone.now()):
+            return _transition_failed(id, "Only returned requests can be edited")
+
+        return Response({"status": "PENDING_FOR_APPROVAL"})
 
     # -------------------------
     # GET → View instance
     # -------------------------
-    if request.method == "GET":
-        return Response({
-            "id": r.id,
-            "plant": r.plant,
-            "sap_part_code": r.sap_part_code,
-            "new_material_description": r.new_material_description,
-            "hsn_code": r.hsn_code,
-            "from_state_to_state": r.from_state_to_state,
-            "tax": r.tax,
-            "sales_views": r.sales_views,
-            "supplying_plant": r.supplying_plant,
-            "receiving_plant": r.receiving_plant,
-            "tax_indication_of_the_material": r.tax_indication_of_the_material,
-            "procurement_type": r.procurement_type,
-            "activate_storage_location": r.activate_storage_location,
-            "production_version_update": r.production_version_update,
-            "quality_management": r.quality_management,
-            "remarks": r.remarks,
-            "status": r.status,
-        })
+    data = request_detail_data(id)
+    if data is None:
+        return Response({"error": "Request not found"}, status=404)
+
+    return Response(data)
+
+
+# ==================================================
+# ATTACHMENTS (resumable upload / ranged download)
+# ==================================================
+def _attachment_error(exc):
+    return Response({"error": str(exc), **exc.extra}, status=exc.status)
 
+
+@api_view(["GET", "POST"])
+def request_attachments(request, id):
     # -------------------------
-    # PUT → Resubmit correction
+    # POST → Start an upload
+    # -------------------------
+    if request.method == "POST":
+        try:
+            session = start_upload(
+                id, request.data, get_current_user_email(request)
+            )
+        except AttachmentError as exc:
+            return _attachment_error(exc)
+
+        return Response(
+            {"upload": serialize_upload(session)},
+            status=status.HTTP_201_CREATED,
+        )
+
+    attachments = (
+        Attachment.objects
+        .filter(request_id=id)
+        .select_related("blob")
+        .order_by("uploaded_at", "id")
+    )
+    return Response([serialize_attachment(a) for a in attachments])
+
+
+@api_view(["GET", "PUT"])
+def upload_chunk(request, upload_id):
+    # -------------------------
+    # PUT → Append raw bytes
     # -------------------------
     if request.method == "PUT":
-        if r.status != "RETURNED_FOR_CORRECTION":
+        try:
+            session, attachment = receive_chunk(
+                upload_id,
+                request.headers.get("Content-Range"),
+                # Raw body, read in small blocks (request.data is never parsed)
+                request.stream,
+                get_current_user_email(request),
+            )
+        except AttachmentError as exc:
+            return _attachment_error(exc)
+
+        if attachment is not None:
             return Response(
-                {"error": "Only returned requests can be edited"},
-                status=400,
+                {"attachment": serialize_attachment(attachment)},
+                status=status.HTTP_201_CREATED,
             )
+        return Response({"upload": serialize_upload(session)})
 
-        data = request.data
-        now = timezone.now()
+    # -------------------------
+    # GET → Resume point
+    # -------------------------
+    try:
+        session = get_upload(upload_id, get_current_user_email(request))
+    except AttachmentError as exc:
+        return _attachment_error(exc)
+    return Response({"upload": serialize_upload(session)})
 
-        r.plant = data.get("plant", r.plant)
-        r.sap_part_code = data.get("sap_part_code", r.sap_part_code)
-        r.new_material_description = data.get(
-            "new_material_description", r.new_material_description
-        )
-        r.hsn_code = data.get("hsn_code", r.hsn_code)
-        r.from_state_to_state = data.get("from_state_to_state", r.from_state_to_state)
-        r.tax = data.get("tax", r.tax)
-        r.sales_views = data.get("sales_views", r.sales_views)
-        r.supplying_plant = data.get("supplying_plant", r.supplying_plant)
-        r.receiving_plant = data.get("receiving_plant", r.receiving_plant)
-        r.tax_indication_of_the_material = data.get(
-            "tax_indication_of_the_material",
-            r.tax_indication_of_the_material,
-        )
-        r.procurement_type = data.get("procurement_type", r.procurement_type)
-        r.activate_storage_location = data.get(
-            "activate_storage_location",
-            r.activate_storage_location,
-        )
-        r.production_version_update = data.get(
-            "production_version_update",
-            r.production_version_update,
-        )
-        r.quality_management = data.get(
-            "quality_management",
-            r.quality_management,
-        )
-        r.remarks = data.get("remarks", r.remarks)
 
-        # Reset workflow
-        r.status = "PENDING_FOR_APPROVAL"
-        r.submitted_at = now
-        r.last_modified = now
-        r.save()
+@api_view(["GET"])
+def attachment_download(request, id):
+    attachment = (
+        Attachment.objects
+        .select_related("blob")
+        .filter(id=id)
+        .first()
+    )
+    if attachment is None:
+        return Response({"error": "Attachment not found"}, status=404)
+
+    return download_response(request, attachment)
 
-        return Response({"status": r.status})
 
 # ==================================================
 # APPROVER QUEUE
 # ==================================================
 @api_view(["GET"])
 def approve_requests(request):
-    function_key = request.GET.get("function")
-
-    qs = PartCodeModificationRequest.objects.filter(
-        status="PENDING_FOR_APPROVAL"
-    )
-
-    if function_key and function_key not in ["all", "part-code-modification"]:
-        qs = qs.none()
-
-    qs = qs.order_by("-submitted_at")
-
-    return Response([
-        {
-            "id": r.id,
-            "function": "part-code-modification",
-            "plant": r.plant,
-            "owner": r.created_by,
-            "new_material_description": r.new_material_description,
-            "part_code": r.sap_part_code,
-            "submission_date": r.submitted_at,
-            "status": r.status,
-            "approver": r.approved_by,
-            "previous_remarks": r.remarks,
-            "modified_date": r.last_modified,
-        }
-        for r in qs
-    ])
+    return list_response(request, APPROVE_REQUESTS)
 
 
 # ==================================================
@@ -209,118 +363,126 @@ def approve_requests(request):
 # ==================================================
 @api_view(["POST"])
 def approve_request_action(request, id):
-    try:
-        req = PartCodeModificationRequest.objects.get(id=id)
-    except PartCodeModificationRequest.DoesNotExist:
-        return Response({"error": "Request not found"}, status=404)
-
-    if req.status != "PENDING_FOR_APPROVAL":
-        return Response({"error": "Invalid state transition"}, status=400)
+    forbidden = _role_forbidden(request, APPROVER)
+    if forbidden:
+        return forbidden
 
     action = request.data.get("action")
     remarks = (request.data.get("remarks") or "").strip()
     actor = get_current_user_email(request)
     now = timezone.now()
 
-    if action not in ["APPROVE", "REJECT", "RETURN"]:
-        return Response({"error": "Invalid action"}, status=400)
+    error = action_error(action, remarks)
+    if error:
+        return Response({"error": error}, status=400)
+
+    new_status = apply_action(APPROVER, id, action, remarks, actor, now)
+    if new_status is None:
+        return _transition_failed(id, APPROVER.invalid_state_error)
+
+    return Response({"status": new_status})
+
+
+# ==================================================
+# BATCH ACTIONS (Approver / Validator)
+# ==================================================
+def _batch_action(request, stage):
+    forbidden = _role_forbidden(request, stage)
+    if forbidden:
+        return forbidden
 
-    if action == "RETURN" and not remarks:
+    ids = request.data.get("ids")
+
+    if not isinstance(ids, list) or not ids:
+        return Response({"error": "ids must be a non-empty list"}, status=400)
+
+    try:
+        ids = [int(i) for i in ids]
+    except (TypeError, ValueError):
+        return Response({"error": "ids must be integers"}, status=400)
+
+    if len(ids) > MAX_BATCH_SIZE:
         return Response(
-            {"error": "Remarks are mandatory for return"},
+            {"error": f"At most {MAX_BATCH_SIZE} ids per batch"},
             status=400
         )
 
-    if action == "APPROVE":
-        req.status = "APPROVED"
-        req.approved_at = now
-        req.approved_by = actor
+    action = request.data.get("action")
+    remarks = (request.data.get("remarks") or "").strip()
+
+    error = action_error(action, remarks)
+    if error:
+        return Response({"error": error}, status=400)
+
+    updated, invalid_state, not_found = apply_batch(
+        stage,
+        ids,
+        action,
+        remarks,
+        get_current_user_email(request),
+        timezone.now(),
+    )
+
+    return Response({
+        "updated": updated,
+        "invalid_state": invalid_state,
+        "not_found": not_found,
+    })
 
-    elif action == "REJECT":
-        req.status = "REJECTED"
-        req.rejected_at = now
-        req.rejected_by = actor
 
-    elif action == "RETURN":
-        req.status = "RETURNED_FOR_CORRECTION"
-        req.last_returned_by_role = "APPROVER"
+@api_view(["POST"])
+def approve_requests_batch_action(request):
+    return _batch_action(request, APPROVER)
 
-    if remarks:
-        req.remarks = remarks
 
-    req.last_modified = now
-    req.save()
+@api_view(["POST"])
+def validation_requests_batch_action(request):
+    return _batch_action(request, VALIDATOR)
 
-    return Response({"status": req.status})
 
 # ==================================================
 # APPROVED REQUESTS (Approver History)
 # ==================================================
 @api_view(["GET"])
 def approved_requests(request):
-    function_key = request.GET.get("function")
+    return list_response(request, APPROVED_REQUESTS)
 
-    qs = PartCodeModificationRequest.objects.exclude(
-        status="PENDING_FOR_APPROVAL"
-    )
 
-    # 🔑 FUNCTION FILTER
-    if function_key and function_key != "all":
-        if function_key != "part-code-modification":
-            qs = qs.none()
-
-    qs = qs.order_by("-last_modified")
-
-    data = [
-        {
-            "id": r.id,
-            "plant": r.plant,
-            "owner": r.created_by,
-            "new_material_description": r.new_material_description,
-            "part_code": r.sap_part_code,
-            "status": r.status,
-            "approver": r.approved_by,
-            "submission_date": r.submitted_at,
-            "modified_date": r.last_modified,
-            "validation_status": r.sap_validation_status,
-            "validated_by": r.sap_validated_by,
-        }
-        for r in qs
-    ]
+# ==================================================
+# HISTORY EXPORT (CSV / NDJSON stream)
+# ==================================================
+def _export(request, spec):
+    export_type = request.GET.get("type", "csv")
+    if export_type not in EXPORT_TYPES:
+        return Response(
+            {"error": f"type must be one of: {', '.join(EXPORT_TYPES)}"},
+            status=400
+        )
+
+    try:
+        querysets = spec.sources(request.GET)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=400)
+
+    return export_response(spec, querysets, export_type)
+
+
+@api_view(["GET"])
+def approved_requests_export(request):
+    return _export(request, APPROVED_REQUESTS)
+
+
+@api_view(["GET"])
+def validated_requests_export(request):
+    return _export(request, VALIDATED_REQUESTS)
 
-    return Response(data)
 
 # ==================================================
 # VALIDATOR QUEUE
 # ==================================================
 @api_view(["GET"])
 def validation_requests(request):
-    function_key = request.GET.get("function")
-
-    qs = PartCodeModificationRequest.objects.filter(status="APPROVED")
-
-    if function_key and function_key not in ["all", "part-code-modification"]:
-        qs = qs.none()
-
-    qs = qs.order_by("-submitted_at")
-
-    return Response([
-        {
-            "id": r.id,
-            "function": "part-code-modification",
-            "plant": r.plant,
-            "owner": r.created_by,
-            "new_material_description": r.new_material_description,
-            "part_code": r.sap_part_code,
-            "submission_date": r.submitted_at,
-            "status": r.status,
-            "approver": r.approved_by,
-            "modified_date": r.last_modified,
-            "validation_status": r.sap_validation_status,
-            "validated_by": r.sap_validated_by,
-        }
-        for r in qs
-    ])
+    return list_response(request, VALIDATION_REQUESTS)
 
 
 # ==================================================
@@ -328,55 +490,26 @@ def validation_requests(request):
 # ==================================================
 @api_view(["POST"])
 def validation_request_action(request, request_id):
-    try:
-        req = PartCodeModificationRequest.objects.get(id=request_id)
-    except PartCodeModificationRequest.DoesNotExist:
-        return Response({"error": "Request not found"}, status=404)
-
-    if req.status != "APPROVED":
-        return Response(
-            {"error": "Only approved requests can be validated"},
-            status=400
-        )
+    forbidden = _role_forbidden(request, VALIDATOR)
+    if forbidden:
+        return forbidden
 
     action = request.data.get("action")
     remarks = (request.data.get("remarks") or "").strip()
     validator = get_current_user_email(request)
     now = timezone.now()
 
-    if action not in ["APPROVE", "REJECT", "RETURN"]:
-        return Response({"error": "Invalid action"}, status=400)
-
-    if action == "RETURN" and not remarks:
-        return Response(
-            {"error": "Remarks are mandatory for return"},
-            status=400
-        )
+    error = action_error(action, remarks)
+    if error:
+        return Response({"error": error}, status=400)
 
-    if action == "APPROVE":
-        req.status = "VALIDATED"
-        req.sap_validation_status = "VALID"
-        req.sap_validated_at = now
-        req.sap_validated_by = validator
-
-    elif action == "REJECT":
-        req.status = "REJECTED"
-        req.sap_validation_status = "INVALID"
-        req.rejected_at = now
-        req.rejected_by = validator
-
-    elif action == "RETURN":
-        req.status = "RETURNED_FOR_CORRECTION"
-        req.sap_validation_status = "INVALID"
-        req.last_returned_by_role = "VALIDATOR"
-
-    if remarks:
-        req.sap_remarks_only_for_sap_validation_member_access = remarks
-
-    req.last_modified = now
-    req.save()
+    new_status = apply_action(
+        VALIDATOR, request_id, action, remarks, validator, now
+    )
+    if new_status is None:
+        return _transition_failed(request_id, VALIDATOR.invalid_state_error)
 
-    return Response({"status": req.status})
+    return Response({"status": new_status})
 
 
 # ==================================================
@@ -384,30 +517,4 @@ def validation_request_action(request, request_id):
 # ==================================================
 @api_view(["GET"])
 def validated_requests(request):
-    function_key = request.GET.get("function")
-
-    qs = PartCodeModificationRequest.objects.filter(
-        status__in=["VALIDATED", "REJECTED"]
-    )
-
-    if function_key and function_key not in ["all", "part-code-modification"]:
-        qs = qs.none()
-
-    qs = qs.order_by("-last_modified")
-
-    return Response([
-        {
-            "id": r.id,
-            "plant": r.plant,
-            "owner": r.created_by,
-            "new_material_description": r.new_material_description,
-            "part_code": r.sap_part_code,
-            "submission_date": r.submitted_at,
-            "status": r.status,
-            "approver": r.approved_by,
-            "modified_date": r.last_modified,
-            "validation_status": r.sap_validation_status,
-            "validated_by": r.sap_validated_by,
-        }
-        for r in qs
-    ])
+    return list_response(request, VALIDATED_REQUESTS)
@@ -0,0 +1,140 @@
+from django.db import connection
+from django.db.models import Max
+from django.dispatch import receiver
+
+from .models import WorkItem
+from .registry import WORK_ITEM_COLUMNS, workflow_for_model
+from .signals import requests_transitioned
+
+
+# ==================================================
+# WORK-ITEM MAINTENANCE
+# ==================================================
+# The work-item row of a request is rewritten from its detail row
+# whenever `requests_transitioned` fires, inside the same transaction
+# as the write when there is one. Writes that bypass the signal (raw
+# SQL, seeding) are caught up with `manage.py sync_work_items`.
+
+SYNC_CHUNK_SIZE = 1000
+
+# Work-item columns narrower than the request columns they copy (plant:
+# TEXT into an indexed VARCHAR). New values are length-checked by the
+# write views; older ones are cut to fit rather than failing the write.
+MAX_LENGTHS = {
+    field.name: field.max_length
+    for field in WorkItem._meta.concrete_fields
+    if field.max_length is not None
+}
+
+
+def _fit(column, value):
+    limit = MAX_LENGTHS.get(column)
+    if limit is not None and isinstance(value, str) and len(value) > limit:
+        return value[:limit]
+    return value
+
+
+def _upsert(items):
+    options = {"update_conflicts": True, "update_fields": WORK_ITEM_COLUMNS}
+    # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        options["unique_fields"] = ["function", "object_id"]
+    WorkItem.objects.bulk_create(items, **options)
+
+
+def sync_work_items(workflow, ids):
+    """Upsert the work items of `ids`; drop those whose request is gone."""
+    ids = list(ids)
+    sources = list(workflow.columns.values())
+
+    for start in range(0, len(ids), SYNC_CHUNK_SIZE):
+        chunk = ids[start:start + SYNC_CHUNK_SIZE]
+        rows = workflow.model.objects.filter(id__in=chunk).values("id", *sources)
+
+        items = [
+            WorkItem(
+                function=workflow.key,
+                object_id=row["id"],
+                **{
+                    column: _fit(column, row[source])
+                    for column, source in workflow.columns.items()
+                },
+            )
+            for row in rows
+        ]
+        if items:
+            _upsert(items)
+
+        gone = set(chunk) - {item.object_id for item in items}
+        if gone:
+            WorkItem.objects.filter(function=workflow.key, object_id__in=gone).delete()
+
+
+def newest_id(model):
+    """
+    Highest id in `model`'s table, 0 when empty. Inserts without returned
+    ids (raw SQL, `bulk_create` on MySQL) read it first in the same
+    transaction: the rows they add are the ones past it, since
+    autoincrement ids only grow.
+    """
+    return model.objects.aggregate(newest=Max("id"))["newest"] or 0
+
+
+def rebuild_work_items(workflow, chunk_size=SYNC_CHUNK_SIZE, progress=None):
+    """
+    Re-sync every work item of `workflow` from its table, in id order,
+    and remove items whose request no longer exists.
+    Returns `(synced, removed)`.
+    """
+    synced = 0
+    last = 0
+    while True:
+        ids = list(
+            workflow.model.objects
+            .filter(id__gt=last)
+            .order_by("id")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+        sync_work_items(workflow, ids)
+        synced += len(ids)
+        last = ids[-1]
+        if progress:
+            progress(synced)
+
+    removed = 0
+    last = 0
+    while True:
+        object_ids = list(
+            WorkItem.objects
+            .filter(function=workflow.key, object_id__gt=last)
+            .order_by("object_id")
+            .values_list("object_id", flat=True)[:chunk_size]
+        )
+        if not object_ids:
+            break
+        present = set(
+            workflow.model.objects
+            .filter(id__in=object_ids)
+            .values_list("id", flat=True)
+        )
+        orphans = [pk for pk in object_ids if pk not in present]
+        if orphans:
+            removed += WorkItem.objects.filter(
+                function=workflow.key, object_id__in=orphans
+            ).delete()[0]
+        last = object_ids[-1]
+
+    return synced, removed
+
+
+@receiver(requests_transitioned)
+def update_work_items(sender, ids, from_status, **kwargs):
+    workflow = workflow_for_model(sender)
+    if workflow is None:
+        return
+
+    if ids:
+        sync_work_items(workflow, ids)
+
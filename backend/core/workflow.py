@@ -0,0 +1,225 @@
+from django.db import transaction
+
+from .models import PartCodeModificationRequest
+from .signals import requests_transitioned
+
+
+# ==================================================
+# WORKFLOW TRANSITION RULES
+# ==================================================
+# Approver and validator actions share one set of rules, used by the
+# single-request action views and the batch endpoints alike.
+
+STATUSES = [
+    "PENDING_FOR_APPROVAL",
+    "APPROVED",
+    "RETURNED_FOR_CORRECTION",
+    "REJECTED",
+    "VALIDATED",
+]
+
+ACTIONS = ["APPROVE", "REJECT", "RETURN"]
+
+MAX_BATCH_SIZE = 500
+
+
+class Stage:
+    def __init__(self, role, from_status, remarks_field, invalid_state_error, outcomes):
+        self.role = role
+        self.from_status = from_status
+        self.remarks_field = remarks_field
+        self.invalid_state_error = invalid_state_error
+        # action -> fn(actor, now) -> {column: value}
+        self.outcomes = outcomes
+
+    def changes(self, action, remarks, actor, now):
+        """Columns written when `action` is applied at this stage."""
+        changes = self.outcomes[action](actor, now)
+
+        if remarks:
+            changes[self.remarks_field] = remarks
+
+        changes["last_modified"] = now
+        return changes
+
+
+APPROVER = Stage(
+    role="APPROVER",
+    from_status="PENDING_FOR_APPROVAL",
+    remarks_field="remarks",
+    invalid_state_error="Invalid state transition",
+    outcomes={
+        "APPROVE": lambda actor, now: {
+            "status": "APPROVED",
+            "approved_at": now,
+            "approved_by": actor,
+        },
+        "REJECT": lambda actor, now: {
+            "status": "REJECTED",
+            "rejected_at": now,
+            "rejected_by": actor,
+        },
+        "RETURN": lambda actor, now: {
+            "status": "RETURNED_FOR_CORRECTION",
+            "last_returned_by_role": "APPROVER",
+        },
+    },
+)
+
+VALIDATOR = Stage(
+    role="VALIDATOR",
+    from_status="APPROVED",
+    remarks_field="sap_remarks_only_for_sap_validation_member_access",
+    invalid_state_error="Only approved requests can be validated",
+    outcomes={
+        "APPROVE": lambda actor, now: {
+            "status": "VALIDATED",
+            "sap_validation_status": "VALID",
+            "sap_validated_at": now,
+            "sap_validated_by": actor,
+        },
+        "REJECT": lambda actor, now: {
+            "status": "REJECTED",
+            "sap_validation_status": "INVALID",
+            "rejected_at": now,
+            "rejected_by": actor,
+        },
+        "RETURN": lambda actor, now: {
+            "status": "RETURNED_FOR_CORRECTION",
+            "sap_validation_status": "INVALID",
+            "last_returned_by_role": "VALIDATOR",
+        },
+    },
+)
+
+
+# Fields a creator may change when resubmitting a returned request
+EDITABLE_FIELDS = [
+    "plant",
+    "sap_part_code",
+    "new_material_description",
+    "hsn_code",
+    "from_state_to_state",
+    "tax",
+    "sales_views",
+    "supplying_plant",
+    "receiving_plant",
+    "tax_indication_of_the_material",
+    "procurement_type",
+    "activate_storage_location",
+    "production_version_update",
+    "quality_management",
+    "remarks",
+]
+
+
+def notify(ids, from_status, to_status, actor):
+    requests_transitioned.send(
+        sender=PartCodeModificationRequest,
+        ids=ids,
+        from_status=from_status,
+        to_status=to_status,
+        actor=actor,
+    )
+
+
+def action_error(action, remarks):
+    """Validation message for an action payload, or None if it is valid."""
+    if action not in ACTIONS:
+        return "Invalid action"
+
+    if action == "RETURN" and not remarks:
+        return "Remarks are mandatory for return"
+
+    return None
+
+
+# ==================================================
+# SINGLE-REQUEST TRANSITIONS
+# ==================================================
+# Each transition is one `UPDATE ... WHERE id = ? AND status = ?` that
+# writes only the changed columns. Of two approvers racing on the same
+# request, the loser updates 0 rows instead of overwriting the winner.
+
+def transition(pk, from_status, changes):
+    """True if the row moved; False if it is missing or not in `from_status`."""
+    updated = PartCodeModificationRequest.objects.filter(
+        id=pk,
+        status=from_status,
+    ).update(**changes)
+
+    return updated == 1
+
+
+def apply_action(stage, pk, action, remarks, actor, now):
+    """Apply an approver/validator action; returns the new status or None."""
+    changes = stage.changes(action, remarks, actor, now)
+
+    # One transaction with what the receivers write (work item, jobs)
+    with transaction.atomic():
+        if not transition(pk, stage.from_status, changes):
+            return None
+
+        notify([pk], stage.from_status, changes["status"], actor)
+    return changes["status"]
+
+
+def resubmit(pk, data, actor, now):
+    """Send a returned request back for approval with the edited fields."""
+    changes = {
+        field: data[field]
+        for field in EDITABLE_FIELDS
+        if field in data
+    }
+    changes.update(
+        status="PENDING_FOR_APPROVAL",
+        submitted_at=now,
+        last_modified=now,
+    )
+
+    with transaction.atomic():
+        if not transition(pk, "RETURNED_FOR_CORRECTION", changes):
+            return False
+
+        notify([pk], "RETURNED_FOR_CORRECTION", "PENDING_FOR_APPROVAL", actor)
+    return True
+
+
+# ==================================================
+# BATCH TRANSITIONS
+# ==================================================
+
+def apply_batch(stage, ids, action, remarks, actor, now):
+    """
+    Apply `action` to every id currently in `stage.from_status`.
+
+    One locking SELECT classifies the ids, one conditional UPDATE moves
+    the eligible ones; both run in a single transaction.
+    Returns `(updated, invalid_state, not_found)` id lists.
+    """
+    ids = list(dict.fromkeys(ids))
+    changes = stage.changes(action, remarks, actor, now)
+
+    with transaction.atomic():
+        current = dict(
+            PartCodeModificationRequest.objects
+            .select_for_update()
+            .filter(id__in=ids)
+            .values_list("id", "status")
+        )
+
+        updated = [i for i in ids if current.get(i) == stage.from_status]
+        invalid_state = [
+            i for i in ids
+            if i in current and current[i] != stage.from_status
+        ]
+        not_found = [i for i in ids if i not in current]
+
+        if updated:
+            PartCodeModificationRequest.objects.filter(
+                id__in=updated,
+                status=stage.from_status,
+            ).update(**changes)
+            notify(updated, stage.from_status, changes["status"], actor)
+
+    return updated, invalid_state, not_found
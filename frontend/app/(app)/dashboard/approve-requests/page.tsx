@@ -1,6 +1,8 @@
 "use client";
 
 import { useEffect, useRef, useState } from "react";
+import LoadMore from "../../../../components/LoadMore";
+import { apiFetch, fetchPage } from "../../../../lib/api";
 
 /* ================= TYPES ================= */
 
@@ -47,27 +49,32 @@ export default function ApproveRequestsPage() {
   const [selectedKey, setSelectedKey] = useState("all");
   const [requests, setRequests] = useState<ApproveRequest[]>([]);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [remarks, setRemarks] = useState<Record<number, string>>({});
 
   /* ================= DATA LOAD ================= */
 
-  async function fetchApproveRequests(fn: string) {
-    setLoading(true);
-
-    const url =
-      fn === "all"
-        ? "http://127.0.0.1:8000/api/approve-requests/"
-        : `http://127.0.0.1:8000/api/approve-requests/?function=${fn}`;
+  async function fetchApproveRequests(fn: string, cursor: string | null = null) {
+    // Later pages are appended below the rows already shown
+    const setBusy = cursor ? setLoadingMore : setLoading;
+    setBusy(true);
 
     try {
-      const res = await fetch(url);
-      const data = await res.json();
-      setRequests(data);
-    } catch {
-      setRequests([]);
+      const page = await fetchPage<ApproveRequest>(
+        "approve-requests/",
+        fn === "all" ? {} : { function: fn },
+        cursor
+      );
+      setRequests((prev) => (cursor ? [...prev, ...page.rows] : page.rows));
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error("Failed to fetch approve requests", err);
+      if (!cursor) setRequests([]);
+      setNextCursor(null);
     }
 
-    setLoading(false);
+    setBusy(false);
   }
 
   useEffect(() => {
@@ -99,8 +106,8 @@ export default function ApproveRequestsPage() {
       return;
     }
 
-    const res = await fetch(
-      `http://127.0.0.1:8000/api/approve-requests/${id}/action/`,
+    const res = await apiFetch(
+      `approve-requests/${id}/action/`,
       {
         method: "POST",
         headers: { "Content-Type": "application/json" },
@@ -212,6 +219,14 @@ export default function ApproveRequestsPage() {
         </div>
       )}
 
+      {!loading && (
+        <LoadMore
+          nextCursor={nextCursor}
+          loading={loadingMore}
+          onLoad={(cursor) => fetchApproveRequests(selectedKey, cursor)}
+        />
+      )}
+
       {!loading && requests.length === 0 && (
         <p>No requests pending approval.</p>
       )}
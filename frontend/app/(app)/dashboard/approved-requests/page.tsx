@@ -1,6 +1,8 @@
 "use client";
 
 import { useEffect, useState } from "react";
+import LoadMore from "../../../../components/LoadMore";
+import { fetchPage } from "../../../../lib/api";
 
 /* ================= FILTER OPTIONS ================= */
 
@@ -47,29 +49,31 @@ export default function ApprovedRequestsPage() {
   const [selectedFunction, setSelectedFunction] = useState("all");
   const [requests, setRequests] = useState<ApprovedRequest[]>([]);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   /* ================= FETCH ================= */
 
-  async function fetchApprovedRequests(functionKey: string) {
-    setLoading(true);
+  async function fetchApprovedRequests(functionKey: string, cursor: string | null = null) {
+    // Later pages are appended below the rows already shown
+    const setBusy = cursor ? setLoadingMore : setLoading;
+    setBusy(true);
 
     try {
-      const res = await fetch(
-        `http://127.0.0.1:8000/api/approved-requests/?function=${functionKey}`
+      const page = await fetchPage<ApprovedRequest>(
+        "approved-requests/",
+        functionKey === "all" ? {} : { function: functionKey },
+        cursor
       );
-
-      if (res.ok) {
-        const data = await res.json();
-        setRequests(data);
-      } else {
-        setRequests([]);
-      }
+      setRequests((prev) => (cursor ? [...prev, ...page.rows] : page.rows));
+      setNextCursor(page.nextCursor);
     } catch (err) {
       console.error("Failed to fetch approved requests", err);
-      setRequests([]);
+      if (!cursor) setRequests([]);
+      setNextCursor(null);
     }
 
-    setLoading(false);
+    setBusy(false);
   }
 
   useEffect(() => {
@@ -156,6 +160,14 @@ export default function ApprovedRequestsPage() {
           </table>
         </div>
       )}
+
+      {!loading && (
+        <LoadMore
+          nextCursor={nextCursor}
+          loading={loadingMore}
+          onLoad={(cursor) => fetchApprovedRequests(selectedFunction, cursor)}
+        />
+      )}
     </>
   );
 }
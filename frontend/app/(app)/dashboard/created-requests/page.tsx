@@ -2,6 +2,8 @@
 
 import { useEffect, useRef, useState } from "react";
 import { useRouter } from "next/navigation";
+import LoadMore from "../../../../components/LoadMore";
+import { fetchPage } from "../../../../lib/api";
 
 /* ================= TYPES ================= */
 
@@ -54,27 +56,30 @@ export default function CreatedRequestsPage() {
   const [selectedFunction, setSelectedFunction] = useState("all");
   const [requests, setRequests] = useState<CreatedRequest[]>([]);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   /* ================= DATA LOAD ================= */
 
-  async function fetchRequests(func: string) {
-    setLoading(true);
-
-    const url =
-      func === "all"
-        ? "http://127.0.0.1:8000/api/created-requests/"
-        : `http://127.0.0.1:8000/api/created-requests/?function=${func}`;
-
-    const res = await fetch(url);
-
-    if (res.ok) {
-      const data = await res.json();
-      setRequests(data);
-    } else {
-      setRequests([]);
+  async function fetchRequests(func: string, cursor: string | null = null) {
+    // Later pages are appended below the rows already shown
+    const setBusy = cursor ? setLoadingMore : setLoading;
+    setBusy(true);
+
+    try {
+      const page = await fetchPage<CreatedRequest>(
+        "created-requests/",
+        func === "all" ? {} : { function: func },
+        cursor
+      );
+      setRequests((prev) => (cursor ? [...prev, ...page.rows] : page.rows));
+      setNextCursor(page.nextCursor);
+    } catch {
+      if (!cursor) setRequests([]);
+      setNextCursor(null);
     }
 
-    setLoading(false);
+    setBusy(false);
   }
 
   useEffect(() => {
@@ -183,6 +188,14 @@ export default function CreatedRequestsPage() {
           </table>
         </div>
       )}
+
+      {!loading && (
+        <LoadMore
+          nextCursor={nextCursor}
+          loading={loadingMore}
+          onLoad={(cursor) => fetchRequests(selectedFunction, cursor)}
+        />
+      )}
     </>
   );
 }
@@ -2,6 +2,7 @@
 
 import { useEffect, useState } from "react";
 import { useSearchParams, useRouter } from "next/navigation";
+import { apiFetch } from "../../../../../lib/api";
 
 /* ========= SAP-ALIGNED DROPDOWN DATA ========= */
 
@@ -78,7 +79,7 @@ export default function PartCodeModificationPage() {
 
     setLoading(true);
 
-    fetch(`http://127.0.0.1:8000/api/requests/${requestId}/`)
+    apiFetch(`requests/${requestId}/`)
       .then((res) => res.json())
       .then((data) => {
         setForm({
@@ -125,8 +126,8 @@ export default function PartCodeModificationPage() {
 
     setLoading(true);
 
-    const res = await fetch(
-      "http://127.0.0.1:8000/api/create-requests/",
+    const res = await apiFetch(
+      "create-requests/",
       {
       method: "POST",
       headers: { "Content-Type": "application/json" },
@@ -152,8 +153,8 @@ export default function PartCodeModificationPage() {
 
     setLoading(true);
 
-    const res = await fetch(
-      `http://127.0.0.1:8000/api/requests/${requestId}/`,
+    const res = await apiFetch(
+      `requests/${requestId}/`,
       {
         method: "PUT",
         headers: { "Content-Type": "application/json" },
@@ -1,6 +1,8 @@
 "use client";
 
 import { useEffect, useRef, useState } from "react";
+import LoadMore from "../../../../components/LoadMore";
+import { fetchPage } from "../../../../lib/api";
 
 /* ================= TYPES ================= */
 
@@ -49,29 +51,31 @@ export default function ValidatedRequestsPage() {
   const [selectedFunction, setSelectedFunction] = useState("all");
   const [requests, setRequests] = useState<ValidatedRequest[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   /* ================= FETCH ================= */
 
-  async function fetchValidatedRequests(functionKey: string) {
-    setLoading(true);
+  async function fetchValidatedRequests(functionKey: string, cursor: string | null = null) {
+    // Later pages are appended below the rows already shown
+    const setBusy = cursor ? setLoadingMore : setLoading;
+    setBusy(true);
 
     try {
-      const res = await fetch(
-        `http://127.0.0.1:8000/api/validated-requests/?function=${functionKey}`
+      const page = await fetchPage<ValidatedRequest>(
+        "validated-requests/",
+        functionKey === "all" ? {} : { function: functionKey },
+        cursor
       );
-
-      if (res.ok) {
-        const data = await res.json();
-        setRequests(data);
-      } else {
-        setRequests([]);
-      }
+      setRequests((prev) => (cursor ? [...prev, ...page.rows] : page.rows));
+      setNextCursor(page.nextCursor);
     } catch (err) {
       console.error("Failed to fetch validated requests", err);
-      setRequests([]);
+      if (!cursor) setRequests([]);
+      setNextCursor(null);
     }
 
-    setLoading(false);
+    setBusy(false);
   }
 
   useEffect(() => {
@@ -147,6 +151,14 @@ export default function ValidatedRequestsPage() {
           </table>
         </div>
       )}
+
+      {!loading && (
+        <LoadMore
+          nextCursor={nextCursor}
+          loading={loadingMore}
+          onLoad={(cursor) => fetchValidatedRequests(selectedFunction, cursor)}
+        />
+      )}
     </>
   );
 }
@@ -1,6 +1,8 @@
 "use client";
 
 import { useEffect, useRef, useState } from "react";
+import LoadMore from "../../../../components/LoadMore";
+import { apiFetch, fetchPage } from "../../../../lib/api";
 
 /* ================= TYPES ================= */
 
@@ -51,6 +53,8 @@ export default function ValidationRequestsPage() {
   const [selectedFunction, setSelectedFunction] = useState<string>("all");
   const [requests, setRequests] = useState<ValidationRequest[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   const [actions, setActions] = useState<Record<number, ActionType>>({});
   const [remarks, setRemarks] = useState<Record<number, string>>({});
@@ -58,26 +62,26 @@ export default function ValidationRequestsPage() {
 
   /* ================= FETCH ================= */
 
-  async function fetchValidationRequests(functionKey: string) {
-    setLoading(true);
+  async function fetchValidationRequests(functionKey: string, cursor: string | null = null) {
+    // Later pages are appended below the rows already shown
+    const setBusy = cursor ? setLoadingMore : setLoading;
+    setBusy(true);
 
     try {
-      const res = await fetch(
-        `http://127.0.0.1:8000/api/validation-requests/?function=${functionKey}`
+      const page = await fetchPage<ValidationRequest>(
+        "validation-requests/",
+        functionKey === "all" ? {} : { function: functionKey },
+        cursor
       );
-
-      if (res.ok) {
-        const data = await res.json();
-        setRequests(data);
-      } else {
-        setRequests([]);
-      }
+      setRequests((prev) => (cursor ? [...prev, ...page.rows] : page.rows));
+      setNextCursor(page.nextCursor);
     } catch (err) {
       console.error("Failed to fetch validation requests", err);
-      setRequests([]);
+      if (!cursor) setRequests([]);
+      setNextCursor(null);
     }
 
-    setLoading(false);
+    setBusy(false);
   }
 
   useEffect(() => {
@@ -112,8 +116,8 @@ export default function ValidationRequestsPage() {
     setSubmitting(id);
 
     try {
-      const res = await fetch(
-        `http://127.0.0.1:8000/api/validation-requests/${id}/action/`,
+      const res = await apiFetch(
+        `validation-requests/${id}/action/`,
         {
           method: "POST",
           headers: { "Content-Type": "application/json" },
@@ -265,6 +269,14 @@ export default function ValidationRequestsPage() {
           </table>
         </div>
       )}
+
+      {!loading && (
+        <LoadMore
+          nextCursor={nextCursor}
+          loading={loadingMore}
+          onLoad={(cursor) => fetchValidationRequests(selectedFunction, cursor)}
+        />
+      )}
     </>
   );
 }
@@ -1,4 +1,5 @@
 import "../../styles/globals.css";
+import AuthGuard from "../../components/AuthGuard";
 import Sidebar from "../../components/Sidebar";
 
 export default function AppLayout({
@@ -9,10 +10,12 @@ export default function AppLayout({
   return (
     <html lang="en">
       <body>
-        <div className="app-shell">
-          <Sidebar />
-          <main className="main-content">{children}</main>
-        </div>
+        <AuthGuard>
+          <div className="app-shell">
+            <Sidebar />
+            <main className="main-content">{children}</main>
+          </div>
+        </AuthGuard>
       </body>
     </html>
   );
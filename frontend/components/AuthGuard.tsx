@@ -0,0 +1,21 @@
+"use client";
+
+import { useEffect, useState } from "react";
+import { useRouter } from "next/navigation";
+import { getToken } from "../lib/api";
+
+/* Dashboard pages need a session: without a token, open the login page */
+export default function AuthGuard({ children }: { children: React.ReactNode }) {
+  const router = useRouter();
+  const [ready, setReady] = useState(false);
+
+  useEffect(() => {
+    if (getToken()) {
+      setReady(true);
+    } else {
+      router.replace("/login");
+    }
+  }, [router]);
+
+  return ready ? <>{children}</> : null;
+}
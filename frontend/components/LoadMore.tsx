@@ -0,0 +1,21 @@
+"use client";
+
+type LoadMoreProps = {
+  nextCursor: string | null;
+  loading: boolean;
+  onLoad: (cursor: string) => void;
+};
+
+/* Follows X-Next-Cursor: shown while the list has more pages */
+export default function LoadMore({ nextCursor, loading, onLoad }: LoadMoreProps) {
+  if (!nextCursor) return null;
+
+  return (
+    <>
+      <br />
+      <button disabled={loading} onClick={() => onLoad(nextCursor)}>
+        {loading ? "Loading..." : "Load more"}
+      </button>
+    </>
+  );
+}
@@ -2,6 +2,7 @@
 
 import Link from "next/link";
 import { usePathname } from "next/navigation";
+import { getUser, logout } from "../lib/api";
 
 const menuItems = [
   { label: "Create Requests", path: "/dashboard/create-requests" },
@@ -15,6 +16,7 @@ const menuItems = [
 
 export default function Sidebar() {
   const pathname = usePathname();
+  const user = getUser();
 
   return (
     <aside className="sidebar">
@@ -30,6 +32,13 @@ export default function Sidebar() {
           </Link>
         );
       })}
+
+      {user && (
+        <div className="sidebar-item">
+          {user.email} ({user.role})
+        </div>
+      )}
+      <button onClick={logout}>Sign out</button>
     </aside>
   );
 }
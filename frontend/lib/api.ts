@@ -0,0 +1,96 @@
+/* ================= BACKEND API ================= */
+
+export const API_BASE = "http://127.0.0.1:8000/api";
+
+const TOKEN_KEY = "token";
+const USER_KEY = "user";
+
+export type SessionUser = {
+  email: string;
+  role: string;
+};
+
+/* ================= SESSION ================= */
+
+export function getToken(): string | null {
+  if (typeof window === "undefined") return null;
+  return window.localStorage.getItem(TOKEN_KEY);
+}
+
+export function getUser(): SessionUser | null {
+  if (typeof window === "undefined") return null;
+  const raw = window.localStorage.getItem(USER_KEY);
+  return raw ? (JSON.parse(raw) as SessionUser) : null;
+}
+
+export function logout() {
+  window.localStorage.removeItem(TOKEN_KEY);
+  window.localStorage.removeItem(USER_KEY);
+  window.location.href = "/login";
+}
+
+export async function login(email: string, password: string): Promise<string | null> {
+  const res = await fetch(`${API_BASE}/auth/login/`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ email, password }),
+  });
+
+  const data = await res.json().catch(() => ({}));
+  if (!res.ok) {
+    return data.error || "Login failed";
+  }
+
+  window.localStorage.setItem(TOKEN_KEY, data.token);
+  window.localStorage.setItem(
+    USER_KEY,
+    JSON.stringify({ email: data.email, role: data.role })
+  );
+  return null;
+}
+
+/* ================= REQUESTS ================= */
+
+/*
+  fetch() against the API with the session's bearer token. An expired
+  or missing token (401) ends the session and opens the login page.
+*/
+export async function apiFetch(path: string, init: RequestInit = {}): Promise<Response> {
+  const headers = new Headers(init.headers);
+  const token = getToken();
+  if (token) headers.set("Authorization", `Bearer ${token}`);
+
+  const res = await fetch(`${API_BASE}/${path}`, { ...init, headers });
+  if (res.status === 401) {
+    logout();
+  }
+  return res;
+}
+
+export type Page<T> = {
+  rows: T[];
+  nextCursor: string | null;
+};
+
+/*
+  List endpoints return one page per call; the cursor of the next page
+  comes back in the X-Next-Cursor header (absent on the last page).
+*/
+export async function fetchPage<T>(
+  path: string,
+  params: Record<string, string>,
+  cursor?: string | null
+): Promise<Page<T>> {
+  const query = new URLSearchParams(params);
+  if (cursor) query.set("cursor", cursor);
+
+  const res = await apiFetch(`${path}?${query.toString()}`);
+  if (!res.ok) {
+    throw new Error(`${path} failed: ${res.status}`);
+  }
+
+  return {
+    rows: await res.json(),
+    nextCursor: res.headers.get("X-Next-Cursor"),
+  };
+}